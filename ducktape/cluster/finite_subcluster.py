@@ -50,3 +50,12 @@ class FiniteSubcluster(Cluster):
         assert node in self._in_use_nodes
         self._in_use_nodes.remove(node)
         self._available_nodes.add(node)
+
+    def close(self):
+        """Release the network connections of all nodes in this cluster.
+
+        The connections are kept open in the connection pool of this process, so that a later test using the same
+        nodes can reuse them.
+        """
+        for node in self.nodes:
+            node.account.close()
@@ -73,6 +73,8 @@ class JsonCluster(Cluster):
               ]
             }
 
+        ssh_config may also set "compression" (true or false) and "ciphers" (a list of cipher names) to tune the ssh
+        transport, e.g. to compress logs copied over slow links.
         """
         super(JsonCluster, self).__init__()
         if cluster_json is None:
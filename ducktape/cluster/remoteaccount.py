@@ -13,27 +13,45 @@
 # limitations under the License.
 
 from contextlib import contextmanager
+import collections
+import hashlib
+import inspect
 import logging
 import os
-from paramiko import SSHClient, SSHConfig, MissingHostKeyPolicy
+from paramiko import SSHClient, SSHConfig, MissingHostKeyPolicy, SFTPClient, SFTPFile, Transport
+import pipes
+import re
 import shutil
 import signal
 import socket
 import stat
+import tarfile
 import tempfile
+import time
 import warnings
 
+from ducktape.cluster.ssh_connection_pool import SSHConnections, ssh_connection_pool
 from ducktape.utils.http_utils import HttpMixin
-from ducktape.utils.util import wait_until
-from ducktape.errors import DucktapeError
+from ducktape.utils.util import wait_until, parallel_map
+from ducktape.errors import DucktapeError, ParallelError, TimeoutError
+
+
+# Whether SSHClient.connect accepts disabled_algorithms, which was added in paramiko 2.6
+_CONNECT_ACCEPTS_DISABLED_ALGORITHMS = "disabled_algorithms" in inspect.getargspec(SSHClient.connect).args
 
 
 class RemoteAccountSSHConfig(object):
-    def __init__(self, host=None, hostname=None, user=None, port=None, password=None, identityfile=None, **kwargs):
+    def __init__(self, host=None, hostname=None, user=None, port=None, password=None, identityfile=None,
+                 compression=None, ciphers=None, **kwargs):
         """Wrapper for ssh configs used by ducktape to connect to remote machines.
 
         The fields in this class are lowercase versions of a small selection of ssh config properties
         (see man page: "man ssh_config")
+
+        :param compression: whether to compress the ssh transport. As in ssh config files, "yes" and "no" are accepted
+            as well as booleans. Compression usually speeds up copying logs over slow links, and costs CPU on fast ones.
+        :param ciphers: ciphers which may be used, as a list or a comma-separated string like ssh config's Ciphers,
+            e.g. "aes128-ctr" for throughput. Default None, i.e. paramiko's defaults. Requires paramiko 2.6 or later.
         """
         self.host = host
         self.hostname = hostname or 'localhost'
@@ -42,6 +60,13 @@ class RemoteAccountSSHConfig(object):
         self.port = int(self.port)
         self.password = password
         self.identityfile = identityfile
+        if isinstance(compression, basestring):
+            compression = compression.lower() == "yes"
+        self.compression = bool(compression)
+        if isinstance(ciphers, basestring):
+            ciphers = ciphers.split(",")
+        # a tuple, so that configs stay hashable
+        self.ciphers = tuple(c.strip() for c in ciphers) if ciphers else None
 
     @staticmethod
     def from_string(config_str):
@@ -70,7 +95,15 @@ class RemoteAccountSSHConfig(object):
         return RemoteAccountSSHConfig(host, **config_dict)
 
     def to_json(self):
-        return self.__dict__
+        json_dict = dict(self.__dict__)
+        # Transport options are only included when set, so cluster files written by older versions stay the same
+        if not self.compression:
+            del json_dict["compression"]
+        if self.ciphers is None:
+            del json_dict["ciphers"]
+        else:
+            json_dict["ciphers"] = list(self.ciphers)
+        return json_dict
 
     def __repr__(self):
         return str(self.to_json())
@@ -124,6 +157,18 @@ class RemoteAccount(HttpMixin):
     WINDOWS = "windows"
     SUPPORTED_OS_TYPES = [LINUX, WINDOWS]
 
+    # SSH connections are taken from, and returned to, this pool
+    ssh_connection_pool = ssh_connection_pool
+
+    # Maximum number of channels to open concurrently over one SSH connection. OpenSSH servers refuse more than 10
+    # sessions per connection by default (see MaxSessions in "man sshd_config").
+    max_channels_per_connection = 10
+
+    # Files at least this large are copied to and from nodes over parallel_copy_streams SFTP channels at once, each
+    # channel transferring one range of the file.
+    parallel_copy_min_bytes = 64 * 1024 * 1024
+    parallel_copy_streams = 4
+
     def __init__(self, ssh_config, externally_routable_ip=None, logger=None):
         # Instance of RemoteAccountSSHConfig - use this instead of a dict, because we need the entire object to
         # be hashable
@@ -141,8 +186,9 @@ class RemoteAccount(HttpMixin):
         self.externally_routable_ip = externally_routable_ip
         self._logger = logger
         self.os = None
-        self._ssh_client = None
+        self._ssh_connections = None
         self._sftp_client = None
+        self._has_tar = None
 
     @property
     def operating_system(self):
@@ -163,24 +209,65 @@ class RemoteAccount(HttpMixin):
         msg = "%s: %s" % (str(self), msg)
         self.logger.log(level, msg, *args, **kwargs)
 
+    def _connect(self):
+        """Open a new SSH connection to this node."""
+        client = SSHClient()
+        client.set_missing_host_key_policy(IgnoreMissingHostKeyPolicy())
+
+        self._log(logging.DEBUG, "ssh_config: %s" % str(self.ssh_config))
+
+        client.connect(
+            hostname=self.ssh_config.hostname,
+            port=self.ssh_config.port,
+            username=self.ssh_config.user,
+            password=self.ssh_config.password,
+            key_filename=self.ssh_config.identityfile,
+            look_for_keys=False,
+            compress=self.ssh_config.compression,
+            **self._connect_options())
+        return client
+
+    def _connect_options(self):
+        """Additional keyword arguments for SSHClient.connect, which only recent versions of paramiko accept.
+
+        Ciphers are chosen by disabling every other cipher paramiko supports. paramiko only lists the ciphers it
+        supports in a private attribute, so if that isn't available, or connect doesn't accept disabled_algorithms
+        (paramiko before 2.6), the configured ciphers are ignored with a warning and paramiko's defaults are used.
+        """
+        if self.ssh_config.ciphers is None:
+            return {}
+
+        supported = getattr(Transport, "_preferred_ciphers", None)
+        if not isinstance(supported, (list, tuple)) or not _CONNECT_ACCEPTS_DISABLED_ALGORITHMS:
+            self._log(logging.WARNING, "This version of paramiko doesn't allow choosing ciphers. "
+                                       "Ignoring the ciphers configured for %s." % self.hostname)
+            return {}
+
+        unknown = [c for c in self.ssh_config.ciphers if c not in supported]
+        if len(unknown) > 0:
+            raise ValueError("Unsupported ssh ciphers %s for %s. Supported ciphers: %s" %
+                             (unknown, self.hostname, ", ".join(supported)))
+        return {"disabled_algorithms": {"ciphers": [c for c in supported if c not in self.ssh_config.ciphers]}}
+
     @property
-    def ssh_client(self):
-        if not self._ssh_client:
-            client = SSHClient()
-            client.set_missing_host_key_policy(IgnoreMissingHostKeyPolicy())
+    def _connections(self):
+        if self._ssh_connections is not None and self._ssh_connections.pid != os.getpid():
+            # connections opened by a parent process can't be used
+            self._ssh_connections = None
+            self._sftp_client = None
 
-            self._log(logging.DEBUG, "ssh_config: %s" % str(self.ssh_config))
+        if self._ssh_connections is None:
+            self._ssh_connections = SSHConnections(
+                self.ssh_connection_pool, self.ssh_config, self._connect, self.max_channels_per_connection)
+        return self._ssh_connections
 
-            client.connect(
-                hostname=self.ssh_config.hostname,
-                port=self.ssh_config.port,
-                username=self.ssh_config.user,
-                password=self.ssh_config.password,
-                key_filename=self.ssh_config.identityfile,
-                look_for_keys=False)
-            self._ssh_client = client
+    @property
+    def ssh_client(self):
+        return self._connections.primary
 
-        return self._ssh_client
+    def _open_session(self, timeout=None):
+        """Open a new channel to this node. Channels are spread over several connections if necessary."""
+        return self._connections.open_session(timeout=timeout)
 
     @property
     def sftp_client(self):
@@ -189,15 +276,22 @@ class RemoteAccount(HttpMixin):
 
         return self._sftp_client
 
+    def _open_sftp(self):
+        """Open an additional SFTP client over a new channel. The caller is responsible for closing it."""
+        chan = self._open_session()
+        chan.invoke_subsystem("sftp")
+        return SFTPClient(chan)
+
     def close(self):
         """Close/release any outstanding network connections to remote account."""
 
-        if self._ssh_client:
-            self._ssh_client.close()
-            self._ssh_client = None
         if self._sftp_client:
             self._sftp_client.close()
             self._sftp_client = None
+        if self._ssh_connections:
+            # The connections themselves are kept open in the pool, so they can be reused
+            self._ssh_connections.release()
+            self._ssh_connections = None
 
     def __str__(self):
         r = ""
@@ -221,7 +315,8 @@ class RemoteAccount(HttpMixin):
 
         err_msg = "Timed out trying to contact service on %s. " % url + \
             "Either the service failed to start, or there is a problem with the url."
-        wait_until(lambda: self._can_ping_url(url, headers), timeout_sec=timeout, backoff_sec=.25, err_msg=err_msg)
+        wait_until(lambda: self._can_ping_url(url, headers), timeout_sec=timeout, backoff_sec=.25, err_msg=err_msg,
+                   backoff_multiplier=1.5, max_backoff_sec=2)
 
     def _can_ping_url(self, url, headers):
         """See if we can successfully issue a GET request to the given url."""
@@ -243,8 +338,11 @@ class RemoteAccount(HttpMixin):
         """
         self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
 
-        client = self.ssh_client
-        stdin, stdout, stderr = client.exec_command(cmd)
+        chan = self._open_session()
+        chan.exec_command(cmd)
+        stdin = chan.makefile('wb', -1)
+        stdout = chan.makefile('r', -1)
+        stderr = chan.makefile_stderr('r', -1)
 
         # Unfortunately we need to read over the channel to ensure that recv_exit_status won't hang. See:
         # http://docs.paramiko.org/en/2.0/api/channel.html#paramiko.channel.Channel.recv_exit_status
@@ -279,8 +377,7 @@ class RemoteAccount(HttpMixin):
         """
         self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
 
-        client = self.ssh_client
-        chan = client.get_transport().open_session(timeout=timeout_sec)
+        chan = self._open_session(timeout=timeout_sec)
 
         chan.settimeout(timeout_sec)
         chan.exec_command(cmd)
@@ -309,7 +406,75 @@ class RemoteAccount(HttpMixin):
 
         return SSHOutputIter(output_generator(), stdout)
 
-    def ssh_output(self, cmd, allow_fail=False, combine_stderr=True, timeout_sec=None):
+    def ssh_stream(self, cmd, allow_fail=False, combine_stderr=True, timeout_sec=None, chunk_bytes=None):
+        """Runs the command via SSH, and returns an iterator over chunks of its raw output.
+
+        Does *not* block. Output is only read from the channel as the iterator is consumed, so at most about one ssh
+        channel window of output is buffered on the driver however much the command produces; beyond that, the
+        command blocks until more output is consumed.
+
+        :param cmd: The remote ssh command
+        :param allow_fail: If True, ignore nonzero exit status of the remote command,
+               else raise an ``RemoteCommandError`` once all output has been read
+        :param combine_stderr: If True, return output from both stderr and stdout of the remote process.
+        :param timeout_sec: Set timeout on blocking reads/writes. Default None. For more details see
+            http://docs.paramiko.org/en/2.0/api/channel.html#paramiko.channel.Channel.settimeout
+        :param chunk_bytes: Maximum size of each chunk. Default ``SSH_READ_BYTES``.
+
+        :return: iterator over strings of at most chunk_bytes bytes. Closing it closes the channel.
+        :raise RemoteCommandError: If ``allow_fail`` is False and the command returns a non-zero exit status
+        """
+        self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
+
+        chan = self._open_session(timeout=timeout_sec)
+
+        chan.settimeout(timeout_sec)
+        chan.exec_command(cmd)
+        chan.set_combine_stderr(combine_stderr)
+        stderr = chan.makefile_stderr('r', -1)
+
+        def output_generator():
+            try:
+                for data in iter(lambda: chan.recv(chunk_bytes or SSH_READ_BYTES), ""):
+                    yield data
+                exit_status = chan.recv_exit_status()
+                if not allow_fail and exit_status != 0:
+                    raise RemoteCommandError(self, cmd, exit_status, stderr.read())
+            finally:
+                stderr.close()
+                chan.close()
+
+        return output_generator()
+
+    def ssh_to_file(self, cmd, path, allow_fail=False, combine_stderr=False, timeout_sec=None):
+        """Runs the command via SSH, and writes its output to a local file as it is produced.
+
+        Unlike other ssh methods, stderr is not combined into the output by default, so that the file holds exactly
+        what the command writes to stdout. It is included in the ``RemoteCommandError`` if the command fails.
+
+        :param cmd: The remote ssh command
+        :param path: Local path of the file to write, or a file object opened for writing
+        :param allow_fail: If True, ignore nonzero exit status of the remote command,
+               else raise an ``RemoteCommandError``
+        :param combine_stderr: If True, write output from both stderr and stdout of the remote process.
+        :param timeout_sec: Set timeout on blocking reads/writes. Default None.
+
+        :return: The number of bytes written.
+        :raise RemoteCommandError: If ``allow_fail`` is False and the command returns a non-zero exit status
+        """
+        num_bytes = 0
+        f = open(path, "wb") if isinstance(path, basestring) else path
+        try:
+            for data in self.ssh_stream(cmd, allow_fail=allow_fail, combine_stderr=combine_stderr,
+                                        timeout_sec=timeout_sec):
+                f.write(data)
+                num_bytes += len(data)
+        finally:
+            if f is not path:
+                f.close()
+        return num_bytes
+
+    def ssh_output(self, cmd, allow_fail=False, combine_stderr=True, timeout_sec=None, max_output_bytes=None):
         """Runs the command via SSH and captures the output, returning it as a string.
 
         :param cmd: The remote ssh command.
@@ -318,14 +483,16 @@ class RemoteAccount(HttpMixin):
         :param combine_stderr: If True, return output from both stderr and stdout of the remote process.
         :param timeout_sec: Set timeout on blocking reads/writes. Default None. For more details see
             http://docs.paramiko.org/en/2.0/api/channel.html#paramiko.channel.Channel.settimeout
+        :param max_output_bytes: If set, the most output to hold in memory. Larger output should be consumed with
+            ``ssh_stream`` or ``ssh_to_file`` instead.
 
         :return: The stdout output from the ssh command.
         :raise RemoteCommandError: If ``allow_fail`` is False and the command returns a non-zero exit status
+        :raise RemoteAccountError: If the command produces more than max_output_bytes of output. It is then closed.
         """
         self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
 
-        client = self.ssh_client
-        chan = client.get_transport().open_session(timeout=timeout_sec)
+        chan = self._open_session(timeout=timeout_sec)
 
         chan.settimeout(timeout_sec)
         chan.exec_command(cmd)
@@ -336,7 +503,14 @@ class RemoteAccount(HttpMixin):
         stderr = chan.makefile_stderr('r', -1)
 
         try:
-            stdoutdata = stdout.read()
+            if max_output_bytes is None:
+                stdoutdata = stdout.read()
+            else:
+                stdoutdata = stdout.read(max_output_bytes + 1)
+                if len(stdoutdata) > max_output_bytes:
+                    chan.close()
+                    raise RemoteAccountError(self, "Output of ssh command exceeded %d bytes: %s" %
+                                             (max_output_bytes, cmd))
             exit_status = stdin.channel.recv_exit_status()
             if not allow_fail and exit_status != 0:
                 raise RemoteCommandError(self, cmd, exit_status, stderr.read())
@@ -347,6 +521,45 @@ class RemoteAccount(HttpMixin):
 
         return stdoutdata
 
+    def ssh_result(self, cmd, combine_stderr=True, timeout_sec=None):
+        """Runs the command via SSH, and waits for it to complete.
+
+        Unlike ``ssh_output``, a nonzero exit status is returned rather than raised, and timeout_sec limits the time
+        taken by the whole command rather than each blocking read.
+
+        :param cmd: The remote ssh command.
+        :param combine_stderr: If True, return output from both stderr and stdout of the remote process as output.
+        :param timeout_sec: Maximum time to wait for the command to complete. Default None, i.e. wait indefinitely.
+
+        :return: ``RemoteCommandResult`` with the exit status and output of the command.
+        :raise TimeoutError: If the command doesn't complete within timeout_sec. The channel is then closed.
+        """
+        self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
+
+        deadline = None if timeout_sec is None else time.time() + timeout_sec
+        chan = self._open_session(timeout=timeout_sec)
+        try:
+            chan.exec_command(cmd)
+            chan.set_combine_stderr(combine_stderr)
+            stderr = chan.makefile_stderr('r', -1)
+
+            output = []
+            while True:
+                chan.settimeout(None if deadline is None else max(deadline - time.time(), 0))
+                try:
+                    data = chan.recv(SSH_READ_BYTES)
+                except socket.timeout:
+                    raise TimeoutError("Timed out after %s seconds running ssh command on %s: %s" %
+                                       (str(timeout_sec), self.hostname, cmd))
+                if len(data) == 0:
+                    break
+                output.append(data)
+
+            return RemoteCommandResult(exit_status=chan.recv_exit_status(), output="".join(output),
+                                       stderr="" if combine_stderr else stderr.read())
+        finally:
+            chan.close()
+
     def alive(self, pid):
         """Return True if and only if process with given pid is alive."""
         try:
@@ -359,17 +572,35 @@ class RemoteAccount(HttpMixin):
         cmd = "kill -%s %s" % (str(sig), str(pid))
         self.ssh(cmd, allow_fail=allow_fail)
 
-    def kill_process(self, process_grep_str, clean_shutdown=True, allow_fail=False):
-        cmd = """ps ax | grep -i """ + process_grep_str + """ | grep -v grep | awk '{print $1}'"""
-        pids = [pid for pid in self.ssh_capture(cmd, allow_fail=True)]
+    def kill_process(self, process_grep_str, clean_shutdown=True, allow_fail=False, grace_period_sec=None):
+        """Signal all processes whose ``ps ax`` line matches process_grep_str, using a single ssh command.
 
-        if clean_shutdown:
-            sig = signal.SIGTERM
+        :param process_grep_str: Pattern passed to ``grep -i`` to find the processes
+        :param clean_shutdown: If True, send SIGTERM, else SIGKILL
+        :param allow_fail: If True, ignore failures to signal the processes or to make them exit
+        :param grace_period_sec: If set, wait up to this long for the processes to exit. After a clean shutdown, any
+            processes still running are then killed with SIGKILL, and waited for for up to another grace period.
+        :raise RemoteCommandError: If ``allow_fail`` is False and a process couldn't be signaled, or was still running
+            at the end of the grace period
+        """
+        sig = signal.SIGTERM if clean_shutdown else signal.SIGKILL
+        # The remote shell's own ps line contains "grep", so it is filtered out along with the grep itself
+        cmd = "pids=$(ps ax | grep -i %s | grep -v grep | awk '{print $1}'); " % process_grep_str
+        cmd += "[ -z \"$pids\" ] && exit 0; "
+        if grace_period_sec is None:
+            cmd += "kill -%d $pids" % sig
         else:
-            sig = signal.SIGKILL
+            # Processes which exit before they are signaled are fine here, so only fail if some are still running
+            polls = max(int(grace_period_sec * 10), 1)
+            cmd += "wait_for_exit() { i=0; while [ $i -lt %d ]; do alive=; " % polls
+            cmd += "for pid in $pids; do kill -0 $pid 2>/dev/null && alive=\"$alive $pid\"; done; pids=$alive; "
+            cmd += "[ -z \"$pids\" ] && return 0; sleep 0.1; i=$((i+1)); done; return 1; }; "
+            cmd += "kill -%d $pids 2>/dev/null; wait_for_exit && exit 0; " % sig
+            if sig != signal.SIGKILL:
+                cmd += "kill -%d $pids 2>/dev/null; wait_for_exit && exit 0; " % signal.SIGKILL
+            cmd += "echo \"Processes still running:$pids\" >&2; exit 1"
 
-        for pid in pids:
-            self.signal(pid, sig, allow_fail=allow_fail)
+        self.ssh(cmd, allow_fail=allow_fail)
 
     def copy_between(self, src, dest, dest_node):
         """Copy src to dest on dest_node
@@ -380,9 +611,15 @@ class RemoteAccount(HttpMixin):
 
         Note that if src is a directory, this will automatically copy recursively.
 
+        If both nodes have tar, the data is streamed from this node to dest_node through the test driver without
+        being stored on the driver. Otherwise it is copied to a temporary directory on the driver first.
         """
         # TODO: if dest is an existing file, what is the behavior?
 
+        if self._tar_available() and dest_node.account._tar_available():
+            self._relay_to(src, dest, dest_node.account)
+            return
+
         temp_dir = tempfile.mkdtemp()
 
         try:
@@ -398,6 +635,52 @@ class RemoteAccount(HttpMixin):
             if os.path.isdir(temp_dir):
                 shutil.rmtree(temp_dir)
 
+    def _relay_to(self, src, dest, dest_account):
+        """Stream src on this node to dest on the node of dest_account, relaying the data through the test driver."""
+        if dest_account.isdir(dest):
+            dest = self._re_anchor_basename(src, dest)
+
+        if self.isfile(src):
+            src_cmd = "cat %s" % pipes.quote(src)
+            dest_cmd = "cat > %s" % pipes.quote(dest)
+            src_success_statuses = (0,)
+        elif self.isdir(src):
+            src_cmd = "tar -C %s -chf - ." % pipes.quote(src)
+            dest_cmd = "mkdir %s && tar -C %s -xf -" % (pipes.quote(dest), pipes.quote(dest))
+            src_success_statuses = TAR_SUCCESS_EXIT_STATUSES
+        else:
+            return
+
+        src_chan = self._open_exec_channel(src_cmd)
+        dest_chan = dest_account._open_exec_channel(dest_cmd)
+        src_out = src_chan.makefile('rb', -1)
+        src_err = src_chan.makefile_stderr('rb', -1)
+        dest_in = dest_chan.makefile('wb', -1)
+        dest_err = dest_chan.makefile_stderr('rb', -1)
+        try:
+            try:
+                shutil.copyfileobj(src_out, dest_in, RELAY_BUFFER_BYTES)
+                dest_in.flush()
+                dest_chan.shutdown_write()
+            except (IOError, socket.error):
+                # the destination command exited early, e.g. because dest could not be created
+                if not dest_chan.exit_status_ready() or dest_chan.recv_exit_status() == 0:
+                    raise
+
+            # Check the destination first: if it failed, the source may be blocked writing to the relay
+            exit_status = dest_chan.recv_exit_status()
+            if exit_status != 0:
+                raise RemoteCommandError(dest_account, dest_cmd, exit_status, dest_err.read())
+
+            exit_status = src_chan.recv_exit_status()
+            if exit_status not in src_success_statuses:
+                raise RemoteCommandError(self, src_cmd, exit_status, src_err.read())
+        finally:
+            for f in [src_out, src_err, dest_in, dest_err]:
+                f.close()
+            src_chan.close()
+            dest_chan.close()
+
     def scp_from(self, src, dest, recursive=False):
         warnings.warn("scp_from is now deprecated. Please use copy_from")
         self.copy_from(src, dest)
@@ -427,34 +710,55 @@ class RemoteAccount(HttpMixin):
 
         return os.path.join(directory, path_basename)
 
-    def copy_from(self, src, dest):
+    def copy_from(self, src, dest, compress=False):
+        """Copy src on this node to dest on the test driver.
+
+        Directories are transferred as a single tar stream if tar is available on this node, otherwise file by file
+        over SFTP.
+
+        :param src: Path to the file or directory on this node
+        :param dest: The destination path on the test driver
+        :param compress: If True, gzip directory transfers
+        """
         if os.path.isdir(dest):
             # dest is an existing directory, so assuming src looks like path/to/src_name,
             # in this case we'll copy as:
             #   path/to/src_name -> dest/src_name
             dest = self._re_anchor_basename(src, dest)
 
-        if self.isfile(src):
-            self.sftp_client.get(src, dest)
-        elif self.isdir(src):
+        src_mode = self._stat_mode(src)
+        if stat.S_ISREG(src_mode):
+            self._copy_file_from(src, dest)
+        elif stat.S_ISDIR(src_mode):
             # we can now assume dest path looks like: path_that_exists/new_directory
             os.mkdir(dest)
 
-            # for obj in `ls src`, if it's a file, copy with copy_file_from, elif its a directory, call again
-            for obj in self.sftp_client.listdir(src):
-                obj_path = os.path.join(src, obj)
-                if self.isfile(obj_path) or self.isdir(obj_path):
-                    self.copy_from(obj_path, dest)
-                else:
-                    # TODO what about uncopyable file types?
-                    pass
+            if self._tar_available():
+                self._tar_from(src, dest, compress)
+                return
+
+            # List the whole tree up front, then copy file by file. Uncopyable file types are skipped.
+            for dirpath, dirnames, filenames in self.walk(src):
+                local_dirpath = os.path.join(dest, os.path.relpath(dirpath, src))
+                for d in dirnames:
+                    os.mkdir(os.path.join(local_dirpath, d))
+                for f in filenames:
+                    self.sftp_client.get(os.path.join(dirpath, f), os.path.join(local_dirpath, f))
 
     def scp_to(self, src, dest, recursive=False):
         warnings.warn("scp_to is now deprecated. Please use copy_to")
         self.copy_to(src, dest)
 
-    def copy_to(self, src, dest):
+    def copy_to(self, src, dest, compress=False):
+        """Copy src on the test driver to dest on this node.
+
+        Directories are transferred as a single tar stream if tar is available on this node, otherwise file by file
+        over SFTP.
 
+        :param src: Path to the file or directory on the test driver
+        :param dest: The destination path on this node
+        :param compress: If True, gzip directory transfers
+        """
         if self.isdir(dest):
             # dest is an existing directory, so assuming src looks like path/to/src_name,
             # in this case we'll copy as:
@@ -463,8 +767,12 @@ class RemoteAccount(HttpMixin):
 
         if os.path.isfile(src):
             # local to remote
-            self.sftp_client.put(src, dest)
+            self._copy_file_to(src, dest)
         elif os.path.isdir(src):
+            if self._tar_available():
+                self._tar_to(src, dest, compress)
+                return
+
             # we can now assume dest path looks like: path_that_exists/new_directory
             self.mkdir(dest)
 
@@ -472,11 +780,250 @@ class RemoteAccount(HttpMixin):
             for obj in os.listdir(src):
                 obj_path = os.path.join(src, obj)
                 if os.path.isfile(obj_path) or os.path.isdir(obj_path):
-                    self.copy_to(obj_path, dest)
+                    self.copy_to(obj_path, dest, compress)
                 else:
                     # TODO what about uncopyable file types?
                     pass
 
+    def _copy_file_from(self, src, dest):
+        """Copy file src on this node to dest on the test driver, in parallel ranges if it is large."""
+        size = self.sftp_client.stat(src).st_size
+        if size < self.parallel_copy_min_bytes or self.parallel_copy_streams <= 1:
+            self.sftp_client.get(src, dest)
+            return
+
+        self._log(logging.DEBUG, "Copying %s (%d bytes) in %d parallel ranges" %
+                  (src, size, self.parallel_copy_streams))
+        with open(dest, "wb") as f:
+            f.truncate(size)
+
+        def copy_range(byte_range):
+            sftp = self._open_sftp()
+            try:
+                with sftp.open(src, "rb") as remote_f, open(dest, "r+b") as local_f:
+                    local_f.seek(byte_range[0])
+                    # readv pipelines the reads in each batch; batching bounds how much is buffered
+                    for batch in _split_range(byte_range, PARALLEL_COPY_BATCH_BYTES):
+                        for data in remote_f.readv([batch]):
+                            local_f.write(data)
+            finally:
+                sftp.close()
+
+        parallel_map(copy_range, _split_range((0, size), -(-size // self.parallel_copy_streams)))
+        self._verify_copy(src, dest, size)
+
+    def _copy_file_to(self, src, dest):
+        """Copy file src on the test driver to dest on this node, in parallel ranges if it is large."""
+        size = os.path.getsize(src)
+        if size < self.parallel_copy_min_bytes or self.parallel_copy_streams <= 1:
+            self.sftp_client.put(src, dest)
+            return
+
+        self._log(logging.DEBUG, "Copying %s (%d bytes) in %d parallel ranges" %
+                  (src, size, self.parallel_copy_streams))
+        with self.sftp_client.open(dest, "wb") as f:
+            f.truncate(size)
+
+        def copy_range(byte_range):
+            sftp = self._open_sftp()
+            try:
+                with open(src, "rb") as local_f, sftp.open(dest, "r+b") as remote_f:
+                    # Don't wait for each write to be acknowledged; errors are raised on close
+                    remote_f.set_pipelined(True)
+                    local_f.seek(byte_range[0])
+                    remote_f.seek(byte_range[0])
+                    for _, length in _split_range(byte_range, SFTPFile.MAX_REQUEST_SIZE):
+                        remote_f.write(local_f.read(length))
+            finally:
+                sftp.close()
+
+        parallel_map(copy_range, _split_range((0, size), -(-size // self.parallel_copy_streams)))
+        self._verify_copy(dest, src, size)
+
+    def _verify_copy(self, remote_path, local_path, size):
+        """Check that a file copied in parallel ranges has the same size and md5 checksum on both ends.
+
+        The checksum is skipped if md5sum isn't available on this node.
+        """
+        remote_size = self.sftp_client.stat(remote_path).st_size
+        local_size = os.path.getsize(local_path)
+        if remote_size != size or local_size != size:
+            raise RemoteAccountError(self, "Copy of %s is incomplete: expected %d bytes, got %d on the node and %d "
+                                           "locally" % (remote_path, size, remote_size, local_size))
+
+        def remote_md5():
+            output = self.ssh_output("md5sum %s" % pipes.quote(remote_path), allow_fail=True, combine_stderr=False)
+            return output.split(" ")[0] if re.match("^[0-9a-f]{32} ", output) else None
+
+        def local_md5():
+            md5 = hashlib.md5()
+            with open(local_path, "rb") as f:
+                for data in iter(lambda: f.read(RELAY_BUFFER_BYTES), ""):
+                    md5.update(data)
+            return md5.hexdigest()
+
+        checksums = parallel_map(lambda checksum: checksum(), [remote_md5, local_md5])
+        if checksums[0] is not None and checksums[0] != checksums[1]:
+            raise RemoteAccountError(self, "Checksum of %s on the node (%s) doesn't match the local copy %s (%s)" %
+                                     (remote_path, checksums[0], local_path, checksums[1]))
+
+    def _tar_available(self):
+        """Return True if directories can be copied to and from this node with tar. The result is cached."""
+        if self._has_tar is None:
+            self._has_tar = self.ssh("tar --version", allow_fail=True) == 0
+        return self._has_tar
+
+    def _open_exec_channel(self, cmd):
+        self._log(logging.DEBUG, "Running ssh command: %s" % cmd)
+        chan = self._open_session()
+        chan.exec_command(cmd)
+        return chan
+
+    def _tar_from(self, src, dest, compress):
+        """Stream the contents of directory src on this node into the existing local directory dest.
+
+        Symlinks are followed, like they are by the SFTP copy.
+        """
+        cmd = "tar -C %s -ch%sf - ." % (pipes.quote(src), "z" if compress else "")
+        chan = self._open_exec_channel(cmd)
+        stdout = chan.makefile('rb', -1)
+        stderr = chan.makefile_stderr('rb', -1)
+        try:
+            try:
+                tar = tarfile.open(fileobj=stdout, mode="r|gz" if compress else "r|")
+                try:
+                    tar.extractall(dest)
+                finally:
+                    tar.close()
+            except tarfile.TarError:
+                # a failure of the remote tar command is more informative than a truncated stream
+                if chan.exit_status_ready() and chan.recv_exit_status() not in TAR_SUCCESS_EXIT_STATUSES:
+                    raise RemoteCommandError(self, cmd, chan.recv_exit_status(), stderr.read())
+                raise
+
+            exit_status = chan.recv_exit_status()
+            if exit_status not in TAR_SUCCESS_EXIT_STATUSES:
+                raise RemoteCommandError(self, cmd, exit_status, stderr.read())
+        finally:
+            stdout.close()
+            stderr.close()
+            chan.close()
+
+    def _tar_to(self, src, dest, compress):
+        """Stream the contents of local directory src into directory dest on this node, which must not exist yet."""
+        cmd = "mkdir %s && tar -C %s -x%sf -" % (pipes.quote(dest), pipes.quote(dest), "z" if compress else "")
+        chan = self._open_exec_channel(cmd)
+        stdin = chan.makefile('wb', -1)
+        stderr = chan.makefile_stderr('rb', -1)
+        try:
+            try:
+                tar = tarfile.open(fileobj=stdin, mode="w|gz" if compress else "w|", dereference=True)
+                try:
+                    _add_dir_to_tar(tar, src)
+                finally:
+                    tar.close()
+                stdin.flush()
+                chan.shutdown_write()
+            except (IOError, socket.error):
+                # the remote command exited early, e.g. because dest could not be created
+                if not chan.exit_status_ready() or chan.recv_exit_status() == 0:
+                    raise
+
+            exit_status = chan.recv_exit_status()
+            if exit_status != 0:
+                raise RemoteCommandError(self, cmd, exit_status, stderr.read())
+        finally:
+            stdin.close()
+            stderr.close()
+            chan.close()
+
+    def _stat_mode(self, path):
+        """Mode of path, following symlinks, or 0 if path doesn't exist."""
+        try:
+            return self.sftp_client.stat(path).st_mode
+        except (IOError, OSError):
+            return 0
+
+    def stat_many(self, paths):
+        """Check the type of many paths with a single remote command.
+
+        :param paths: list of paths on this node
+        :return: dict mapping each path to a ``RemotePathInfo``. As with ``isfile`` and ``isdir``, symlinks are
+            followed, except for ``exists`` and ``islink``.
+        """
+        if len(paths) == 0:
+            return {}
+
+        cmd = 'for p in %s; do ' % " ".join(pipes.quote(p) for p in paths)
+        cmd += 'if [ -L "$p" ]; then l=1; else l=0; fi; '
+        cmd += 'if [ -d "$p" ]; then t=d; elif [ -f "$p" ]; then t=f; elif [ -e "$p" ]; then t=o; else t=-; fi; '
+        cmd += 'echo "$t$l"; done'
+        lines = self.ssh_output(cmd, combine_stderr=False).splitlines()
+
+        return {
+            path: RemotePathInfo(exists=line[0] != "-" or line[1] == "1", isfile=line[0] == "f",
+                                 isdir=line[0] == "d", islink=line[1] == "1")
+            for path, line in zip(paths, lines)
+        }
+
+    def walk(self, top):
+        """Remote version of ``os.walk``, top-down and following symlinks, which yields
+        (dirpath, dirnames, filenames) for top and each directory under it. Anything which is neither a file nor a
+        directory is left out.
+
+        The whole tree is listed with a single ``find`` command. If that doesn't work on this node, e.g. because
+        find doesn't support -printf, the tree is listed over SFTP one directory at a time instead.
+        """
+        # entries are separated by null bytes, since those can't appear in file names
+        cmd = "find -L %s -mindepth 1 -printf '%%y %%P\\0'" % pipes.quote(top)
+        chan = self._open_exec_channel(cmd)
+        stdout = chan.makefile('rb', -1)
+        try:
+            output = stdout.read()
+            exit_status = chan.recv_exit_status()
+        finally:
+            stdout.close()
+            chan.close()
+
+        if exit_status != 0 and len(output) == 0:
+            # find exits with status 1 on e.g. symlink loops, but still lists everything else
+            for entry in self._sftp_walk(top):
+                yield entry
+            return
+
+        tree = collections.OrderedDict([("", ([], []))])
+        for entry in output.split("\0"):
+            if len(entry) < 2:
+                continue
+            file_type, relpath = entry[0], entry[2:]
+            parent, name = os.path.split(relpath)
+            if parent not in tree:
+                continue
+            if file_type == "d":
+                tree[parent][0].append(name)
+                tree[relpath] = ([], [])
+            elif file_type == "f":
+                tree[parent][1].append(name)
+
+        # find lists each directory before its contents, so this order is top-down
+        for relpath, (dirnames, filenames) in tree.items():
+            yield os.path.join(top, relpath) if relpath else top, dirnames, filenames
+
+    def _sftp_walk(self, top):
+        dirnames = []
+        filenames = []
+        for obj in self.sftp_client.listdir(top):
+            mode = self._stat_mode(os.path.join(top, obj))
+            if stat.S_ISDIR(mode):
+                dirnames.append(obj)
+            elif stat.S_ISREG(mode):
+                filenames.append(obj)
+
+        yield top, dirnames, filenames
+        for d in dirnames:
+            for entry in self._sftp_walk(os.path.join(top, d)):
+                yield entry
+
     def islink(self, path):
         try:
             # stat should follow symlinks
@@ -561,7 +1108,56 @@ class RemoteAccount(HttpMixin):
             offset = int(self.ssh_output("wc -c %s" % log).split()[0])
         except:
             offset = 0
-        yield LogMonitor(self, log, offset)
+
+        monitor = LogMonitor(self, log, offset)
+        try:
+            yield monitor
+        finally:
+            monitor.close()
+
+
+# Result of RemoteAccount.stat_many for a single path
+RemotePathInfo = collections.namedtuple("RemotePathInfo", ["exists", "isfile", "isdir", "islink"])
+
+
+# Result of RemoteAccount.ssh_result. Service.ssh_all also sets error to the exception describing the failure of the
+# command on a node, if any.
+RemoteCommandResult = collections.namedtuple("RemoteCommandResult", ["exit_status", "output", "stderr", "error"])
+RemoteCommandResult.__new__.__defaults__ = (None,)
+
+
+# Largest chunk of command output read from an ssh channel at a time
+SSH_READ_BYTES = 64 * 1024
+
+
+# Largest range of a file read over SFTP at once, in pipelined requests, when a file is copied in parallel ranges
+PARALLEL_COPY_BATCH_BYTES = 8 * 1024 * 1024
+
+
+def _split_range(byte_range, max_length):
+    """Split (offset, length) byte_range into consecutive (offset, length) ranges of at most max_length bytes."""
+    offset, length = byte_range
+    end = offset + length
+    return [(o, min(max_length, end - o)) for o in range(offset, end, max_length)]
+
+
+# Size of the chunks in which copy_between relays data from one node to another
+RELAY_BUFFER_BYTES = 1024 * 1024
+
+# GNU tar exits with status 1 if a file changed while it was being archived, which is expected for logs
+TAR_SUCCESS_EXIT_STATUSES = (0, 1)
+
+
+def _add_dir_to_tar(tar, path, arcname=""):
+    """Add the contents of the local directory path to tar, skipping anything which is not a file or directory."""
+    for obj in sorted(os.listdir(path)):
+        obj_path = os.path.join(path, obj)
+        obj_arcname = os.path.join(arcname, obj)
+        if os.path.isfile(obj_path):
+            tar.add(obj_path, arcname=obj_arcname)
+        elif os.path.isdir(obj_path):
+            tar.add(obj_path, arcname=obj_arcname, recursive=False)
+            _add_dir_to_tar(tar, obj_path, obj_arcname)
 
 
 class SSHOutputIter(object):
@@ -617,6 +1213,136 @@ class SSHOutputIter(object):
         return self.cached is not self.sentinel
 
 
+# Contents of Python character sets equivalent to the POSIX character classes, which re doesn't support
+_POSIX_CHARACTER_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "\\x21-\\x7e",
+    "lower": "a-z",
+    "print": "\\x20-\\x7e",
+    "punct": "!-/:-@\\[-`{-~",
+    "space": " \\t\\n\\r\\f\\v",
+    "upper": "A-Z",
+    "xdigit": "0-9A-Fa-f",
+}
+
+
+def _translate_bracket_expression(pattern, i):
+    """Translate the bracket expression starting at pattern[i], which is "[".
+
+    :return (Python character set, index just after the expression), or None if the expression isn't closed
+    """
+    out = ["["]
+    i += 1
+    if i < len(pattern) and pattern[i] == "^":
+        out.append("^")
+        i += 1
+    first = True
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "]" and not first:
+            out.append("]")
+            return "".join(out), i + 1
+        first = False
+
+        if c == "[" and i + 1 < len(pattern) and pattern[i + 1] in ":=.":
+            delimiter = pattern[i + 1]
+            close = pattern.find(delimiter + "]", i + 2)
+            if close >= 0:
+                name = pattern[i + 2:close]
+                if delimiter == ":" and name in _POSIX_CHARACTER_CLASSES:
+                    out.append(_POSIX_CHARACTER_CLASSES[name])
+                else:
+                    out.append(re.escape(name))
+                i = close + 2
+                continue
+
+        # Backslashes are not special in bracket expressions
+        out.append("\\" + c if c in "\\[]^" else c)
+        i += 1
+    return None
+
+
+def _grep_pattern_to_re(pattern):
+    """Translate a grep basic regular expression, including the GNU extensions, to an equivalent Python regular
+    expression.
+    """
+    if "\n" in pattern:
+        # Like grep, each line of the pattern is a separate pattern
+        return "|".join("(?:%s)" % _grep_pattern_to_re(p) for p in pattern.split("\n"))
+
+    out = []
+    groups = []  # indexes in out of the groups which are open
+    atom = 0  # index in out of the last atom, i.e. of what a repetition operator applies to
+    # What the previous token was: the start of the pattern or of a group or alternative, the "^" anchor, a
+    # repetition operator, or anything else
+    previous = "start"
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            e = pattern[i + 1]
+            i += 2
+            if e == "(":
+                groups.append(len(out))
+                token, kind = e, "start"
+            elif e == "|":
+                token, kind = e, "start"
+            elif e == ")":
+                atom = groups.pop() if len(groups) > 0 else len(out)
+                out.append(e)
+                previous = "group"
+                continue
+            elif e in "+?" and previous not in ("start", "anchor"):
+                token, kind = e, "repeat"
+            elif e == "{" and previous not in ("start", "anchor") and pattern.find("\\}", i) >= 0:
+                close = pattern.find("\\}", i)
+                token, kind = "{" + pattern[i:close] + "}", "repeat"
+                i = close + 2
+            elif e in "<>":
+                token, kind = "\\b", "anchor"
+            elif e == "`":
+                token, kind = "\\A", "anchor"
+            elif e == "'":
+                token, kind = "\\Z", "anchor"
+            elif e in "wWsS123456789":
+                token, kind = "\\" + e, "atom"
+            elif e in "bB":
+                token, kind = "\\" + e, "anchor"
+            else:
+                token, kind = re.escape(e), "atom"
+        elif c == "[":
+            translated = _translate_bracket_expression(pattern, i)
+            if translated is None:
+                token, kind, i = re.escape(c), "atom", i + 1
+            else:
+                (token, i), kind = translated, "atom"
+        else:
+            i += 1
+            if c == "*" and previous not in ("start", "anchor"):
+                token, kind = c, "repeat"
+            elif c == "^" and previous == "start":
+                token, kind = c, "anchor"
+            elif c == "$" and (i == len(pattern) or pattern[i:i + 2] in ("\\)", "\\|")):
+                token, kind = c, "anchor"
+            elif c == ".":
+                token, kind = c, "atom"
+            else:
+                token, kind = re.escape(c), "atom"
+
+        if kind == "repeat" and previous == "repeat":
+            # Python doesn't allow repeating a repetition without a group
+            out[atom:] = ["(?:%s)" % "".join(out[atom:])]
+        if kind == "atom":
+            atom = len(out)
+        out.append(token)
+        previous = kind
+    return "".join(out)
+
+
 class LogMonitor(object):
     """
     Helper class returned by monitor_log. Should be used as::
@@ -626,21 +1352,143 @@ class LogMonitor(object):
             monitor.wait_until("pattern.*to.*grep.*for", timeout_sec=5)
 
     to run the command and then wait for the pattern to appear in the log.
+
+    The log is followed with a single ``tail -F`` command, which is kept running until the monitor is closed, and
+    patterns are matched on the test driver as new data arrives. Every call to wait_until sees the whole log after
+    the initial offset, but lines are not kept in memory: the part of the log which was already read is only read
+    again for patterns which weren't searched for before.
     """
 
+    # Maximum number of bytes to read from the log at a time
+    READ_BYTES = 64 * 1024
+
     def __init__(self, acct, log, offset):
         self.acct = acct
         self.log = log
         self.offset = offset
 
-    def wait_until(self, pattern, **kwargs):
+        self._chan = None
+        self._bytes_read = 0
+        self._partial_line = ""  # the data read after the last complete line
+        self._found = set()  # patterns which were found in the log
+        self._searched = {}  # pattern -> number of bytes of complete lines searched without finding it
+
+    def _follow(self):
+        """Start following the log from the first byte which hasn't been read yet."""
+        # The log is followed until stdin is closed, i.e. until the channel is closed, so that tail doesn't outlive
+        # the monitor.
+        cmd = "tail -c +%d -F %s 2>/dev/null & pid=$!; cat >/dev/null; kill $pid" % \
+            (self.offset + self._bytes_read + 1, pipes.quote(self.log))
+        self.acct._log(logging.DEBUG, "Running ssh command: %s" % cmd)
+        self._chan = self.acct._open_session()
+        self._chan.exec_command(cmd)
+
+    @property
+    def _lines_bytes(self):
+        """Number of bytes of complete lines read from the log"""
+        return self._bytes_read - len(self._partial_line)
+
+    def _read_lines(self, timeout_sec, backoff_sec):
+        """Wait up to timeout_sec for more data from the log.
+
+        :return the lines completed by the new data
+        """
+        if self._chan is None:
+            self._follow()
+
+        self._chan.settimeout(max(timeout_sec, 0))
+        try:
+            data = self._chan.recv(self.READ_BYTES)
+            if len(data) == 0:
+                # The remote command exited unexpectedly. Try again later.
+                self.close()
+                time.sleep(min(backoff_sec, max(timeout_sec, 0)))
+        except socket.timeout:
+            data = ""
+
+        self._bytes_read += len(data)
+        lines = (self._partial_line + data).split("\n")
+        self._partial_line = lines.pop()
+        return lines
+
+    def _read_lines_again(self, start):
+        """Read the complete lines which were already read from the log again, from byte start onwards.
+
+        :return iterator over the lines
+        """
+        cmd = "tail -c +%d %s | head -c %d" % \
+            (self.offset + start + 1, pipes.quote(self.log), self._lines_bytes - start)
+        partial_line = ""
+        for data in self.acct.ssh_stream(cmd, chunk_bytes=self.READ_BYTES):
+            lines = (partial_line + data).split("\n")
+            partial_line = lines.pop()
+            for line in lines:
+                yield line
+
+    @staticmethod
+    def _compile(pattern):
+        if hasattr(pattern, "search"):
+            return pattern
+        return re.compile(_grep_pattern_to_re(pattern))
+
+    def wait_until(self, pattern, timeout_sec, backoff_sec=.1, err_msg=""):
         """
         Wait until the specified pattern is found in the log, after the initial
-        offset recorded when the LogMonitor was created. Additional keyword args
-        are passed directly to ``ducktape.utils.util.wait_until``
+        offset recorded when the LogMonitor was created.
+
+        :param pattern: pattern to search for in each line of the log, or a list of patterns which must all be found.
+            Strings are grep basic regular expressions, as in ``grep 'pattern'``. To use Python regular expressions
+            instead, pass patterns compiled with ``re.compile``.
+        :param timeout_sec: how long to wait for the patterns to appear
+        :param backoff_sec: how long to wait before following the log again if the remote tail command fails. New data
+            is otherwise processed as soon as it is written to the log.
+        :param err_msg: message of the ``TimeoutError`` raised if the patterns aren't all found in time
         """
-        return wait_until(lambda: self.acct.ssh("tail -c +%d %s | grep '%s'" % (self.offset + 1, self.log, pattern),
-                                                allow_fail=True) == 0, **kwargs)
+        patterns = [pattern] if isinstance(pattern, basestring) or hasattr(pattern, "search") else pattern
+        remaining = dict((p, self._compile(p)) for p in patterns if p not in self._found)
+
+        def search(lines):
+            for line in lines:
+                for p in [p for p, regex in remaining.items() if regex.search(line)]:
+                    del remaining[p]
+                    self._found.add(p)
+            return len(remaining) == 0
+
+        # Search the lines which were already read for any patterns which weren't searched for in all of them
+        unsearched = [self._searched.get(p, 0) for p in remaining if self._searched.get(p, 0) < self._lines_bytes]
+        if len(unsearched) > 0 and search(self._read_lines_again(min(unsearched))):
+            return
+
+        stop = time.time() + timeout_sec
+        while True:
+            for p in remaining:
+                self._searched[p] = self._lines_bytes
+            if search([self._partial_line]):
+                return
+            if time.time() >= stop:
+                raise TimeoutError(err_msg)
+            if search(self._read_lines(stop - time.time(), backoff_sec)):
+                return
+
+    def close(self):
+        """Stop following the log."""
+        if self._chan is not None:
+            self._chan.close()
+            self._chan = None
+
+    @staticmethod
+    def wait_until_all(monitors, pattern, timeout_sec, backoff_sec=.1, err_msg=""):
+        """Wait until pattern is found by each of the given monitors, e.g. in the logs of all nodes of a service.
+
+        The logs are checked concurrently, so the whole call takes at most about timeout_sec.
+        """
+        try:
+            parallel_map(lambda m: m.wait_until(pattern, timeout_sec, backoff_sec, err_msg), monitors)
+        except ParallelError as e:
+            if all(isinstance(exception, TimeoutError) for _, exception, _ in e.errors):
+                raise TimeoutError("%s Timed out waiting on: %s" %
+                                   (err_msg, ", ".join("%s:%s" % (m.acct, m.log) for m, _, _ in e.errors)))
+            raise
 
 
 class IgnoreMissingHostKeyPolicy(MissingHostKeyPolicy):
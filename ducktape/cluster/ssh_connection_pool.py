@@ -0,0 +1,170 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+
+
+def is_healthy(client):
+    """Return True iff the SSH connection of the given client is still usable."""
+    transport = client.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+
+    try:
+        # Make sure the connection is still alive, e.g. the node hasn't been restarted, with a message the server
+        # ignores
+        transport.send_ignore()
+        return True
+    except Exception:
+        return False
+
+
+class SSHConnectionPool(object):
+    """Keeps SSH connections to cluster nodes open between uses, so that allocating the same node again does not
+    require a new SSH handshake.
+
+    Connections are keyed by RemoteAccountSSHConfig. Idle connections are health checked before they are reused, and
+    closed once they have been idle for longer than ttl_sec.
+
+    Connections can't be shared with forked processes, so a process never reuses connections opened by its parent.
+    """
+
+    def __init__(self, ttl_sec=300, max_idle_per_host=4):
+        self.ttl_sec = ttl_sec
+        self.max_idle_per_host = max_idle_per_host
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._idle = {}  # ssh_config -> list of (client, time the client was released)
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            # Inherited from the parent process. Don't close these, since that could affect the parent's connections.
+            self._idle = {}
+            self._pid = os.getpid()
+
+    def acquire(self, ssh_config, connect):
+        """Get a connected SSHClient for the given ssh config.
+
+        :param ssh_config: RemoteAccountSSHConfig of the node to connect to
+        :param connect: function returning a new connected SSHClient, used if there is no idle connection to reuse
+        """
+        while True:
+            with self._lock:
+                self._check_pid()
+                idle = self._idle.get(ssh_config)
+                if not idle:
+                    break
+                client, released_time = idle.pop()
+
+            if time.time() - released_time < self.ttl_sec and is_healthy(client):
+                return client
+            client.close()
+
+        return connect()
+
+    def release(self, ssh_config, client):
+        """Return a client acquired with acquire to the pool.
+
+        This also closes idle connections to any node which have expired.
+        """
+        to_close = []
+        with self._lock:
+            self._check_pid()
+            now = time.time()
+            for idle in self._idle.values():
+                to_close.extend(c for c, released_time in idle if now - released_time >= self.ttl_sec)
+                idle[:] = [(c, released_time) for c, released_time in idle if now - released_time < self.ttl_sec]
+
+            idle = self._idle.setdefault(ssh_config, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((client, now))
+            else:
+                to_close.append(client)
+
+        for c in to_close:
+            c.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            self._check_pid()
+            idle, self._idle = self._idle, {}
+
+        for clients in idle.values():
+            for client, _ in clients:
+                client.close()
+
+
+class SSHConnections(object):
+    """The SSH connections taken from a pool by a single RemoteAccount.
+
+    Channels are opened over the first connection with fewer than max_channels open channels. If all connections are
+    busy, another connection is taken from the pool.
+    """
+
+    def __init__(self, pool, ssh_config, connect, max_channels):
+        self.pool = pool
+        self.ssh_config = ssh_config
+        self.connect = connect
+        self.max_channels = max_channels
+        self.pid = os.getpid()
+        self._lock = threading.RLock()
+        self._clients = []  # list of (client, channels opened with this class over the client)
+
+    def _add_client(self):
+        client = self.pool.acquire(self.ssh_config, self.connect)
+        self._clients.append((client, []))
+        return self._clients[-1]
+
+    @property
+    def primary(self):
+        """The connection used for everything other than channels opened with open_session, e.g. sftp."""
+        with self._lock:
+            if len(self._clients) == 0:
+                self._add_client()
+            return self._clients[0][0]
+
+    def open_session(self, timeout=None):
+        """Open a new channel, over a connection which has fewer than max_channels channels open."""
+        with self._lock:
+            for client, channels in self._clients:
+                channels[:] = [c for c in channels if not c.closed]
+                if len(channels) < self.max_channels:
+                    break
+            else:
+                client, channels = self._add_client()
+
+            chan = client.get_transport().open_session(timeout=timeout)
+            channels.append(chan)
+            return chan
+
+    def release(self):
+        """Return all connections to the pool."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+
+        if self.pid != os.getpid():
+            # The connections belong to the parent process
+            return
+
+        for client, channels in clients:
+            for chan in channels:
+                chan.close()
+            self.pool.release(self.ssh_config, client)
+
+
+# Connections are shared by all remote accounts in this process
+ssh_connection_pool = SSHConnectionPool()
@@ -41,6 +41,10 @@ class WindowsRemoteAccount(RemoteAccount):
         self.os = RemoteAccount.WINDOWS
         self._winrm_client = None
 
+    def _tar_available(self):
+        """Windows nodes may not have a POSIX shell and tar, so directories are always copied over SFTP."""
+        return False
+
     @property
     def winrm_client(self):
         # TODO: currently this only works in AWS EC2 provisioned by Vagrant. Add support for other environments.
@@ -40,6 +40,16 @@ class ConsoleDefaults(object):
     # Folders with test reports, logs, etc all are created in this directory
     RESULTS_ROOT_DIRECTORY = "./results"
 
+    # Run times of previous test runs are recorded in this file in the results root directory
+    RUN_HISTORY_FILE = "run_history.jsonl"
+
+    # While tests run, summary reports of the results so far are rewritten at most this often. Each result is also
+    # appended to a journal as soon as its test finishes.
+    PARTIAL_REPORT_INTERVAL_SEC = 30
+
+    # Once a test has finished, wait at most this long for the asynchronous events its client sent before it finished
+    ASYNC_EVENTS_TIMEOUT_SEC = 30
+
     SESSION_LOG_FORMATTER = '[%(levelname)s:%(asctime)s]: %(message)s'
     TEST_LOG_FORMATTER = '[%(levelname)-5s - %(asctime)s - %(module)s - %(funcName)s - lineno:%(lineno)s]: %(message)s'
 
@@ -22,6 +22,7 @@ import pysistence
 
 from ducktape.command_line.defaults import ConsoleDefaults
 from ducktape.command_line.parse_args import parse_args
+from ducktape.tests.history import RunHistory
 from ducktape.tests.loader import TestLoader, LoaderException
 from ducktape.tests.loggermaker import close_logger
 from ducktape.tests.reporter import SimpleStdoutSummaryReporter, SimpleFileSummaryReporter, \
@@ -144,10 +145,13 @@ def main():
     for k, v in args_dict.iteritems():
         session_logger.debug("Configuration: %s=%s", k, v)
 
+    run_history = RunHistory(os.path.join(args_dict["results_root"], ConsoleDefaults.RUN_HISTORY_FILE))
+
     # Discover and load tests to be run
     extend_import_paths(args_dict["test_path"])
     loader = TestLoader(session_context, session_logger, repeat=args_dict["repeat"], injected_args=injected_args,
-                        subset=args_dict["subset"], subsets=args_dict["subsets"])
+                        subset=args_dict["subset"], subsets=args_dict["subsets"],
+                        historical_report=args_dict["historical_report"])
     try:
         tests = loader.load(args_dict["test_path"])
     except LoaderException as e:
@@ -176,8 +180,10 @@ def main():
         print traceback.format_exc(limit=16)
         sys.exit(1)
 
-    # Run the tests
-    runner = TestRunner(cluster, session_context, session_logger, tests)
+    # Run the tests. The local run history only orders tests within this session: subsets are computed from the
+    # historical report alone, since every machine running a subset has to see the same run times.
+    run_time_estimates = loader.historical_run_times() or run_history.run_times()
+    runner = TestRunner(cluster, session_context, session_logger, tests, run_time_estimates=run_time_estimates)
     test_results = runner.run_all_tests()
 
     # Report results
@@ -191,6 +197,7 @@ def main():
     for r in reporters:
         r.report()
 
+    run_history.record(test_results)
     update_latest_symlink(args_dict["results_root"], results_dir)
     close_logger(session_logger)
     if not test_results.get_aggregate_success():
@@ -56,6 +56,15 @@ def create_ducktape_parser():
                              "This can be a file containing a JSON object, or a string representing a JSON object.")
     parser.add_argument("--max-parallel", action="store", type=int, default=1,
                         help="Upper bound on number of tests run simultaneously.")
+    parser.add_argument("--reuse-workers", action="store_true",
+                        help="run tests in long-lived worker processes instead of starting a new process for every "
+                             "test. Workers keep imported test modules cached between tests.")
+    parser.add_argument("--max-tests-per-worker", action="store", type=int, default=None,
+                        help="when used with --reuse-workers, replace each worker process after it has run this many "
+                             "tests. This limits the impact of tests which leak memory or other resources.")
+    parser.add_argument("--concurrent-teardown", action="store_true",
+                        help="stop and clean independent services concurrently at the end of each test. Services are "
+                             "still torn down before any services listed in their dependencies.")
     parser.add_argument("--repeat", action="store", type=int, default=1,
                         help="Use this flag to repeat all discovered tests the given number of times.")
     parser.add_argument("--subsets", action="store", type=int, default=1,
@@ -64,10 +73,17 @@ def create_ducktape_parser():
     parser.add_argument("--subset", action="store", type=int, default=0,
                         help="Which subset of the tests to run, based on the breakdown using the parameter for "
                              "--subsets")
+    parser.add_argument("--work-queue", action="store", type=str, default=None,
+                        help="directory shared by several ducktape processes running the same tests, each on its "
+                             "own cluster. Each process claims tests from the shared directory as it goes, so the "
+                             "tests are divided dynamically instead of statically as with --subsets. Use a new "
+                             "directory for every run.")
     parser.add_argument("--historical-report", action="store", type=str,
                         help="URL of a JSON report file containing stats from a previous test run. If specified, "
                              "this will be used when creating subsets of tests to divide evenly by total run time "
-                             "instead of by number of tests.")
+                             "instead of by number of tests, and to run the longest tests first. Otherwise, run "
+                             "times recorded by previous runs in the results root directory are used to run the "
+                             "longest tests first, but not to create subsets.")
     return parser
 
 
@@ -19,3 +19,18 @@ class DucktapeError(RuntimeError):
 
 class TimeoutError(DucktapeError):
     pass
+
+
+class ParallelError(DucktapeError):
+    """Raised when one or more of the calls made by ducktape.utils.util.parallel_map fail.
+
+    errors is a list of (item, exception, traceback string) tuples, one for each failed call, in the order of the
+    items passed to parallel_map.
+    """
+
+    def __init__(self, errors, num_calls):
+        self.errors = errors
+        msg = "%d of %d parallel calls failed:" % (len(errors), num_calls)
+        for item, exception, tb in errors:
+            msg += "\n%s: %s: %s" % (str(item), exception.__class__.__name__, str(exception))
+        super(ParallelError, self).__init__(msg)
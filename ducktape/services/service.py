@@ -15,13 +15,16 @@
 
 from ducktape.command_line.defaults import ConsoleDefaults
 from ducktape.template import TemplateRenderer
-from ducktape.errors import TimeoutError
-from ducktape.cluster.remoteaccount import RemoteAccount
+from ducktape.errors import ParallelError, TimeoutError
+from ducktape.cluster.remoteaccount import RemoteAccount, RemoteCommandError, RemoteCommandResult
+from ducktape.utils.util import parallel_map
 
+import collections
 import os
 import shutil
 import tempfile
 import time
+import traceback
 
 
 class Service(TemplateRenderer):
@@ -52,6 +55,11 @@ class Service(TemplateRenderer):
     # }
     logs = {}
 
+    # Maximum number of nodes on which start_node, stop_node and clean_node are run concurrently by start, stop and
+    # clean. By default nodes are handled one at a time; services whose nodes can be started and stopped independently
+    # of each other can raise this to speed up the service lifecycle.
+    lifecycle_concurrency = 1
+
     def __init__(self, context, num_nodes=None, node_spec=None, *args, **kwargs):
         """
         :param context:    An object which has at minimum 'cluster' and 'logger' attributes. In tests, this is always a
@@ -72,11 +80,16 @@ class Service(TemplateRenderer):
         self._stop_time = -1
         self._stop_duration_seconds = -1
         self._clean_time = -1
+        self._clean_duration_seconds = -1
 
         self._initialized = False
         self.node_spec = Service.setup_node_spec(num_nodes, node_spec)
         self.context = context
 
+        # Other services this service depends on. With concurrent teardown, a service is always stopped and cleaned
+        # before the services it depends on, e.g. kafka brokers before zookeeper.
+        self.dependencies = []
+
         self.nodes = []
         self.allocate_nodes()
 
@@ -211,6 +224,14 @@ class Service(TemplateRenderer):
 
         self.logger.debug("Successfully allocated %d nodes to %s" % (len(self.nodes), self.who_am_i()))
 
+    def _for_each_node(self, func):
+        """Call func on each node of this service, on up to lifecycle_concurrency nodes at a time.
+
+        If func fails on any node when running concurrently, a ParallelError listing the failures on all nodes is
+        raised once func has completed on every node.
+        """
+        return parallel_map(func, self.nodes, max_workers=self.lifecycle_concurrency)
+
     def start(self):
         """Start the service on all nodes."""
         self.logger.info("%s: starting service" % self.who_am_i())
@@ -219,27 +240,29 @@ class Service(TemplateRenderer):
             self._start_time = time.time()
 
         self.logger.debug(self.who_am_i() + ": killing processes and attempting to clean up before starting")
-        for node in self.nodes:
-            # Added precaution - kill running processes, clean persistent files
-            # try/except for each step, since each of these steps may fail if there are no processes
-            # to kill or no files to remove
+        self._for_each_node(self._stop_and_clean_node)
+        self._for_each_node(self._start_node)
 
-            try:
-                self.stop_node(node)
-            except:
-                pass
+        if self._start_duration_seconds < 0:
+            self._start_duration_seconds = time.time() - self._start_time
 
-            try:
-                self.clean_node(node)
-            except:
-                pass
+    def _stop_and_clean_node(self, node):
+        # Added precaution - kill running processes, clean persistent files
+        # try/except for each step, since each of these steps may fail if there are no processes
+        # to kill or no files to remove
+        try:
+            self.stop_node(node)
+        except:
+            pass
 
-        for node in self.nodes:
-            self.logger.debug("%s: starting node" % self.who_am_i(node))
-            self.start_node(node)
+        try:
+            self.clean_node(node)
+        except:
+            pass
 
-        if self._start_duration_seconds < 0:
-            self._start_duration_seconds = time.time() - self._start_time
+    def _start_node(self, node):
+        self.logger.debug("%s: starting node" % self.who_am_i(node))
+        self.start_node(node)
 
     def start_node(self, node):
         """Start service process(es) on the given node."""
@@ -278,12 +301,14 @@ class Service(TemplateRenderer):
         """
         self._stop_time = time.time()  # The last time stop is invoked
         self.logger.info("%s: stopping service" % self.who_am_i())
-        for node in self.nodes:
-            self.logger.info("%s: stopping node" % self.who_am_i(node))
-            self.stop_node(node)
+        self._for_each_node(self._stop_node)
 
         self._stop_duration_seconds = time.time() - self._stop_time
 
+    def _stop_node(self, node):
+        self.logger.info("%s: stopping node" % self.who_am_i(node))
+        self.stop_node(node)
+
     def stop_node(self, node):
         """Halt service process(es) on this node."""
         raise NotImplementedError("%s: subclasses must implement stop_node." % self.who_am_i())
@@ -294,9 +319,12 @@ class Service(TemplateRenderer):
         """
         self._clean_time = time.time()
         self.logger.info("%s: cleaning service" % self.who_am_i())
-        for node in self.nodes:
-            self.logger.info("%s: cleaning node" % self.who_am_i(node))
-            self.clean_node(node)
+        self._for_each_node(self._clean_node)
+        self._clean_duration_seconds = time.time() - self._clean_time
+
+    def _clean_node(self, node):
+        self.logger.info("%s: cleaning node" % self.who_am_i(node))
+        self.clean_node(node)
 
     def clean_node(self, node):
         """Clean up persistent state on this node - e.g. service logs, configuration files etc."""
@@ -339,6 +367,66 @@ class Service(TemplateRenderer):
         if self._local_scratch_dir and os.path.exists(self._local_scratch_dir):
             shutil.rmtree(self._local_scratch_dir)
 
+    def ssh_all(self, cmd, nodes=None, allow_fail=False, combine_stderr=True, timeout_sec=None, max_parallel=None):
+        """Run a command on many nodes of this service concurrently, and wait for it to complete on all of them.
+
+        :param cmd: The remote ssh command, or a function taking a node and returning the command to run on it.
+        :param nodes: The nodes to run the command on. Default None, i.e. all nodes of this service.
+        :param allow_fail: If True, the results of failed commands are returned like the others. Otherwise, a
+            ``ParallelError`` listing the nodes on which the command failed is raised once it has completed everywhere.
+        :param combine_stderr: If True, return output from both stderr and stdout of the remote process as output.
+        :param timeout_sec: Maximum time to wait for the command to complete on all nodes. Default None, i.e. wait
+            indefinitely.
+        :param max_parallel: Maximum number of nodes to run the command on at a time. Default None, i.e. all nodes.
+
+        :return: OrderedDict mapping each node to a ``RemoteCommandResult``. Its error is set if the command timed
+            out or exited with a nonzero status on the node.
+        """
+        if nodes is None:
+            nodes = self.nodes
+        deadline = None if timeout_sec is None else time.time() + timeout_sec
+
+        def run(node):
+            node_cmd = cmd(node) if callable(cmd) else cmd
+            try:
+                result = node.account.ssh_result(
+                    node_cmd, combine_stderr=combine_stderr,
+                    timeout_sec=None if deadline is None else max(deadline - time.time(), 0))
+            except Exception as e:
+                return RemoteCommandResult(exit_status=None, output="", stderr="", error=e), traceback.format_exc()
+
+            if result.exit_status != 0:
+                error = RemoteCommandError(node.account, node_cmd, result.exit_status, result.stderr)
+                result = result._replace(error=error)
+            return result, None
+
+        results = collections.OrderedDict()
+        errors = []
+        for node, (result, tb) in zip(nodes, parallel_map(run, nodes, max_workers=max_parallel)):
+            results[node] = result
+            if result.error is not None:
+                errors.append((node, result.error, tb))
+
+        if errors and not allow_fail:
+            raise ParallelError(errors, len(nodes))
+        return results
+
+    def wait_for_http_service(self, port, headers=None, timeout_sec=20, path='/', nodes=None):
+        """Wait until an http endpoint is available on the given nodes of this service, checking them concurrently.
+
+        :param nodes: The nodes to check. Default None, i.e. all nodes of this service.
+        :raise TimeoutError: If the endpoint isn't available on all nodes within timeout_sec
+        """
+        nodes = self.nodes if nodes is None else nodes
+        try:
+            parallel_map(lambda node: node.account.wait_for_http_service(port, headers or {}, timeout_sec, path),
+                         nodes)
+        except ParallelError as e:
+            if all(isinstance(exception, TimeoutError) for _, exception, _ in e.errors):
+                raise TimeoutError("%s: timed out waiting for http service on port %s of %s" %
+                                   (self.who_am_i(), str(port), ", ".join(self.who_am_i(n) for n, _, _ in e.errors)))
+            raise
+
     @staticmethod
     def run_parallel(*args):
         """Helper to run a set of services in parallel. This is useful if you want
@@ -363,7 +451,8 @@ class Service(TemplateRenderer):
                 "start_duration_seconds": self._start_duration_seconds,
                 "stop_time": self._stop_time,
                 "stop_duration_seconds": self._stop_duration_seconds,
-                "clean_time": self._clean_time
+                "clean_time": self._clean_time,
+                "clean_duration_seconds": self._clean_duration_seconds
             },
             "service_id": self.service_id,
             "nodes": self._nodes_formerly_allocated
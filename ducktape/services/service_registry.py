@@ -15,12 +15,19 @@
 
 from collections import OrderedDict
 
+from ducktape.utils.util import parallel_map
+
 
 class ServiceRegistry(object):
 
-    def __init__(self):
+    def __init__(self, concurrent_teardown=False):
+        """
+        :param concurrent_teardown: if True, stop_all and clean_all act on independent services concurrently. A service
+            is only stopped or cleaned once every registered service which lists it in its dependencies is done.
+        """
         self._services = OrderedDict()
         self._nodes = {}
+        self.concurrent_teardown = concurrent_teardown
 
     def __contains__(self, item):
         return id(item) in self._services
@@ -38,50 +45,66 @@ class ServiceRegistry(object):
     def to_json(self):
         return [self._services[k].to_json() for k in self._services]
 
-    def stop_all(self):
-        """Stop all currently registered services in the reverse of the order in which they were added.
+    def _teardown_waves(self):
+        """Group the registered services into waves which can be torn down concurrently.
 
-        Note that this does not clean up persistent state or free the nodes back to the cluster.
+        The first wave contains the services no other registered service depends on, the next wave the services
+        only the first wave depends on, and so on. Within each wave, services are in reverse registration order.
         """
-        keyboard_interrupt = None
-        for service in reversed(self._services.values()):
+        remaining = list(reversed(self._services.values()))
+        waves = []
+        while len(remaining) > 0:
+            depended_on = set(id(d) for service in remaining for d in service.dependencies)
+            wave = [service for service in remaining if id(service) not in depended_on]
+            if len(wave) == 0:
+                # dependency cycle; tear down the rest in reverse registration order
+                wave = remaining[:1]
+            waves.append(wave)
+            remaining = [service for service in remaining if service not in wave]
+        return waves
+
+    def _call_on_services(self, method_name, action, services, concurrent):
+        """Call the given method on each of the given services, logging and continuing past any errors.
+
+        A KeyboardInterrupt is re-raised once all services have been handled.
+        """
+        keyboard_interrupt = []
+
+        def call(service):
             try:
-                service.stop()
+                getattr(service, method_name)()
             except BaseException as e:
                 if isinstance(e, KeyboardInterrupt):
-                    keyboard_interrupt = e
-                service.logger.warn("Error stopping service %s: %s" % (service, e.message))
+                    keyboard_interrupt.append(e)
+                service.logger.warn("Error %s service %s: %s" % (action, service, e.message))
+
+        parallel_map(call, services, max_workers=None if concurrent else 1)
 
-        if keyboard_interrupt is not None:
-            raise keyboard_interrupt
+        if len(keyboard_interrupt) > 0:
+            raise keyboard_interrupt[0]
+
+    def stop_all(self):
+        """Stop all currently registered services in the reverse of the order in which they were added.
+
+        Note that this does not clean up persistent state or free the nodes back to the cluster.
+        """
+        if self.concurrent_teardown:
+            for wave in self._teardown_waves():
+                self._call_on_services("stop", "stopping", wave, concurrent=True)
+        else:
+            self._call_on_services("stop", "stopping", reversed(self._services.values()), concurrent=False)
 
     def clean_all(self):
         """Clean all services. This should only be called after services are stopped."""
-        keyboard_interrupt = None
-        for service in self._services.values():
-            try:
-                service.clean()
-            except BaseException as e:
-                if isinstance(e, KeyboardInterrupt):
-                    keyboard_interrupt = e
-                service.logger.warn("Error cleaning service %s: %s" % (service, e.message))
-
-        if keyboard_interrupt is not None:
-            raise keyboard_interrupt
+        if self.concurrent_teardown:
+            for wave in self._teardown_waves():
+                self._call_on_services("clean", "cleaning", wave, concurrent=True)
+        else:
+            self._call_on_services("clean", "cleaning", self._services.values(), concurrent=False)
 
     def free_all(self):
         """Release nodes back to the cluster."""
-        keyboard_interrupt = None
-        for service in self._services.values():
-            try:
-                service.free()
-            except BaseException as e:
-                if isinstance(e, KeyboardInterrupt):
-                    keyboard_interrupt = e
-                service.logger.warn("Error cleaning service %s: %s" % (service, e.message))
-
-        if keyboard_interrupt is not None:
-            raise keyboard_interrupt
+        self._call_on_services("free", "freeing", self._services.values(), concurrent=False)
 
     def num_nodes(self):
         """Returns a dict where the key is the operating system and the value is the number of nodes for said OS."""
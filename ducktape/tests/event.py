@@ -13,14 +13,19 @@
 # limitations under the License.
 
 import copy
+import itertools
 import os
 import time
+import weakref
+
+from ducktape.cluster.cluster import ClusterSlot
+from ducktape.cluster.finite_subcluster import FiniteSubcluster
 
 
 class ClientEventFactory(object):
     """Used by test runner clients to generate events."""
 
-    READY = "READY"  # reply: {test_metadata, cluster, session_context}
+    READY = "READY"  # reply: {test_metadata, cluster, nodes, session_id, session_context}
     SETTING_UP = "SETTING_UP"
     RUNNING = "RUNNING"
     TEARING_DOWN = "TEARING_DOWN"
@@ -30,6 +35,9 @@ class ClientEventFactory(object):
     # Types of messages available
     TYPES = {READY, SETTING_UP, RUNNING, TEARING_DOWN, FINISHED, LOG}
 
+    # Types of messages which are pushed to the driver without waiting for a reply
+    ASYNC_TYPES = {SETTING_UP, RUNNING, TEARING_DOWN, LOG}
+
     def __init__(self, test_id, test_index, source_id):
         self.test_id = test_id
         # id of event source
@@ -81,12 +89,18 @@ class ClientEventFactory(object):
             }
         )
 
-    def ready(self):
+    def ready(self, session_id=None, known_nodes=None):
+        """
+        :param session_id: id of the session context this client already holds, if any
+        :param known_nodes: ids of the cluster nodes this client already holds
+        """
         return self._event(
             event_type=ClientEventFactory.READY,
             payload={
                 "pid": os.getpid(),
-                "pgroup_id": os.getpgrp()
+                "pgroup_id": os.getpgrp(),
+                "session_id": session_id,
+                "known_nodes": list(known_nodes or [])
             }
         )
 
@@ -95,11 +109,12 @@ class ClientEventFactory(object):
             event_type=ClientEventFactory.SETTING_UP
         )
 
-    def finished(self, result):
+    def finished(self, result, num_async_events=0):
         return self._event(
             event_type=ClientEventFactory.FINISHED,
             payload={
-                "result": result
+                "result": result,
+                "num_async_events": num_async_events
             }
         )
 
@@ -116,6 +131,17 @@ class ClientEventFactory(object):
 class EventResponseFactory(object):
     """Used by the test runner to create responses to events from client processes."""
 
+    def __init__(self):
+        # Ids of the remote accounts of cluster nodes sent to clients. Ids are never reused, even once an account is
+        # garbage collected, so a client never mistakes a new account for one it already holds.
+        self._node_ids = weakref.WeakKeyDictionary()
+        self._next_node_id = itertools.count()
+
+    def _node_id(self, account):
+        if account not in self._node_ids:
+            self._node_ids[account] = next(self._next_node_id)
+        return self._node_ids[account]
+
     def _event_response(self, client_event, payload=None):
         if payload is None:
             payload = {}
@@ -133,23 +159,49 @@ class EventResponseFactory(object):
         event_response.update(payload)
         return event_response
 
-    def running(self, client_event):
-        return self._event_response(client_event)
-
     def ready(self, client_event, session_context, test_context, cluster):
+        """The reply to a READY event, which assigns the test and its subcluster to the client.
+
+        The subcluster is sent as a list of (node id, slot attributes) pairs. The remote account of each node is only
+        sent to clients which don't hold it yet; see ``subcluster_from_ready``.
+        """
+        # Only send the session context to clients which don't have it yet
+        session_id = session_context.session_id
+        if client_event.get("session_id") == session_id:
+            session_context = None
+
+        slots = []
+        nodes = {}
+        known_nodes = set(client_event.get("known_nodes", []))
+        for slot in cluster.nodes:
+            node_id = self._node_id(slot.account)
+            slots.append((node_id, dict((k, v) for k, v in slot.__dict__.iteritems() if k != "account")))
+            if node_id not in known_nodes:
+                nodes[node_id] = slot.account
+
         payload = {
+            "session_id": session_id,
             "session_context": session_context,
             "test_metadata": test_context.test_metadata,
-            "cluster": cluster
+            "cluster": slots,
+            "nodes": nodes
         }
 
         return self._event_response(client_event, payload)
 
-    def setting_up(self, client_event):
-        return self._event_response(client_event)
-
     def finished(self, client_event):
         return self._event_response(client_event)
 
-    def log(self, client_event):
-        return self._event_response(client_event)
+
+def subcluster_from_ready(ready_reply, node_cache):
+    """Build the subcluster assigned to a client from the reply to its READY event.
+
+    :param ready_reply: the reply, as created by ``EventResponseFactory.ready``
+    :param node_cache: dict mapping node id to remote account, holding the accounts received by this client so far.
+        Accounts in the reply are added to it.
+    :return FiniteSubcluster with a copy of the remote account of each node, so that the state a test leaves on an
+        account doesn't leak into later tests using the same node
+    """
+    node_cache.update(ready_reply["nodes"])
+    return FiniteSubcluster([ClusterSlot(copy.copy(node_cache[node_id]), **slot_attributes)
+                             for node_id, slot_attributes in ready_reply["cluster"]])
@@ -0,0 +1,102 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+import os
+
+from ducktape.tests.status import PASS, FAIL
+
+
+class RunHistory(object):
+    """Local, append-only store of test run times.
+
+    Every finished test appends one JSON record to the history file. Since the test_id of a parametrized test
+    includes its injected args, statistics are tracked separately for each parametrization. Only the most recent
+    records for each test are used to compute statistics, so the history adapts as tests change.
+    """
+
+    def __init__(self, path, max_runs_per_test=20):
+        self.path = path
+        self.max_runs_per_test = max_runs_per_test
+        self._stats = None
+
+    def record(self, test_results):
+        """Append a record for each of the given test results to the history file."""
+        lines = []
+        for result in test_results:
+            if result.run_time_seconds < 0:
+                continue
+            lines.append(json.dumps({
+                "test_id": result.test_id,
+                "session_id": result.session_context.session_id,
+                "run_time_seconds": result.run_time_seconds,
+                "num_nodes": result.nodes_allocated,
+                "test_status": str(result.test_status)
+            }) + "\n")
+
+        if len(lines) > 0:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+        self._stats = None
+
+    def _load(self):
+        """Read the history file, and return a dict mapping test_id to its most recent records, oldest first."""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # e.g. a partially written record from an interrupted session
+                    continue
+                runs = records.setdefault(record["test_id"], [])
+                runs.append(record)
+                if len(runs) > self.max_runs_per_test:
+                    runs.pop(0)
+        return records
+
+    def stats(self):
+        """Get per-test statistics computed from the history.
+
+        :return dict mapping test_id to a dict with the mean and 90th percentile run time in seconds, the number of
+            nodes allocated in the most recent run, the pass rate of runs which passed or failed, and the number of
+            runs the statistics are based on.
+        """
+        if self._stats is None:
+            self._stats = {}
+            for test_id, runs in self._load().iteritems():
+                run_times = sorted(r["run_time_seconds"] for r in runs)
+                outcomes = [r["test_status"] for r in runs if r["test_status"] in (str(PASS), str(FAIL))]
+                self._stats[test_id] = {
+                    "mean": sum(run_times) / len(run_times),
+                    "p90": run_times[int(math.ceil(.9 * len(run_times))) - 1],
+                    "num_nodes": runs[-1]["num_nodes"],
+                    "pass_rate": outcomes.count(str(PASS)) / float(len(outcomes)) if outcomes else None,
+                    "num_runs": len(runs)
+                }
+        return self._stats
+
+    def run_times(self):
+        """Expected run time of each test in the history.
+
+        :return dict mapping test_id to its mean run time in seconds
+        """
+        return {test_id: s["mean"] for test_id, s in self.stats().iteritems()}
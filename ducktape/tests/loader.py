@@ -24,6 +24,7 @@ import requests
 
 from ducktape.tests.test import Test, TestContext
 from ducktape.mark import parametrized
+from ducktape.mark._mark import _inject
 from ducktape.mark.mark_expander import MarkedFunctionExpander
 
 
@@ -61,6 +62,7 @@ class TestLoader(object):
         self.subsets = subsets
 
         self.historical_report = historical_report
+        self._historical_run_times = None
 
         self.test_file_pattern = DEFAULT_TEST_FILE_PATTERN
         self.test_function_pattern = DEFAULT_TEST_FUNCTION_PATTERN
@@ -100,12 +102,11 @@ class TestLoader(object):
         all_test_context_list = sorted(all_test_context_list, key=attrgetter("test_id"))
 
         # Select the subset of tests.
-        if self.historical_report:
+        time_results = self.historical_run_times()
+        if len(time_results) > 0:
             # With timing info, try to pack the subsets reasonably evenly based on timing. To do so, get timing info
             # for each test (using avg as a fallback for missing data), sort in descending order, then start greedily
             # packing tests into bins based on the least full bin at the time.
-            raw_results = _requests_session.get(self.historical_report).json()["results"]
-            time_results = {r['test_id']: r['run_time_seconds'] for r in raw_results}
             avg_result_time = sum(time_results.itervalues()) / len(time_results)
             time_results = {tc.test_id: time_results.get(tc.test_id, avg_result_time) for tc in all_test_context_list}
             all_test_context_list = sorted(all_test_context_list, key=lambda x: time_results[x.test_id], reverse=True)
@@ -115,7 +116,7 @@ class TestLoader(object):
 
             for tc in all_test_context_list:
                 min_subset_idx = min(range(len(subsets_accumulated_time)), key=lambda i: subsets_accumulated_time[i])
-                subsets[min_subset_idx].append(tc.test_id)
+                subsets[min_subset_idx].append(tc)
                 subsets_accumulated_time[min_subset_idx] += time_results[tc.test_id]
 
             subset_test_context_list = subsets[self.subset]
@@ -129,6 +130,19 @@ class TestLoader(object):
         self.logger.debug("Selected this subset of tests: " + str(subset_test_context_list))
         return subset_test_context_list * self.repeat
 
+    def historical_run_times(self):
+        """Get the run time of each test from the historical report.
+
+        :return dict mapping test_id to the run time of that test in seconds. Empty if there is no historical report.
+        """
+        if not self.historical_report:
+            return {}
+
+        if self._historical_run_times is None:
+            raw_results = _requests_session.get(self.historical_report).json()["results"]
+            self._historical_run_times = {r['test_id']: r['run_time_seconds'] for r in raw_results}
+        return self._historical_run_times
+
     def discover(self, directory, module_name, cls_name, method_name):
         """Discover and unpack parametrized tests tied to the given module/class/method
 
@@ -161,6 +175,55 @@ class TestLoader(object):
 
         return test_context_list
 
+    def load_single(self, test_metadata):
+        """Load exactly one test context from the metadata of an already discovered test.
+
+        Unlike ``discover``, this does not expand other test methods in the module, or other parametrizations of the
+        same method: marks were already applied when the test was first discovered, and their effect is recorded in
+        the metadata (see ``TestContext.test_metadata``).
+
+        :param test_metadata: dict describing a single test
+        :return test_context object
+        """
+        module = None
+        if test_metadata.get("module_name"):
+            try:
+                module = importlib.import_module(test_metadata["module_name"])
+            except ImportError:
+                # Fall back on importing from the file path
+                pass
+
+        file_name = os.path.join(test_metadata["directory"], test_metadata["file_name"])
+        if module is None:
+            modules_and_files = self._import_modules([file_name])
+            if len(modules_and_files) == 0:
+                raise LoaderException("Unable to import %s" % file_name)
+            module = modules_and_files[0].module
+
+        cls = getattr(module, test_metadata["cls_name"], None)
+        if cls is None:
+            raise LoaderException("Didn't find class %s in %s" % (test_metadata["cls_name"], file_name))
+
+        function = getattr(cls, test_metadata["method_name"], None)
+        if function is None:
+            raise LoaderException("Didn't find method %s.%s in %s" %
+                                  (test_metadata["cls_name"], test_metadata["method_name"], file_name))
+
+        injected_args = test_metadata.get("injected_args")
+        if injected_args is not None:
+            function = _inject(**injected_args)(function)
+
+        return TestContext(
+            session_context=self.session_context,
+            cluster=self.cluster,
+            module=module.__name__,
+            cls=cls,
+            function=function,
+            file=file_name,
+            injected_args=injected_args,
+            ignore=test_metadata.get("ignore", False),
+            cluster_use_metadata=test_metadata.get("cluster_use_metadata", {}))
+
     def _parse_discovery_symbol(self, discovery_symbol):
         """Parse a single 'discovery symbol'
 
@@ -19,6 +19,7 @@ import shutil
 import pkg_resources
 
 from ducktape.utils.terminal_size import get_terminal_size
+from ducktape.utils.local_filesystem_utils import mkdir_p
 from ducktape.utils.util import ducktape_version
 from ducktape.tests.status import PASS, FAIL, IGNORE
 from ducktape.json_serializable import DucktapeJSONEncoder
@@ -147,7 +148,31 @@ class JSONReporter(object):
             f.write(json.dumps(self.results, cls=DucktapeJSONEncoder, sort_keys=True, indent=2, separators=(',', ': ')))
 
 
+class JSONLinesJournal(object):
+    """Appends the result of each test to report.jsonl in the session results directory as soon as it finishes.
+
+    Each line is the json of a single result, so the journal is cheap to extend, and stays readable if the session is
+    killed partway through.
+    """
+
+    def __init__(self, results_dir):
+        self.journal_file = os.path.abspath(os.path.join(results_dir, "report.jsonl"))
+
+    def append(self, result):
+        with open(self.journal_file, "a") as f:
+            f.write(json.dumps(result, cls=DucktapeJSONEncoder, sort_keys=True) + "\n")
+
+    def read(self):
+        """Return the results in the journal, as dicts."""
+        if not os.path.exists(self.journal_file):
+            return []
+        with open(self.journal_file) as f:
+            return [json.loads(line) for line in f if line.endswith("\n")]
+
+
 class HTMLSummaryReporter(SummaryReporter):
+    # Number of results in each page of the report, which is also the number of results loaded at a time
+    REPORT_PAGE_SIZE = 100
 
     def format_test_name(self, result):
         lines = ["Module: " + result.module_name,
@@ -187,27 +212,59 @@ class HTMLSummaryReporter(SummaryReporter):
         test_results_dir = os.path.abspath(result.results_dir)
         return test_results_dir[len(base_dir):]  # truncate the "absolute" portion
 
+    def write_data(self):
+        """Write the formatted results for report.html, in pages of REPORT_PAGE_SIZE results.
+
+        Each page is a script in the report_data directory, and report_data.js lists them, so that the report only
+        loads the pages it shows. The data is in scripts rather than json files so that the report can be opened
+        straight from disk.
+
+        Results are only ever appended, so a full page never changes once written, and only the last page, which
+        isn't full yet, is rewritten by later reports. Its file name marks it as partial.
+        """
+        results_dir = self.results.session_context.results_dir
+        data_dir = os.path.join(results_dir, "report_data")
+        if not os.path.exists(data_dir):
+            mkdir_p(data_dir)
+
+        results = list(self.results)
+        pages = []
+        for index, start in enumerate(range(0, len(results), self.REPORT_PAGE_SIZE)):
+            page_results = results[start:start + self.REPORT_PAGE_SIZE]
+            full = len(page_results) == self.REPORT_PAGE_SIZE
+            name = "page_%d.js" % index if full else "page_%d_partial.js" % index
+            pages.append("report_data/" + name)
+
+            path = os.path.join(data_dir, name)
+            if full and os.path.exists(path):
+                continue
+            with open(path, "w") as fp:
+                fp.write("loadReportPage(%d, [\n" % index)
+                fp.write(",\n".join(json.dumps(self.format_result(r), sort_keys=True) for r in page_results))
+                fp.write("\n]);\n")
+            if full:
+                partial = os.path.join(data_dir, "page_%d_partial.js" % index)
+                if os.path.exists(partial):
+                    os.remove(partial)
+
+        report_data = {"num_tests": len(results), "page_size": self.REPORT_PAGE_SIZE, "pages": pages}
+        with open(os.path.join(results_dir, "report_data.js"), "w") as fp:
+            fp.write("var REPORT_DATA = %s;\n" % json.dumps(report_data, sort_keys=True))
+
     def format_report(self):
         template = pkg_resources.resource_string(__name__, '../templates/report/report.html')
 
-        num_tests = len(self.results)
-        num_passes = 0
-        result_string = ""
-        for result in self.results:
-            if result.test_status == PASS:
-                num_passes += 1
-            result_string += json.dumps(self.format_result(result))
-            result_string += ","
+        # The data is written first, so that report.html never refers to data which doesn't exist yet
+        self.write_data()
 
         args = {
             'ducktape_version': ducktape_version(),
-            'num_tests': num_tests,
+            'num_tests': len(self.results),
             'num_passes': self.results.num_passed,
             'num_failures': self.results.num_failed,
             'num_ignored': self.results.num_ignored,
             'run_time': format_time(self.results.run_time_seconds),
             'session': self.results.session_context.session_id,
-            'tests': result_string,
             'test_status_names': ",".join(["\'%s\'" % str(status) for status in [PASS, FAIL, IGNORE]])
         }
 
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import json
+import math
 import os
 import time
 
@@ -51,6 +53,8 @@ class TestResult(object):
             self.services = {}
             self.nodes_used = {RemoteAccount.LINUX: 0}
 
+        self.log_collection = getattr(test_context, "log_collection_stats", [])
+
         self.test_id = test_context.test_id
         self.module_name = test_context.module_name
         self.cls_name = test_context.cls_name
@@ -125,12 +129,63 @@ class TestResult(object):
             "run_time_seconds": self.run_time_seconds,
             "nodes_allocated": self.nodes_allocated,
             "nodes_used": self.total_nodes_used(),
-            "services": self.services
+            "services": self.services,
+            "log_collection": self.log_collection
+        }
+
+
+class RunningStats(object):
+    """Count, mean, min, max and percentiles of a series of numbers, kept up to date as each number is added.
+
+    Adding a number is constant time. The numbers are only sorted when a percentile is read, and since reports read the
+    stats between small batches of new numbers, re-sorting the mostly sorted list is cheap.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        self._nums = []
+        self._is_sorted = True
+        self.total = 0
+
+    def add(self, num):
+        self._nums.append(num)
+        self._is_sorted = False
+        self.total += num
+
+    @property
+    def count(self):
+        return len(self._nums)
+
+    @property
+    def _sorted(self):
+        if not self._is_sorted:
+            self._nums.sort()
+            self._is_sorted = True
+        return self._nums
+
+    def percentile(self, p):
+        """Nearest-rank percentile, or None if there are no numbers yet."""
+        if self.count == 0:
+            return None
+        return self._sorted[max(int(math.ceil(p / 100.0 * self.count)) - 1, 0)]
+
+    def to_json(self):
+        stats = {
+            "mean": self.total / float(self.count) if self.count > 0 else None,
+            "min": self._sorted[0] if self.count > 0 else None,
+            "max": self._sorted[-1] if self.count > 0 else None
         }
+        for p in self.PERCENTILES:
+            stats["p%d" % p] = self.percentile(p)
+        return stats
 
 
 class TestResults(object):
-    """Class used to aggregate individual TestResult objects from many tests."""
+    """Class used to aggregate individual TestResult objects from many tests.
+
+    Counts and statistics are updated as results are appended, so they are cheap to get however many tests have run.
+    """
 
     def __init__(self, session_context, cluster):
         """
@@ -140,12 +195,26 @@ class TestResults(object):
         self.session_context = session_context
         self.cluster = cluster
 
+        self._status_counts = collections.defaultdict(int)
+        self.run_time_stats = RunningStats()
+        self.nodes_used_stats = RunningStats()
+        self.nodes_allocated_stats = RunningStats()
+        self._node_seconds = 0
+
         # For tracking total run time
         self.start_time = -1
         self.stop_time = -1
 
     def append(self, obj):
-        return self._results.append(obj)
+        self._results.append(obj)
+
+        # Statuses may be unpickled copies of PASS etc, so count them by name, which like TestStatus.__eq__ ignores case
+        self._status_counts[str(obj.test_status).lower()] += 1
+        nodes_used = obj.total_nodes_used()
+        self.run_time_stats.add(obj.run_time_seconds)
+        self.nodes_used_stats.add(nodes_used)
+        self.nodes_allocated_stats.add(obj.nodes_allocated)
+        self._node_seconds += nodes_used * obj.run_time_seconds
 
     def __len__(self):
         return len(self._results)
@@ -155,15 +224,15 @@ class TestResults(object):
 
     @property
     def num_passed(self):
-        return len([r for r in self._results if r.test_status == PASS])
+        return self._status_counts[str(PASS).lower()]
 
     @property
     def num_failed(self):
-        return len([r for r in self._results if r.test_status == FAIL])
+        return self._status_counts[str(FAIL).lower()]
 
     @property
     def num_ignored(self):
-        return len([r for r in self._results if r.test_status == IGNORE])
+        return self._status_counts[str(IGNORE).lower()]
 
     @property
     def run_time_seconds(self):
@@ -178,24 +247,7 @@ class TestResults(object):
         """Check cumulative success of all tests run so far
         :rtype: bool
         """
-        for result in self._results:
-            if result.test_status == FAIL:
-                return False
-        return True
-
-    def _stats(self, num_list):
-        if len(num_list) == 0:
-            return {
-                "mean": None,
-                "min": None,
-                "max": None
-            }
-
-        return {
-            "mean": sum(num_list) / float(len(num_list)),
-            "min": min(num_list),
-            "max": max(num_list)
-        }
+        return self.num_failed == 0
 
     def to_json(self):
         if self.run_time_seconds == 0:
@@ -204,9 +256,8 @@ class TestResults(object):
             cluster_utilization = 0
             parallelism = 0
         else:
-            cluster_utilization = (1.0 / len(self.cluster)) * (1.0 / self.run_time_seconds) * \
-                sum([r.total_nodes_used() * r.run_time_seconds for r in self])
-            parallelism = sum([r.run_time_seconds for r in self._results]) / self.run_time_seconds
+            cluster_utilization = (1.0 / len(self.cluster)) * (1.0 / self.run_time_seconds) * self._node_seconds
+            parallelism = self.run_time_stats.total / float(self.run_time_seconds)
 
         return {
             "ducktape_version": ducktape_version(),
@@ -214,9 +265,9 @@ class TestResults(object):
             "run_time_seconds": self.run_time_seconds,
             "start_time": self.start_time,
             "stop_time": self.stop_time,
-            "run_time_statistics": self._stats([r.run_time_seconds for r in self]),
-            "cluster_nodes_used": self._stats([r.total_nodes_used() for r in self]),
-            "cluster_nodes_allocated": self._stats([r.nodes_allocated for r in self]),
+            "run_time_statistics": self.run_time_stats.to_json(),
+            "cluster_nodes_used": self.nodes_used_stats.to_json(),
+            "cluster_nodes_allocated": self.nodes_allocated_stats.to_json(),
             "cluster_utilization": cluster_utilization,
             "cluster_num_nodes": len(self.cluster),
             "num_passed": self.num_passed,
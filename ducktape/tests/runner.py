@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import namedtuple
+from collections import deque, namedtuple
 import copy
 import logging
 import multiprocessing
@@ -26,22 +26,30 @@ import zmq
 from ducktape.tests.serde import SerDe
 from ducktape.tests.test import TestContext
 from ducktape.command_line.defaults import ConsoleDefaults
-from ducktape.tests.runner_client import run_client
+from ducktape.tests.runner_client import run_client, run_worker
 from ducktape.tests.result import TestResults
 from ducktape.utils.terminal_size import get_terminal_size
 from ducktape.tests.event import ClientEventFactory, EventResponseFactory
 from ducktape.cluster.finite_subcluster import FiniteSubcluster
 from ducktape.services.service import Service
 from ducktape.tests.scheduler import TestScheduler
+from ducktape.tests.work_queue import SharedWorkQueue
 from ducktape.tests.result import FAIL, TestResult
-from ducktape.tests.reporter import SimpleFileSummaryReporter, HTMLSummaryReporter, JSONReporter
+from ducktape.tests.reporter import SimpleFileSummaryReporter, HTMLSummaryReporter, JSONReporter, JSONLinesJournal
 
 
 class Receiver(object):
+    """Driver side of the channels between the driver and test runner clients.
+
+    Requests which expect a reply arrive on a REP socket bound to ``port``. Fire-and-forget events arrive on a PULL
+    socket bound to ``event_port``; these are drained in batches and never replied to.
+    """
+
     def __init__(self, min_port, max_port):
         assert min_port <= max_port, "Expected min_port <= max_port, but instead: min_port: %s, max_port %s" % \
                                      (min_port, max_port)
         self.port = None
+        self.event_port = None
         self.min_port = min_port
         self.max_port = max_port
 
@@ -49,17 +57,49 @@ class Receiver(object):
 
         self.zmq_context = zmq.Context()
         self.socket = self.zmq_context.socket(zmq.REP)
+        self.event_socket = self.zmq_context.socket(zmq.PULL)
+        self.poller = zmq.Poller()
+        self.poller.register(self.socket, zmq.POLLIN)
+        self.poller.register(self.event_socket, zmq.POLLIN)
+
+        # Received, but not yet consumed events
+        self._events = deque()
+
+    def _bind(self, socket):
+        # note: bind_to_random_port may retry the same port multiple times
+        return socket.bind_to_random_port(addr="tcp://*", min_port=self.min_port, max_port=self.max_port + 1,
+                                          max_tries=2 * (self.max_port + 1 - self.min_port))
 
     def start(self):
-        """Bind to a random port in the range [self.min_port, self.max_port], inclusive
+        """Bind to random ports in the range [self.min_port, self.max_port], inclusive
         """
-        # note: bind_to_random_port may retry the same port multiple times
-        self.port = self.socket.bind_to_random_port(addr="tcp://*", min_port=self.min_port, max_port=self.max_port + 1,
-                                                    max_tries=2 * (self.max_port + 1 - self.min_port))
+        self.port = self._bind(self.socket)
+        self.event_port = self._bind(self.event_socket)
+
+    def recv(self, timeout_ms=None):
+        """Block until an event is available from either channel, and return it.
+
+        Asynchronous events are drained in batches and returned ahead of any pending request. A client pushes
+        its asynchronous events before making a request, so this keeps each client's events roughly in order.
 
-    def recv(self):
-        message = self.socket.recv()
-        return self.serde.deserialize(message)
+        :param timeout_ms: if set, return None if no event arrives within this many milliseconds
+        """
+        while len(self._events) == 0:
+            sockets = dict(self.poller.poll(timeout_ms))
+            if timeout_ms is not None and len(sockets) == 0:
+                return None
+
+            if sockets.get(self.event_socket) == zmq.POLLIN:
+                try:
+                    while True:
+                        self._events.append(self.serde.deserialize(self.event_socket.recv(zmq.NOBLOCK)))
+                except zmq.Again:
+                    pass
+
+            if sockets.get(self.socket) == zmq.POLLIN:
+                self._events.append(self.serde.deserialize(self.socket.recv()))
+
+        return self._events.popleft()
 
     def send(self, event):
         self.socket.send(self.serde.serialize(event))
@@ -67,6 +107,50 @@ class Receiver(object):
     def close(self):
         self.socket.setsockopt(zmq.LINGER, 0)
         self.socket.close()
+        self.event_socket.setsockopt(zmq.LINGER, 0)
+        self.event_socket.close()
+
+
+class Worker(object):
+    """Handle on a long-lived client process which runs tests assigned by the driver, one at a time."""
+
+    def __init__(self, hostname, port, event_port, debug, max_tests=None):
+        self.max_tests = max_tests
+        self.num_tests = 0
+
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=run_worker,
+            args=[worker_connection, hostname, port, event_port, debug, max_tests])
+        self.process.start()
+        # The worker process has its own copy of its end of the pipe
+        worker_connection.close()
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    @property
+    def exhausted(self):
+        """True iff the worker has run as many tests as it is allowed to, in which case it exits on its own."""
+        return self.max_tests is not None and self.num_tests >= self.max_tests
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def assign(self, test_id, test_index, logger_name, log_dir):
+        assert not self.exhausted
+        self.num_tests += 1
+        self.connection.send((test_id, test_index, logger_name, log_dir))
+
+    def stop(self):
+        """Tell the worker there is no more work to do, if it is still waiting for any, and close the pipe to it."""
+        if not self.connection.closed and not self.exhausted and self.process.is_alive():
+            self.connection.send(None)
+        self.connection.close()
+
+    def join(self):
+        self.process.join()
 
 
 TestKey = namedtuple('TestKey', ['test_id', 'test_index'])
@@ -79,7 +163,11 @@ class TestRunner(object):
 
     def __init__(self, cluster, session_context, session_logger, tests,
                  min_port=ConsoleDefaults.TEST_DRIVER_MIN_PORT,
-                 max_port=ConsoleDefaults.TEST_DRIVER_MAX_PORT):
+                 max_port=ConsoleDefaults.TEST_DRIVER_MAX_PORT,
+                 run_time_estimates=None,
+                 scheduling_policy=None,
+                 report_interval_sec=ConsoleDefaults.PARTIAL_REPORT_INTERVAL_SEC,
+                 async_events_timeout_sec=ConsoleDefaults.ASYNC_EVENTS_TIMEOUT_SEC):
 
         # Set handler for SIGTERM (aka kill -15)
         # Note: it doesn't work to set a handler for SIGINT (Ctrl-C) in this parent process because the
@@ -96,12 +184,20 @@ class TestRunner(object):
 
         self.session_context = session_context
         self.max_parallel = session_context.max_parallel
+        self.reuse_workers = session_context.reuse_workers
+        self.max_tests_per_worker = session_context.max_tests_per_worker
         self.results = TestResults(self.session_context, self.cluster)
+        self.journal = JSONLinesJournal(self.session_context.results_dir)
+        self.report_interval_sec = report_interval_sec
+        self._last_report_time = None
 
         self.exit_first = self.session_context.exit_first
+        self.work_queue = None
+        if self.session_context.work_queue is not None:
+            self.work_queue = SharedWorkQueue(self.session_context.work_queue, self.session_context.session_id)
 
         self.main_process_pid = os.getpid()
-        self.scheduler = TestScheduler(tests, self.cluster)
+        self.scheduler = TestScheduler(tests, self.cluster, run_time_estimates, scheduling_policy)
 
         self.test_counter = 1
         self.total_tests = len(self.scheduler)
@@ -109,9 +205,18 @@ class TestRunner(object):
         self._test_context = pysistence.make_dict(**{t.test_id: t for t in tests})
         self._test_cluster = {}  # Track subcluster assigned to a particular TestKey
         self._client_procs = {}  # track client processes running tests
+        self._idle_workers = []  # long-lived client processes waiting for a test, if reuse_workers is set
         self.active_tests = {}
         self.finished_tests = {}
 
+        # Track asynchronous events received from each client, and how many events finished clients have sent.
+        # A finished test is only fully handled once all of its asynchronous events have been received, or once
+        # async_events_timeout_sec have passed since it finished, in case some of them were lost.
+        self.async_events_timeout_sec = async_events_timeout_sec
+        self._async_events_received = {}
+        self._async_events_expected = {}
+        self._async_events_deadline = {}
+
     def _propagate_sigterm(self, signum, frame):
         """Handler SIGTERM and SIGINT by propagating SIGTERM to all client processes.
 
@@ -150,7 +255,7 @@ class TestRunner(object):
 
     @property
     def _expect_client_requests(self):
-        return len(self.active_tests) > 0
+        return len(self.active_tests) > 0 or len(self._async_events_expected) > 0
 
     def run_all_tests(self):
         self.receiver.start()
@@ -163,6 +268,9 @@ class TestRunner(object):
                       len(self.scheduler.unschedulable))
 
             for tc in self.scheduler.unschedulable:
+                if not self._claim(tc):
+                    continue
+
                 msg = "Test %s expects more nodes than are available in the entire cluster: " % tc.test_id
                 msg += "expected_num_nodes: %s, " % str(tc.expected_node_spec)
                 msg += "cluster size: %s." % str(self.cluster.node_spec)
@@ -176,7 +284,7 @@ class TestRunner(object):
                     summary=msg,
                     start_time=time.time(),
                     stop_time=time.time())
-                self.results.append(result)
+                self._add_result(result)
                 result.report()
 
                 self.test_counter += 1
@@ -188,13 +296,17 @@ class TestRunner(object):
             try:
                 while self._ready_to_trigger_more_tests:
                     next_test_context = self.scheduler.next()
+                    if not self._claim(next_test_context):
+                        continue
                     self._preallocate_subcluster(next_test_context)
                     self._run_single_test(next_test_context)
 
                 if self._expect_client_requests:
                     try:
-                        event = self.receiver.recv()
-                        self._handle(event)
+                        event = self.receiver.recv(timeout_ms=self._async_events_wait_ms())
+                        if event is not None:
+                            self._handle(event)
+                        self._expire_async_events()
                     except Exception as e:
                         err_str = "Exception receiving message: %s: %s" % (str(type(e)), str(e))
                         err_str += "\n" + traceback.format_exc(limit=16)
@@ -208,12 +320,28 @@ class TestRunner(object):
                           "Received KeyboardInterrupt. Now waiting for currently running tests to finish...")
                 self.stop_testing = True
 
+        for worker in self._idle_workers:
+            worker.stop()
+        self._idle_workers = []
+
         for proc in self._client_procs.values():
             proc.join()
         self.receiver.close()
 
         return self.results
 
+    def _claim(self, test_context):
+        """Return True if this driver should run the given test.
+
+        When sharing a work queue with other drivers, a test that another driver has claimed is skipped.
+        """
+        if self.work_queue is None or self.work_queue.claim(test_context):
+            return True
+
+        self._log(logging.INFO, "Skipping test %s, which was claimed by another driver." % test_context.test_id)
+        self.total_tests -= 1
+        return False
+
     def _run_single_test(self, test_context):
         """Start a test runner client in a subprocess"""
         current_test_counter = self.test_counter
@@ -224,11 +352,35 @@ class TestRunner(object):
         test_key = TestKey(test_context.test_id, current_test_counter)
         self.active_tests[test_key] = True
 
+        if self.reuse_workers:
+            worker = None
+            while worker is None and len(self._idle_workers) > 0:
+                worker = self._idle_workers.pop()
+                if not worker.is_alive():
+                    # e.g. killed between tests; an assignment sent to it would never be run
+                    self._log(logging.WARNING, "Worker process %s died while idle, replacing it." % worker.pid)
+                    worker.stop()
+                    worker.join()
+                    worker = None
+
+            if worker is None:
+                worker = Worker(self.hostname, self.receiver.port, self.receiver.event_port,
+                                self.session_context.debug, self.max_tests_per_worker)
+
+            self._client_procs[test_key] = worker
+            worker.assign(
+                test_context.test_id,
+                current_test_counter,
+                TestContext.logger_name(test_context, current_test_counter),
+                TestContext.results_dir(test_context, current_test_counter))
+            return
+
         proc = multiprocessing.Process(
             target=run_client,
             args=[
                 self.hostname,
                 self.receiver.port,
+                self.receiver.event_port,
                 test_context.test_id,
                 current_test_counter,
                 TestContext.logger_name(test_context, current_test_counter),
@@ -261,6 +413,9 @@ class TestRunner(object):
     def _handle(self, event):
         self._log(logging.DEBUG, str(event))
 
+        if event["event_type"] in ClientEventFactory.ASYNC_TYPES:
+            self._count_async_event(event)
+
         if event["event_type"] == ClientEventFactory.READY:
             self._handle_ready(event)
         elif event["event_type"] in [ClientEventFactory.RUNNING,
@@ -282,21 +437,64 @@ class TestRunner(object):
             self.event_response.ready(event, self.session_context, test_context, subcluster))
 
     def _handle_log(self, event):
-        self.receiver.send(self.event_response.log(event))
         self._log(event["log_level"], event["message"])
 
+    def _count_async_event(self, event):
+        test_key = TestKey(event["test_id"], event["test_index"])
+        self._async_events_received[test_key] = self._async_events_received.get(test_key, 0) + 1
+        self._check_async_events_done(test_key)
+
+    def _check_async_events_done(self, test_key):
+        """Stop tracking asynchronous events for test_key once the test has finished and all of its events arrived."""
+        expected = self._async_events_expected.get(test_key)
+        if expected is not None and self._async_events_received.get(test_key, 0) >= expected:
+            self._stop_tracking_async_events(test_key)
+
+    def _stop_tracking_async_events(self, test_key):
+        del self._async_events_expected[test_key]
+        del self._async_events_deadline[test_key]
+        self._async_events_received.pop(test_key, None)
+
+    def _async_events_wait_ms(self):
+        """How long to wait for the next event before giving up on the missing asynchronous events of a finished
+        test, or None if no finished test is missing events.
+        """
+        if len(self._async_events_deadline) == 0:
+            return None
+        return max(0, int(1000 * (min(self._async_events_deadline.values()) - time.time())))
+
+    def _expire_async_events(self):
+        """Stop waiting for the asynchronous events of finished tests whose deadline has passed.
+
+        Events can be lost, e.g. if a client process is killed after it finished its test, and the run must not
+        wait for them forever.
+        """
+        now = time.time()
+        for test_key, deadline in self._async_events_deadline.items():
+            if deadline <= now:
+                self._log(logging.WARNING,
+                          "Gave up waiting for asynchronous events from test %s, index %d: received %d of %d" %
+                          (test_key.test_id, test_key.test_index, self._async_events_received.get(test_key, 0),
+                           self._async_events_expected[test_key]))
+                self._stop_tracking_async_events(test_key)
+
     def _handle_finished(self, event):
         test_key = TestKey(event["test_id"], event["test_index"])
         self.receiver.send(self.event_response.finished(event))
 
+        self._async_events_expected[test_key] = event["num_async_events"]
+        self._async_events_deadline[test_key] = time.time() + self.async_events_timeout_sec
+        self._check_async_events_done(test_key)
+
         result = event['result']
+        result.session_context = self.session_context
         if result.test_status == FAIL and self.exit_first:
             self.stop_testing = True
 
         # Transition this test from running to finished
         del self.active_tests[test_key]
         self.finished_tests[test_key] = event
-        self.results.append(result)
+        self._add_result(result)
 
         # Free nodes used by the test
         subcluster = self._test_cluster[test_key]
@@ -304,11 +502,38 @@ class TestRunner(object):
         self.cluster.free(subcluster.alloc(Service.setup_node_spec(node_spec=test_context.expected_node_spec)))
         del self._test_cluster[test_key]
 
-        # Join on the finished test process
-        self._client_procs[test_key].join()
+        # Join on the finished test process, or make the worker which ran the test available for another one
+        proc = self._client_procs[test_key]
+        if self.reuse_workers and not proc.exhausted:
+            self._idle_workers.append(proc)
+        else:
+            if self.reuse_workers:
+                proc.stop()
+            proc.join()
+
+        self._report_partial_results()
+
+        if self._should_print_separator:
+            terminal_width, y = get_terminal_size()
+            self._log(logging.INFO, "~" * int(2 * terminal_width / 3))
+
+    def _add_result(self, result):
+        self.results.append(result)
+        self.journal.append(result)
+
+    def _report_partial_results(self):
+        """Rewrite the summary reports with the results so far, at most once every report_interval_sec.
+
+        It is helpful to have partial test reports available if the ducktape process is killed with a SIGKILL partway
+        through. Every result is in the journal as soon as the test finishes, so rewriting the summaries, which grow
+        with every test, only needs to happen occasionally. The final reports are written by the caller once the run
+        is over.
+        """
+        now = time.time()
+        if self._last_report_time is not None and now - self._last_report_time < self.report_interval_sec:
+            return
+        self._last_report_time = now
 
-        # Report partial result summaries - it is helpful to have partial test reports available if the
-        # ducktape process is killed with a SIGKILL partway through
         test_results = copy.copy(self.results)  # shallow copy
         reporters = [
             SimpleFileSummaryReporter(test_results),
@@ -318,10 +543,6 @@ class TestRunner(object):
         for r in reporters:
             r.report()
 
-        if self._should_print_separator:
-            terminal_width, y = get_terminal_size()
-            self._log(logging.INFO, "~" * int(2 * terminal_width / 3))
-
     @property
     def _should_print_separator(self):
         """The separator is the twiddle that goes in between tests on stdout.
@@ -336,7 +557,7 @@ class TestRunner(object):
             (self._expect_client_requests or self._ready_to_trigger_more_tests)
 
     def _handle_lifecycle(self, event):
-        self.receiver.send(self.event_response._event_response(event))
+        """Lifecycle events are pushed by clients for information only, so there is nothing to reply."""
 
     def _log(self, log_level, msg, *args, **kwargs):
         """Log to the service log of the current test."""
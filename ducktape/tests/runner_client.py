@@ -19,8 +19,9 @@ import time
 import traceback
 import zmq
 
-from ducktape.tests.event import ClientEventFactory
+from ducktape.tests.event import ClientEventFactory, subcluster_from_ready
 from ducktape.tests.loader import TestLoader
+from ducktape.tests.loggermaker import close_logger
 from ducktape.tests.serde import SerDe
 from ducktape.tests.test import test_logger, TestContext
 
@@ -28,15 +29,51 @@ from ducktape.tests.result import TestResult, IGNORE, PASS, FAIL
 from ducktape.utils.local_filesystem_utils import mkdir_p
 
 
-def run_client(server_hostname, server_port, test_id, test_index, logger_name, log_dir, debug):
-    client = RunnerClient(server_hostname, server_port, test_id, test_index, logger_name, log_dir, debug)
-    client.run()
+def run_client(server_hostname, server_port, event_port, test_id, test_index, logger_name, log_dir, debug):
+    client = RunnerClient(server_hostname, server_port, event_port, test_id, test_index, logger_name, log_dir, debug)
+    try:
+        client.run()
+    finally:
+        # Flush any events still queued on the asynchronous channel before this process exits
+        client.sender.close()
+        # A worker process runs many tests, so the test log files must be closed here rather than when it exits
+        close_logger(client.logger)
+
+
+def run_worker(connection, server_hostname, server_port, event_port, debug, max_tests=None):
+    """Run tests assigned by the driver, one at a time, until told to stop.
+
+    Each assignment received on ``connection`` is a tuple (test_id, test_index, logger_name, log_dir), and None
+    means there is no more work. Test modules imported by one test stay imported for the next, since this
+    process is not replaced between tests.
+
+    :param connection: the worker's end of a multiprocessing Pipe shared with the driver
+    :param max_tests: if not None, exit after running this many tests
+    """
+    num_tests = 0
+    while max_tests is None or num_tests < max_tests:
+        assignment = connection.recv()
+        if assignment is None:
+            break
+
+        test_id, test_index, logger_name, log_dir = assignment
+        run_client(server_hostname, server_port, event_port, test_id, test_index, logger_name, log_dir, debug)
+        num_tests += 1
+
+    connection.close()
+
+
+# Session context received from the driver, kept for the lifetime of this process
+_session_context_cache = {}
+
+# Remote accounts of the cluster nodes received from the driver, by node id, kept for the lifetime of this process
+_node_cache = {}
 
 
 class RunnerClient(object):
     """Run a single test"""
 
-    def __init__(self, server_hostname, server_port, test_id, test_index, logger_name, log_dir, debug):
+    def __init__(self, server_hostname, server_port, event_port, test_id, test_index, logger_name, log_dir, debug):
         signal.signal(signal.SIGTERM, self._sigterm_handler)  # register a SIGTERM handler
 
         self.serde = SerDe()
@@ -47,12 +84,17 @@ class RunnerClient(object):
         self.test_index = test_index
         self.id = "test-runner-%d-%d" % (os.getpid(), id(self))
         self.message = ClientEventFactory(self.test_id, self.test_index, self.id)
-        self.sender = Sender(server_hostname, str(self.runner_port), self.message, self.logger)
-
-        ready_reply = self.sender.send(self.message.ready())
-        self.session_context = ready_reply["session_context"]
+        self.sender = Sender(server_hostname, str(self.runner_port), str(event_port), self.message, self.logger)
+
+        ready_reply = self.sender.send(self.message.ready(session_id=_session_context_cache.get("session_id"),
+                                                          known_nodes=_node_cache.keys()))
+        if ready_reply["session_context"] is not None:
+            # The driver only sends the session context to a process the first time it asks for a test
+            _session_context_cache["session_id"] = ready_reply["session_id"]
+            _session_context_cache["session_context"] = ready_reply["session_context"]
+        self.session_context = _session_context_cache["session_context"]
         self.test_metadata = ready_reply["test_metadata"]
-        self.cluster = ready_reply["cluster"]
+        self.cluster = subcluster_from_ready(ready_reply, _node_cache)
 
         # Wait to instantiate the test object until running the test
         self.test = None
@@ -61,6 +103,9 @@ class RunnerClient(object):
     def send(self, event):
         return self.sender.send(event)
 
+    def push(self, event):
+        self.sender.push(event)
+
     def _sigterm_handler(self, signum, frame):
         """Translate SIGTERM to SIGINT on this process
 
@@ -68,21 +113,18 @@ class RunnerClient(object):
         """
         os.kill(os.getpid(), signal.SIGINT)
 
-    def _collect_test_context(self, directory, file_name, cls_name, method_name, injected_args):
-        loader = TestLoader(self.session_context, self.logger, injected_args=injected_args, cluster=self.cluster)
-        loaded_context_list = loader.discover(directory, file_name, cls_name, method_name)
-
-        assert len(loaded_context_list) == 1
-        test_context = loaded_context_list[0]
+    def _collect_test_context(self, test_metadata):
+        loader = TestLoader(self.session_context, self.logger, cluster=self.cluster)
+        test_context = loader.load_single(test_metadata)
         test_context.cluster = self.cluster
         return test_context
 
     def run(self):
         self.log(logging.INFO, "Loading test %s" % str(self.test_metadata))
-        self.test_context = self._collect_test_context(**self.test_metadata)
+        self.test_context = self._collect_test_context(self.test_metadata)
         self.test_context.test_index = self.test_index
 
-        self.send(self.message.running())
+        self.push(self.message.running())
         if self.test_context.ignore:
             # Skip running this test, but keep track of the fact that we ignored it
             result = TestResult(self.test_context,
@@ -93,7 +135,7 @@ class RunnerClient(object):
                                 stop_time=time.time())
             result.report()
             # Tell the server we are finished
-            self.send(self.message.finished(result=result))
+            self.send(self.message.finished(result=result, num_async_events=self.sender.num_pushed))
             return
 
         # Results from this test, as well as logs will be dumped here
@@ -136,6 +178,7 @@ class RunnerClient(object):
 
         finally:
             self.teardown_test(teardown_services=not self.session_context.no_teardown, test_status=test_status)
+            self._do_safely(self.cluster.close, "Error releasing connections to cluster nodes:")
 
             stop_time = time.time()
 
@@ -155,7 +198,9 @@ class RunnerClient(object):
             result.report()
 
         # Tell the server we are finished
-        self._do_safely(lambda: self.send(self.message.finished(result=result)), "Problem sending FINISHED message:")
+        self._do_safely(
+            lambda: self.send(self.message.finished(result=result, num_async_events=self.sender.num_pushed)),
+            "Problem sending FINISHED message:")
 
         # Release test_context resources only after creating the result and finishing logging activity
         # The Sender object uses the same logger, so we postpone closing until after the finished message is sent
@@ -222,16 +267,25 @@ class RunnerClient(object):
             msg = "%s: %s: %s" % (self.__class__.__name__, self.test_context.test_name, str(msg))
             self.logger.log(log_level, msg, *args, **kwargs)
 
-        self.send(self.message.log(msg, level=log_level))
+        self.push(self.message.log(msg, level=log_level))
 
 
 class Sender(object):
+    """Client side of the channels between a test runner client and the driver.
+
+    Events which need a reply (READY, FINISHED) go through a synchronous REQ/REP round trip. Everything else
+    (log messages, lifecycle updates) is pushed over a separate PUSH/PULL channel without waiting on the driver.
+    """
     REQUEST_TIMEOUT_MS = 3000
     NUM_RETRIES = 5
 
-    def __init__(self, server_host, server_port, message_supplier, logger):
+    # How long to keep trying to deliver queued asynchronous events once the sender is closed
+    EVENT_LINGER_MS = 10000
+
+    def __init__(self, server_host, server_port, event_port, message_supplier, logger):
         self.serde = SerDe()
         self.server_endpoint = "tcp://%s:%s" % (str(server_host), str(server_port))
+        self.event_endpoint = "tcp://%s:%s" % (str(server_host), str(event_port))
         self.zmq_context = zmq.Context()
         self.socket = None
         self.poller = zmq.Poller()
@@ -239,7 +293,14 @@ class Sender(object):
         self.message_supplier = message_supplier
         self.logger = logger
 
+        # Number of events sent over the asynchronous channel. The driver uses this to know when it has
+        # received every event from a finished client.
+        self.num_pushed = 0
+
         self._init_socket()
+        self.event_socket = self.zmq_context.socket(zmq.PUSH)
+        self.event_socket.setsockopt(zmq.LINGER, Sender.EVENT_LINGER_MS)
+        self.event_socket.connect(self.event_endpoint)
 
     def _init_socket(self):
         self.socket = self.zmq_context.socket(zmq.REQ)
@@ -267,7 +328,7 @@ class Sender(object):
                         # send another request...
                         break
                 else:
-                    self.close()
+                    self._close_socket()
                     self._init_socket()
                     waiting_for_reply = False
                 # Ensure each message we attempt to send has a unique id
@@ -276,7 +337,19 @@ class Sender(object):
 
         raise RuntimeError("Unable to receive response from driver")
 
-    def close(self):
+    def push(self, event):
+        """Send an event to the driver without waiting for a reply."""
+        self.event_socket.send(self.serde.serialize(event))
+        self.num_pushed += 1
+
+    def _close_socket(self):
         self.socket.setsockopt(zmq.LINGER, 0)
         self.socket.close()
         self.poller.unregister(self.socket)
+
+    def close(self):
+        """Close both channels. This blocks until queued asynchronous events are delivered, or until they
+        have lingered for EVENT_LINGER_MS."""
+        self._close_socket()
+        self.event_socket.close()
+        self.zmq_context.term()
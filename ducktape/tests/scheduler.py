@@ -12,41 +12,98 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
+
+class SchedulingPolicy(object):
+    """Decides the order in which the scheduler offers tests.
+
+    The default policy offers the largest cluster user which fits in the available nodes, and among tests with the
+    same node requirements the longest running test. Subclass and pass an instance to TestScheduler to change this;
+    both methods return sort keys, and larger keys are offered first.
+    """
+
+    def bucket_priority(self, scheduler, test_context):
+        """Priority of the tests which require the same nodes as test_context, relative to tests with other node
+        requirements. test_context is the first test of its bucket.
+        """
+        return test_context.expected_num_nodes, scheduler.expected_run_time(test_context)
+
+    def test_priority(self, scheduler, test_context):
+        """Priority of test_context relative to other tests which require the same nodes."""
+        return scheduler.expected_run_time(test_context)
+
 
 class TestScheduler(object):
     """This class tracks tests which are scheduled to run, and provides an ordering based on the current cluster state.
 
     The ordering is "on-demand"; calling next returns the largest cluster user which fits in the currently
-    available cluster nodes.
+    available cluster nodes, so smaller tests are used to backfill nodes which a larger test can't use yet.
+    Among tests with the same cluster requirements, the longest running test is returned first, which keeps
+    long tests from being left until the end of the run.
+
+    Tests are bucketed by the nodes they require, so peek and next are proportional to the number of distinct
+    node requirements rather than to the number of tests.
     """
 
-    def __init__(self, test_contexts, cluster):
+    def __init__(self, test_contexts, cluster, run_time_estimates=None, policy=None):
+        """
+        :param test_contexts: the tests to schedule
+        :param cluster: the cluster the tests will run on
+        :param run_time_estimates: optional dict mapping test_id to the expected run time of the test in seconds,
+            e.g. taken from a previous report. Tests without an estimate are assumed to take the average time.
+        :param policy: optional SchedulingPolicy which orders the tests. Defaults to SchedulingPolicy().
+        """
         self.cluster = cluster
+        self.policy = policy or SchedulingPolicy()
+        self.run_time_estimates = run_time_estimates or {}
+        if len(self.run_time_estimates) > 0:
+            self._default_run_time = sum(self.run_time_estimates.itervalues()) / len(self.run_time_estimates)
+        else:
+            self._default_run_time = 0
 
         # Track tests which would never be offered up by the scheduling algorithm due to insufficient
         # cluster resources
         self.unschedulable = [tc for tc in test_contexts if cluster.test_capacity_comparison(tc) < 0]
 
         # these can be scheduled
-        self._test_context_list = [tc for tc in test_contexts if cluster.test_capacity_comparison(tc) >= 0]
-        self._sort_test_context_list()
+        self._buckets = {}
+        self._num_tests = 0
+        for tc in test_contexts:
+            if cluster.test_capacity_comparison(tc) >= 0:
+                self._buckets.setdefault(self._bucket_key(tc), []).append(tc)
+                self._num_tests += 1
+        self._sort_buckets()
 
     def __len__(self):
         """Number of tests currently in the scheduler"""
-        return len(self._test_context_list)
+        return self._num_tests
 
     def __iter__(self):
         return self
 
-    def _sort_test_context_list(self):
-        """Replace self.test_context_list with a sorted shallow copy
+    @staticmethod
+    def _bucket_key(test_context):
+        """Tests with equal node specs are interchangeable from the point of view of the cluster"""
+        return tuple(sorted(test_context.expected_node_spec.items()))
 
-        Sort from largest cluster users to smallest
+    def expected_run_time(self, test_context):
+        """Estimated run time of the given test in seconds."""
+        return self.run_time_estimates.get(test_context.test_id, self._default_run_time)
+
+    def _sort_buckets(self):
+        """Order the buckets, and the tests in each bucket, by the priorities given by the policy.
+
+        Buckets are kept as deques so the next test of a bucket can be removed in constant time.
         """
-        # sort from largest cluster users to smallest
-        self._test_context_list = sorted(self._test_context_list,
-                                         key=lambda tc: tc.expected_num_nodes,
-                                         reverse=True)
+        for key, tests in self._buckets.iteritems():
+            # sorted is stable, so tests with equal priority keep their original order
+            self._buckets[key] = collections.deque(
+                sorted(tests, key=lambda tc: self.policy.test_priority(self, tc), reverse=True))
+
+        self._bucket_order = sorted(self._buckets.keys(),
+                                    key=lambda k: self.policy.bucket_priority(self, self._buckets[k][0]),
+                                    reverse=True)
 
     def peek(self):
         """Locate and return the next object to be scheduled, without removing it internally.
@@ -54,9 +111,17 @@ class TestScheduler(object):
         :return test_context for the next test to be scheduled.
             If scheduler is empty, or no test can currently be scheduled, return None.
         """
-        for tc in self._test_context_list:
-            if self.cluster.test_capacity_comparison(tc) >= 0:
-                return tc
+        key = self._peek_bucket()
+        if key is None:
+            return None
+        return self._buckets[key][0]
+
+    def _peek_bucket(self):
+        """Return the key of the first non-empty bucket whose tests fit in the available cluster nodes, or None"""
+        for key in self._bucket_order:
+            tests = self._buckets[key]
+            if len(tests) > 0 and self.cluster.test_capacity_comparison(tests[0]) >= 0:
+                return key
 
         return None
 
@@ -70,10 +135,14 @@ class TestScheduler(object):
         if len(self) == 0:
             raise StopIteration("Scheduler is empty.")
 
-        tc = self.peek()
+        key = self._peek_bucket()
 
-        if tc is None:
+        if key is None:
             raise RuntimeError("No tests can currently be scheduled.")
 
-        self._test_context_list.remove(tc)
+        self._num_tests -= 1
+        tc = self._buckets[key].popleft()
+        if len(self._buckets[key]) == 0:
+            del self._buckets[key]
+            self._bucket_order.remove(key)
         return tc
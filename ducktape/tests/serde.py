@@ -12,18 +12,67 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pickle
+import cPickle as pickle
+
+from ducktape.tests.result import TestResult
+
+
+class _TestResultState(dict):
+    """The fields of a TestResult which are sent between processes."""
 
 
 class SerDe(object):
+    """Serialize messages exchanged between the test driver and test runner clients.
+
+    A message is a single version byte followed by a binary pickle. The version byte lets either end
+    reject messages it does not know how to read instead of failing in some obscure way.
+
+    Test results in a message are sent without their session context, since the driver already has it and
+    reattaches it on receipt.
+    """
+
+    VERSION = 2
+
+    # Fields of a TestResult which aren't sent
+    RESULT_FIELDS_NOT_SENT = ("session_context",)
+
     def serialize(self, obj):
         if hasattr(obj, 'serialize'):
-            obj.serialize()
+            return obj.serialize()
         else:
-            return pickle.dumps(obj)
+            return chr(SerDe.VERSION) + pickle.dumps(self._encode(obj), pickle.HIGHEST_PROTOCOL)
 
     def deserialize(self, bytes_obj, obj_cls=None):
         if obj_cls and hasattr(obj_cls, 'deserialize'):
             return obj_cls.deserialize(bytes_obj)
         else:
-            return pickle.loads(bytes_obj)
+            version = ord(bytes_obj[0])
+            if version != SerDe.VERSION:
+                raise ValueError("Unsupported message format version %d, expected %d" % (version, SerDe.VERSION))
+            return self._decode(pickle.loads(bytes_obj[1:]))
+
+    def _encode(self, obj):
+        """Replace test results in the given message, or the message itself, with the fields to send."""
+        if isinstance(obj, dict):
+            return dict((k, self._encode_value(v)) for k, v in obj.iteritems())
+        return self._encode_value(obj)
+
+    def _encode_value(self, value):
+        if isinstance(value, TestResult):
+            return _TestResultState(
+                (k, v) for k, v in value.__dict__.iteritems() if k not in SerDe.RESULT_FIELDS_NOT_SENT)
+        return value
+
+    def _decode(self, obj):
+        if isinstance(obj, dict) and not isinstance(obj, _TestResultState):
+            return dict((k, self._decode_value(v)) for k, v in obj.iteritems())
+        return self._decode_value(obj)
+
+    def _decode_value(self, value):
+        if isinstance(value, _TestResultState):
+            result = TestResult.__new__(TestResult)
+            result.__dict__.update(value)
+            for k in SerDe.RESULT_FIELDS_NOT_SENT:
+                setattr(result, k, None)
+            return result
+        return value
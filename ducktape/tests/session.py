@@ -36,6 +36,10 @@ class SessionContext(object):
         self.exit_first = kwargs.get("exit_first", False)
         self.no_teardown = kwargs.get("no_teardown", False)
         self.max_parallel = kwargs.get("max_parallel", 1)
+        self.reuse_workers = kwargs.get("reuse_workers", False)
+        self.max_tests_per_worker = kwargs.get("max_tests_per_worker", None)
+        self.work_queue = kwargs.get("work_queue", None)
+        self.concurrent_teardown = kwargs.get("concurrent_teardown", False)
         self.default_expected_num_nodes = kwargs.get("default_num_nodes", None)
         self._globals = kwargs.get("globals")
 
@@ -19,6 +19,7 @@ import re
 import shutil
 import sys
 import tempfile
+import time
 
 from ducktape.tests.loggermaker import LoggerMaker, close_logger
 from ducktape.utils.local_filesystem_utils import mkdir_p
@@ -28,12 +29,16 @@ from ducktape.template import TemplateRenderer
 from ducktape.mark.resource import CLUSTER_SIZE_KEYWORD
 from ducktape.cluster.remoteaccount import RemoteAccount
 from ducktape.tests.status import FAIL
+from ducktape.utils.util import parallel_map
 
 
 class Test(TemplateRenderer):
     """Base class for tests.
     """
 
+    # Maximum number of nodes from which service logs are collected concurrently
+    log_collection_concurrency = 8
+
     def __init__(self, test_context, *args, **kwargs):
         """
         :type test_context: ducktape.tests.test.TestContext
@@ -114,7 +119,10 @@ class Test(TemplateRenderer):
         Copy logs from service nodes to the results directory.
 
         If the test passed, only the default set will be collected. If the the test failed, all logs will be collected.
+        Logs are collected from up to log_collection_concurrency nodes at a time, and the number of bytes collected
+        and the time spent on each node are recorded in test_context.log_collection_stats.
         """
+        node_jobs = []
         for service in self.test_context.services:
             if not hasattr(service, 'logs') or len(service.logs) == 0:
                 self.test_context.logger.debug("Won't collect service logs from %s - no logs to collect." %
@@ -128,31 +136,50 @@ class Test(TemplateRenderer):
                 for log_name in log_dirs.keys():
                     if test_status == FAIL or self.should_collect_log(log_name, service):
                         node_logs.append(log_dirs[log_name]["path"])
+                node_jobs.append((service, node, node_logs))
+
+        stats = parallel_map(lambda job: self._copy_node_logs(*job), node_jobs,
+                             max_workers=self.log_collection_concurrency)
+        self.test_context.log_collection_stats.extend(s for s in stats if s is not None)
 
-                if self.test_context.session_context.compress:
-                    node_logs = self.compress_service_logs(node, service, node_logs)
-
-                if len(node_logs) > 0:
-                    # Create directory into which service logs will be copied
-                    dest = os.path.join(
-                        TestContext.results_dir(self.test_context, self.test_context.test_index),
-                        service.service_id, node.account.hostname)
-                    if not os.path.isdir(dest):
-                        mkdir_p(dest)
-
-                    # Try to copy the service logs
-                    try:
-                        for log in node_logs:
-                            node.account.copy_from(log, dest)
-                    except Exception as e:
-                        self.test_context.logger.warn(
-                            "Error copying log %(log_name)s from %(source)s to %(dest)s. \
-                            service %(service)s: %(message)s" %
-                            {'log_name': log_name,
-                             'source': log_dirs[log_name],
-                             'dest': dest,
-                             'service': service,
-                             'message': e.message})
+    def _copy_node_logs(self, service, node, node_logs):
+        """Compress (if configured) and copy the given logs from a single node.
+
+        :return dict with the number of bytes copied and the time spent, or None if there was nothing to copy
+        """
+        start = time.time()
+        if self.test_context.session_context.compress:
+            node_logs = self.compress_service_logs(node, service, node_logs)
+
+        if len(node_logs) == 0:
+            return None
+
+        # Create directory into which service logs will be copied
+        dest = os.path.join(
+            TestContext.results_dir(self.test_context, self.test_context.test_index),
+            service.service_id, node.account.hostname)
+        if not os.path.isdir(dest):
+            mkdir_p(dest)
+
+        # Try to copy the service logs
+        for log in node_logs:
+            try:
+                node.account.copy_from(log, dest)
+            except Exception as e:
+                self.test_context.logger.warn(
+                    "Error copying log %(log)s from %(source)s to %(dest)s. service %(service)s: %(message)s" %
+                    {'log': log,
+                     'source': node.account.hostname,
+                     'dest': dest,
+                     'service': service,
+                     'message': e.message})
+
+        return {
+            "service": service.service_id,
+            "node": node.account.hostname,
+            "bytes": _disk_usage(dest),
+            "seconds": time.time() - start
+        }
 
     def mark_for_collect(self, service, log_name=None):
         if log_name is None:
@@ -182,6 +209,17 @@ def _compress_cmd(log_path):
     return compres_cmd
 
 
+def _disk_usage(path):
+    """Total size in bytes of the files under the given local directory."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for f in filenames:
+            fpath = os.path.join(dirpath, f)
+            if not os.path.islink(fpath):
+                total += os.path.getsize(fpath)
+    return total
+
+
 def _escape_pathname(s):
     """Remove fishy characters, replace most with dots"""
     # Remove all whitespace completely
@@ -279,12 +317,16 @@ class TestContext(object):
         # to date, this only includes "num_nodes"
         self.cluster_use_metadata = copy.copy(kwargs.get("cluster_use_metadata", {}))
 
-        self.services = ServiceRegistry()
+        self.services = ServiceRegistry(
+            concurrent_teardown=getattr(self.session_context, "concurrent_teardown", False))
         self.test_index = None
 
         # dict for toggling service log collection on/off
         self.log_collect = {}
 
+        # per-node statistics about collected service logs
+        self.log_collection_stats = []
+
         self._logger = None
         self._local_scratch_dir = None
 
@@ -312,12 +354,16 @@ class TestContext(object):
 
     @property
     def test_metadata(self):
+        """Compact description of this test, from which ``TestLoader.load_single`` can rebuild it directly."""
         return {
             "directory": os.path.dirname(self.file),
             "file_name": os.path.basename(self.file),
+            "module_name": self.module,
             "cls_name": self.cls.__name__,
             "method_name": self.function.__name__,
-            "injected_args": self.injected_args
+            "injected_args": self.injected_args,
+            "ignore": self.ignore,
+            "cluster_use_metadata": self.cluster_use_metadata
         }
 
     @staticmethod
@@ -0,0 +1,69 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import hashlib
+import json
+import os
+import socket
+import time
+
+from ducktape.utils.local_filesystem_utils import mkdir_p
+
+
+class SharedWorkQueue(object):
+    """Lets several ducktape drivers share the tests of a run.
+
+    Every driver discovers the same tests, and pulls them from its own scheduler as usual. Before running a test,
+    the driver claims it by atomically creating a claim file in a directory shared by all drivers; a test which was
+    already claimed by another driver is skipped. Drivers therefore keep pulling tests until all tests are claimed,
+    instead of each running a fixed subset.
+    """
+
+    def __init__(self, directory, session_id):
+        self.directory = os.path.abspath(directory)
+        self.session_id = session_id
+        mkdir_p(self.directory)
+
+        # Number of times this driver has pulled each test_id; used to tell repeated runs of a test apart
+        self._occurrences = {}
+
+    def _claim_file(self, test_id, occurrence):
+        # test ids can be too long or contain characters which aren't valid in file names
+        return os.path.join(self.directory, "%s-%d.claim" % (hashlib.sha1(test_id).hexdigest(), occurrence))
+
+    def claim(self, test_context):
+        """Try to claim the given test for this driver.
+
+        :return True if this driver should run the test, False if another driver has already claimed it.
+        """
+        occurrence = self._occurrences.get(test_context.test_id, 0) + 1
+        self._occurrences[test_context.test_id] = occurrence
+
+        try:
+            fd = os.open(self._claim_file(test_context.test_id, occurrence), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "test_id": test_context.test_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "session_id": self.session_id,
+                "claim_time": time.time()
+            }, f)
+        return True
@@ -12,25 +12,170 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import httplib
+import socket
+import threading
+import urllib
 import urllib2
+import urlparse
+from StringIO import StringIO
+
+
+# Responses with these statuses are redirects, which are followed like urllib2 does
+REDIRECT_STATUSES = (301, 302, 303, 307)
+MAX_REDIRECTS = 10
+
+# Requests with these methods can safely be sent again if a reused connection fails
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+
+class HTTPConnectionPool(object):
+    """Thread-safe pool of idle keep-alive HTTP connections, keyed by (host, port).
+
+    At most max_idle_per_host idle connections are kept for each host and port; any others are closed on release.
+    """
+
+    def __init__(self, max_idle_per_host=8):
+        self.max_idle_per_host = max_idle_per_host
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(list)
+
+    def acquire(self, host, port):
+        """Return an idle connection to host:port, or None if there isn't one."""
+        with self._lock:
+            idle = self._idle[(host, port)]
+            return idle.pop() if len(idle) > 0 else None
+
+    def release(self, host, port, conn):
+        """Make conn available for reuse. Its last response must have been read completely."""
+        with self._lock:
+            idle = self._idle[(host, port)]
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, collections.defaultdict(list)
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+# Connections are shared by all HttpMixin instances in this process
+http_connection_pool = HTTPConnectionPool()
 
 
 class HttpMixin(object):
-    def http_request(self, url, method, data="", headers=None, timeout=None):
+    # Keep-alive connections are taken from, and returned to, this pool
+    http_connection_pool = http_connection_pool
+
+    def http_request(self, url, method, data="", headers=None, timeout=None, connect_timeout=None, read_timeout=None):
+        """Send an http request, reusing a keep-alive connection to the same host and port if possible.
+
+        Responses are read completely before this returns, so that the connection can be reused. Redirects are
+        followed like urllib2 does, and requests go through urllib2 when a proxy is configured.
+
+        :param timeout: timeout in seconds for both connecting and reading the response
+        :param connect_timeout: if set, overrides timeout for connecting
+        :param read_timeout: if set, overrides timeout for each read of the response
+        :return: response object with the same interface as the one returned by ``urllib2.urlopen``
+        :raise urllib2.HTTPError: if the response isn't successful, like ``urllib2.urlopen``
+        """
         if url[0:7].lower() != "http://":
             url = "http://%s" % url
 
         if hasattr(self, 'logger') and self.logger is not None:
             self.logger.debug("Sending http request. Url: %s, Data: %s, Headers: %s" % (url, str(data), str(headers)))
 
-        req = urllib2.Request(url, data, headers)
+        connect_timeout = timeout if connect_timeout is None else connect_timeout
+        read_timeout = timeout if read_timeout is None else read_timeout
+
+        if "http" in urllib.getproxies() and not urllib.proxy_bypass(urlparse.urlsplit(url).hostname):
+            # Only urllib2 knows how to go through proxies
+            return self._urllib2_request(url, method, data, headers, connect_timeout)
+
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response, body = self._pooled_request(url, method, data, headers, connect_timeout, read_timeout)
+            location = response.msg.getheader("location") or response.msg.getheader("uri")
+            if response.status not in REDIRECT_STATUSES or location is None:
+                break
+            if not (method in ("GET", "HEAD") or (method == "POST" and response.status != 307)):
+                break
+
+            # Like urllib2, redirect to a GET without a body
+            url = urlparse.urljoin(url, location)
+            method = "HEAD" if method == "HEAD" else "GET"
+            data = None
+            headers = dict((k, v) for k, v in headers.items() if k.lower() not in ("content-length", "content-type"))
+
+        result = urllib2.addinfourl(StringIO(body), response.msg, url, response.status)
+        if not 200 <= response.status < 300:
+            raise urllib2.HTTPError(url, response.status, response.reason, response.msg, result)
+        return result
+
+    def _pooled_request(self, url, method, data, headers, connect_timeout, read_timeout):
+        """Send a request over a pooled connection, and read the whole response.
+
+        :return: (httplib response, response body)
+        """
+        parsed = urlparse.urlsplit(url)
+        host, port = parsed.hostname, parsed.port or httplib.HTTP_PORT
+        path = urlparse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        headers = dict(headers)
+        if data is not None and "content-type" not in [h.lower() for h in headers]:
+            # Like urllib2
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        conn = self.http_connection_pool.acquire(host, port)
+        try:
+            conn, response, body = self._send(conn, host, port, method, path, data, headers, connect_timeout,
+                                              read_timeout)
+        except socket.timeout:
+            raise
+        except (httplib.BadStatusLine, socket.error):
+            if conn is None or method.upper() not in IDEMPOTENT_METHODS:
+                raise
+            # The server probably closed the idle connection, so try again with a new one. Other requests may already
+            # have been processed by the server, so they aren't sent twice.
+            conn, response, body = self._send(None, host, port, method, path, data, headers, connect_timeout,
+                                              read_timeout)
+
+        if response.will_close:
+            conn.close()
+        else:
+            self.http_connection_pool.release(host, port, conn)
+        return response, body
+
+    def _send(self, conn, host, port, method, path, data, headers, connect_timeout, read_timeout):
+        """Send a request over conn, or a new connection if conn is None, and read the whole response.
+
+        :return: (connection, httplib response, response body)
+        """
+        if conn is None:
+            conn = httplib.HTTPConnection(host, port, timeout=connect_timeout)
+            conn.connect()
+        conn.sock.settimeout(read_timeout)
+
+        try:
+            conn.request(method, path, data, headers)
+            response = conn.getresponse()
+            return conn, response, response.read()
+        except (httplib.HTTPException, socket.error):
+            conn.close()
+            raise
+
+    def _urllib2_request(self, url, method, data, headers, timeout):
+        req = urllib2.Request(url, data, headers or {})
         req.get_method = lambda: method
         # The timeout parameter in urllib2.urlopen has strange behavior, and
         # seems to raise errors when set to a number. Using an opener works however.
         opener = urllib2.build_opener()
         if timeout is None:
-            response = opener.open(req)
+            return opener.open(req)
         else:
-            response = opener.open(req, timeout=timeout)
-
-        return response
+            return opener.open(req, timeout=timeout)
@@ -13,27 +13,114 @@
 # limitations under the License.
 
 from ducktape import __version__ as __ducktape_version__
-from ducktape.errors import TimeoutError
+from ducktape.errors import TimeoutError, ParallelError
 
+import collections
 import importlib
+import Queue
+import random
+import threading
 import time
+import traceback
 
 
-def wait_until(condition, timeout_sec, backoff_sec=.1, err_msg=""):
+# Returned by wait_until: the number of times the condition was evaluated, and the time spent waiting
+WaitStats = collections.namedtuple("WaitStats", ["polls", "elapsed_sec"])
+
+
+def wait_until(condition, timeout_sec, backoff_sec=.1, err_msg="", backoff_multiplier=1, max_backoff_sec=None,
+               jitter=0, wakeup=None):
     """Block until condition evaluates as true or timeout expires, whichever comes first.
 
     return silently if condition becomes true within the timeout window, otherwise raise Exception with the given
     error message.
+
+    By default the condition is polled every backoff_sec. For expensive conditions, e.g. ones which run remote
+    commands, the interval can grow by backoff_multiplier after each poll, up to max_backoff_sec, and be randomized
+    by +/- jitter (a fraction of the interval) so that many waiters don't poll in lockstep. The condition is always
+    checked one last time when the timeout expires.
+
+    :param wakeup: optional threading.Event which something else sets when the condition may have become true, so that
+        it is checked right away rather than at the end of the current interval.
+    :return WaitStats for the successful wait. The TimeoutError raised otherwise has the WaitStats as its stats.
     """
     start = time.time()
     stop = start + timeout_sec
-    while time.time() < stop:
+    polls = 0
+    while True:
+        polls += 1
         if condition():
-            return
+            return WaitStats(polls, time.time() - start)
+
+        remaining = stop - time.time()
+        if remaining <= 0:
+            break
+        delay = min(backoff_sec * random.uniform(1 - jitter, 1 + jitter), remaining)
+        if wakeup is None:
+            time.sleep(delay)
         else:
-            time.sleep(backoff_sec)
+            wakeup.wait(delay)
+            wakeup.clear()
+        backoff_sec *= backoff_multiplier
+        if max_backoff_sec is not None:
+            backoff_sec = min(backoff_sec, max_backoff_sec)
+
+    error = TimeoutError(err_msg)
+    error.stats = WaitStats(polls, time.time() - start)
+    raise error
+
+
+def wait_until_all(conditions, timeout_sec, backoff_sec=.1, err_msg="", **backoff_kwargs):
+    """Block until every condition evaluates as true, polling the conditions concurrently.
+
+    Takes the same keyword arguments as wait_until, and applies them to each condition.
+
+    :return list with the WaitStats of each condition
+    :raise TimeoutError: if any of the conditions doesn't become true within timeout_sec
+    """
+    conditions = list(conditions)
+    try:
+        return parallel_map(lambda c: wait_until(c, timeout_sec, backoff_sec, err_msg, **backoff_kwargs), conditions)
+    except ParallelError as e:
+        if all(isinstance(exception, TimeoutError) for _, exception, _ in e.errors):
+            raise TimeoutError("%s %d of %d conditions timed out." % (err_msg, len(e.errors), len(conditions)))
+        raise
+
+
+def wait_until_any(conditions, timeout_sec, backoff_sec=.1, err_msg="", **backoff_kwargs):
+    """Block until one of the conditions evaluates as true, polling the conditions concurrently.
+
+    Takes the same keyword arguments as wait_until, except wakeup. Polling of the other conditions stops as soon as
+    one of them is true.
 
-    raise TimeoutError(err_msg)
+    :return index of the condition which became true first
+    :raise TimeoutError: if none of the conditions becomes true within timeout_sec
+    """
+    satisfied = []
+    done = threading.Event()
+
+    def wait(idx_and_condition):
+        idx, condition = idx_and_condition
+
+        def check():
+            if len(satisfied) > 0:
+                return True
+            if condition():
+                satisfied.append(idx)
+                done.set()
+                return True
+            return False
+
+        wait_until(check, timeout_sec, backoff_sec, err_msg, wakeup=done, **backoff_kwargs)
+
+    try:
+        parallel_map(wait, enumerate(conditions))
+    except ParallelError as e:
+        if not all(isinstance(exception, TimeoutError) for _, exception, _ in e.errors):
+            raise
+    if len(satisfied) == 0:
+        raise TimeoutError(err_msg)
+    return satisfied[0]
 
 
 def package_is_installed(package_name):
@@ -48,3 +135,50 @@ def package_is_installed(package_name):
 def ducktape_version():
     """Return string representation of current ducktape version."""
     return __ducktape_version__
+
+
+def parallel_map(func, items, max_workers=None):
+    """Call func on each of the items, using up to max_workers threads at a time, and return the results in order.
+
+    With max_workers <= 1 the calls are simply made one after the other in the calling thread, and the first exception
+    is raised right away. Otherwise every call runs to completion, and if any of them failed, a ParallelError
+    describing all of the failures is raised.
+
+    :param func: function taking a single item
+    :param items: iterable of items to call func on
+    :param max_workers: maximum number of concurrent calls, or None to use one thread per item
+    :return list with the return value of func for each item
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = len(items)
+    if max_workers <= 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = {}
+    work = Queue.Queue()
+    for idx_and_item in enumerate(items):
+        work.put(idx_and_item)
+
+    def worker():
+        while True:
+            try:
+                idx, item = work.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[idx] = func(item)
+            except Exception as e:
+                errors[idx] = (item, e, traceback.format_exc())
+
+    threads = [threading.Thread(target=worker) for _ in range(min(max_workers, len(items)))]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise ParallelError([errors[idx] for idx in sorted(errors)], len(items))
+    return results
@@ -13,12 +13,24 @@
 # limitations under the License.
 
 from ducktape.errors import TimeoutError
-from tests.ducktape_mock import MockAccount
+from tests.ducktape_mock import MockAccount, LocalShellAccount
 from tests.test_utils import find_available_port
 from ducktape.cluster.remoteaccount import RemoteAccount
-from ducktape.cluster.remoteaccount import RemoteAccountSSHConfig
+from ducktape.cluster.remoteaccount import RemoteAccountSSHConfig, RemoteCommandError, RemotePathInfo
+from ducktape.cluster.remoteaccount import RemoteAccountError
+from ducktape.cluster.remoteaccount import LogMonitor, RemoteCommandResult, _grep_pattern_to_re
 
+from mock import Mock
+import json
 import logging
+import os
+import pytest
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
 from threading import Thread
 import SimpleHTTPServer
 import SocketServer
@@ -106,3 +118,433 @@ class CheckRemoteAccountEquality(object):
         r2 = RemoteAccount(**kwargs)
 
         assert r1 == r2
+
+
+class CheckRemoteAccountSSHConfig(object):
+
+    def check_transport_options(self):
+        config = RemoteAccountSSHConfig.from_string("""
+Host worker1
+    Hostname 10.0.0.1
+    Compression yes
+    Ciphers aes128-ctr,aes256-ctr
+""")
+        assert config.compression is True
+        assert config.ciphers == ("aes128-ctr", "aes256-ctr")
+        assert RemoteAccountSSHConfig(**json.loads(json.dumps(config.to_json()))) == config
+        assert hash(RemoteAccountSSHConfig(**config.to_json())) == hash(config)
+
+        default = RemoteAccountSSHConfig(host="worker1", hostname="10.0.0.1", compression="no")
+        assert "compression" not in default.to_json() and "ciphers" not in default.to_json()
+        assert default != config
+
+    def check_connect(self, monkeypatch):
+        client = Mock()
+        monkeypatch.setattr("ducktape.cluster.remoteaccount.SSHClient", lambda: client)
+        ssh_config = RemoteAccountSSHConfig(host="worker1", hostname="10.0.0.1", compression=True,
+                                            ciphers=["aes128-ctr"])
+        RemoteAccount(ssh_config)._connect()
+
+        kwargs = client.connect.call_args[1]
+        assert kwargs["compress"] is True
+        disabled = kwargs["disabled_algorithms"]["ciphers"]
+        assert "aes128-ctr" not in disabled and "aes256-ctr" in disabled
+
+        with pytest.raises(ValueError):
+            RemoteAccount(RemoteAccountSSHConfig(host="worker1", ciphers="rot13"))._connect()
+
+    def check_connect_without_cipher_support(self, monkeypatch):
+        """If paramiko doesn't say which ciphers it supports, its defaults are used."""
+        client = Mock()
+        monkeypatch.setattr("ducktape.cluster.remoteaccount.SSHClient", lambda: client)
+        monkeypatch.delattr("ducktape.cluster.remoteaccount.Transport._preferred_ciphers")
+        RemoteAccount(RemoteAccountSSHConfig(host="worker1", hostname="10.0.0.1", ciphers="aes128-ctr"))._connect()
+        assert "disabled_algorithms" not in client.connect.call_args[1]
+
+
+class CheckCopyDirectories(object):
+    """Check directory copies with tar streams, and the SFTP fallback, using an account backed by the local shell."""
+
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+        self.tempdir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tempdir, "src")
+        os.makedirs(os.path.join(self.src, "sub", "subsub"))
+        for path, content in [("a.log", "a" * 1000), ("sub/b.log", "b"), ("sub/subsub/c.log", "")]:
+            with open(os.path.join(self.src, path), "w") as f:
+                f.write(content)
+        os.symlink(os.path.join(self.src, "a.log"), os.path.join(self.src, "sub", "link.log"))
+
+    def _check_copied(self, dest):
+        assert sorted(os.listdir(dest)) == ["a.log", "sub"]
+        assert sorted(os.listdir(os.path.join(dest, "sub"))) == ["b.log", "link.log", "subsub"]
+        with open(os.path.join(dest, "a.log")) as f:
+            assert f.read() == "a" * 1000
+        # symlinks are followed
+        assert not os.path.islink(os.path.join(dest, "sub", "link.log"))
+        assert os.path.getsize(os.path.join(dest, "sub", "link.log")) == 1000
+
+    def check_tar_available(self):
+        assert self.account._tar_available()
+        self.account.ssh = Mock(side_effect=AssertionError)
+        # the result is cached
+        assert self.account._tar_available()
+
+    def check_copy_from(self):
+        for compress in [False, True]:
+            dest = os.path.join(self.tempdir, "dest-%s" % compress)
+            self.account.copy_from(self.src, dest, compress=compress)
+            self._check_copied(dest)
+
+    def check_copy_to(self):
+        for compress in [False, True]:
+            dest = os.path.join(self.tempdir, "dest-%s" % compress)
+            self.account.copy_to(self.src, dest, compress=compress)
+            self._check_copied(dest)
+
+    def check_copy_into_existing_directory(self):
+        dest = os.path.join(self.tempdir, "dest")
+        os.mkdir(dest)
+        self.account.copy_from(self.src, dest)
+        self._check_copied(os.path.join(dest, "src"))
+
+    def check_copy_to_existing_file_fails(self):
+        dest = os.path.join(self.tempdir, "dest")
+        open(dest, "w").close()
+        with pytest.raises(RemoteCommandError):
+            self.account.copy_to(self.src, dest)
+
+    def check_sftp_fallback(self):
+        self.account._has_tar = False
+        dest = os.path.join(self.tempdir, "dest-from")
+        self.account.copy_from(self.src, dest)
+        self._check_copied(dest)
+
+        dest = os.path.join(self.tempdir, "dest-to")
+        self.account.copy_to(self.src, dest)
+        self._check_copied(dest)
+
+    def check_copy_between(self):
+        dest_account = LocalShellAccount()
+        dest_node = Mock(account=dest_account)
+
+        dest = os.path.join(self.tempdir, "dest")
+        self.account.copy_between(self.src, dest, dest_node)
+        self._check_copied(dest)
+
+        # copy a single file into an existing directory
+        self.account.copy_between(os.path.join(self.src, "a.log"), dest, dest_node)
+        with open(os.path.join(dest, "a.log")) as f:
+            assert f.read() == "a" * 1000
+
+    def check_copy_between_destination_fails(self):
+        dest = os.path.join(self.tempdir, "does", "not", "exist")
+        with pytest.raises(RemoteCommandError) as exc_info:
+            self.account.copy_between(os.path.join(self.src, "a.log"), dest, Mock(account=LocalShellAccount()))
+        assert exc_info.value.cmd.startswith("cat >")
+
+    def check_copy_between_staged(self):
+        """Without tar on either node, data is staged on the driver."""
+        dest_account = LocalShellAccount()
+        dest_account._has_tar = False
+        dest = os.path.join(self.tempdir, "dest")
+        self.account.copy_between(self.src, dest, Mock(account=dest_account))
+        self._check_copied(dest)
+
+    def check_stat_many(self):
+        os.symlink(os.path.join(self.tempdir, "missing"), os.path.join(self.src, "broken"))
+        paths = [os.path.join(self.src, p) for p in ["a.log", "sub", "sub/link.log", "broken", "missing", "it's"]]
+        info = self.account.stat_many(paths)
+
+        assert info[paths[0]] == RemotePathInfo(exists=True, isfile=True, isdir=False, islink=False)
+        assert info[paths[1]] == RemotePathInfo(exists=True, isfile=False, isdir=True, islink=False)
+        assert info[paths[2]] == RemotePathInfo(exists=True, isfile=True, isdir=False, islink=True)
+        assert info[paths[3]] == RemotePathInfo(exists=True, isfile=False, isdir=False, islink=True)
+        assert info[paths[4]] == RemotePathInfo(exists=False, isfile=False, isdir=False, islink=False)
+        assert not info[paths[5]].exists
+        assert self.account.stat_many([]) == {}
+
+    def _check_walk(self):
+        os.symlink(os.path.join(self.tempdir, "missing"), os.path.join(self.src, "broken"))
+        os.mkfifo(os.path.join(self.src, "fifo"))
+        walked = [(os.path.relpath(dirpath, self.src), sorted(dirnames), sorted(filenames))
+                  for dirpath, dirnames, filenames in self.account.walk(self.src)]
+        assert walked == [
+            (".", ["sub"], ["a.log"]),
+            ("sub", ["subsub"], ["b.log", "link.log"]),
+            ("sub/subsub", [], ["c.log"])
+        ]
+
+    def check_walk(self):
+        self._check_walk()
+
+    def check_walk_without_find(self):
+        """If the tree can't be listed with find, fall back to listing it over SFTP."""
+        open_exec_channel = self.account._open_exec_channel
+        self.account._open_exec_channel = lambda cmd: open_exec_channel("false")
+        self._check_walk()
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
+
+
+class CheckParallelFileCopy(object):
+    """Large files are copied in ranges over several SFTP clients at once."""
+
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+        self.account.parallel_copy_min_bytes = 1000
+        self.account.parallel_copy_streams = 3
+        self.tempdir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tempdir, "src.bin")
+        self.content = os.urandom(100003)
+        with open(self.src, "wb") as f:
+            f.write(self.content)
+
+    def _check_copied(self, dest):
+        with open(dest, "rb") as f:
+            assert f.read() == self.content
+
+    def check_copy_from(self, monkeypatch):
+        monkeypatch.setattr("ducktape.cluster.remoteaccount.PARALLEL_COPY_BATCH_BYTES", 4096)
+        dest = os.path.join(self.tempdir, "dest.bin")
+        self.account.copy_from(self.src, dest)
+        self._check_copied(dest)
+        assert not self.account.sftp_client.get.called
+
+    def check_copy_to(self):
+        dest = os.path.join(self.tempdir, "dest.bin")
+        self.account.copy_to(self.src, dest)
+        self._check_copied(dest)
+        assert not self.account.sftp_client.put.called
+
+    def check_small_file(self):
+        self.account.parallel_copy_min_bytes = len(self.content) + 1
+        dest = os.path.join(self.tempdir, "dest.bin")
+        self.account.copy_from(self.src, dest)
+        self._check_copied(dest)
+        assert self.account.sftp_client.get.called
+
+    def check_checksum_mismatch(self):
+        self.account.ssh_output = Mock(return_value="0" * 32 + "  " + self.src)
+        with pytest.raises(RemoteAccountError):
+            self.account.copy_from(self.src, os.path.join(self.tempdir, "dest.bin"))
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
+
+
+class CheckLogMonitor(object):
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+        self.tempdir = tempfile.mkdtemp()
+        self.log = os.path.join(self.tempdir, "service.log")
+        self._write("old line: started\n")
+
+    def _write(self, data, log=None):
+        with open(log or self.log, "a") as f:
+            f.write(data)
+
+    def _write_later(self, data, delay_sec=.3, log=None):
+        thread = threading.Timer(delay_sec, self._write, [data, log])
+        thread.start()
+        return thread
+
+    def check_wait_until(self):
+        with self.account.monitor_log(self.log) as monitor:
+            thread = self._write_later("starting\nnew line: started\n")
+            start = time.time()
+            monitor.wait_until("new.*started", timeout_sec=5)
+            assert time.time() - start >= .2
+            thread.join()
+
+            # lines before the initial offset are not considered
+            with pytest.raises(TimeoutError):
+                monitor.wait_until("old line", timeout_sec=.2, err_msg="not found")
+
+            # lines which were already read are still seen by later calls
+            monitor.wait_until(["^starting$", "new line"], timeout_sec=0)
+
+            tail_channel = monitor._chan
+        assert tail_channel.closed
+
+    def check_grep_patterns(self):
+        """Patterns are grep basic regular expressions, unless they are compiled Python regular expressions."""
+        with self.account.monitor_log(self.log) as monitor:
+            self._write("value (x) = a|b+\n")
+            monitor.wait_until("(x) = a|b+", timeout_sec=5)
+            monitor.wait_until(r"\(val\|foo\)ue ([[:alpha:]])", timeout_sec=0)
+            monitor.wait_until(re.compile(r"\(\w\) = a\|b\+"), timeout_sec=0)
+            with pytest.raises(TimeoutError):
+                monitor.wait_until("value (x\{2\})", timeout_sec=0)
+
+    def check_grep_pattern_to_re(self):
+        assert _grep_pattern_to_re(r"a(b)|c+?{1}") == r"a\(b\)\|c\+\?\{1\}"
+        assert _grep_pattern_to_re(r"\(a\|b\)\{2,3\}\+x\?") == r"(?:(a|b){2,3})+x?"
+        assert _grep_pattern_to_re(r"*a^$b$") == r"\*a\^\$b$"
+        assert _grep_pattern_to_re(r"^*[]\[:space:]]\<") == r"^\*[\]\\ \t\n\r\f\v]\b"
+
+    def check_lines_read_once(self):
+        """Lines which were already read are only read again for patterns which weren't searched for before."""
+        with self.account.monitor_log(self.log) as monitor:
+            self._write("starting\nnew line: started\n")
+            monitor.wait_until("started", timeout_sec=5)
+            self.account.ssh_stream = Mock(wraps=self.account.ssh_stream)
+
+            monitor.wait_until("started", timeout_sec=0)
+            monitor.wait_until("starting", timeout_sec=0)
+            assert self.account.ssh_stream.call_count == 1
+
+            for _ in range(2):
+                with pytest.raises(TimeoutError):
+                    monitor.wait_until("never", timeout_sec=.1)
+            assert self.account.ssh_stream.call_count == 2
+
+    def check_partial_line(self):
+        with self.account.monitor_log(self.log) as monitor:
+            self._write("no newline yet")
+            monitor.wait_until("newline yet", timeout_sec=5)
+            self._write(" and now there is\n")
+            monitor.wait_until("yet and now", timeout_sec=5)
+
+    def check_log_created_later(self):
+        log = os.path.join(self.tempdir, "later.log")
+        with self.account.monitor_log(log) as monitor:
+            thread = self._write_later("ready\n", log=log)
+            monitor.wait_until("ready", timeout_sec=5)
+            thread.join()
+
+    def check_timeout(self):
+        with self.account.monitor_log(self.log) as monitor:
+            start = time.time()
+            with pytest.raises(TimeoutError) as exc_info:
+                monitor.wait_until("never", timeout_sec=.5, err_msg="never found")
+            assert time.time() - start >= .5
+            assert exc_info.value.message == "never found"
+
+    def check_wait_until_all(self):
+        logs = [os.path.join(self.tempdir, "node%d.log" % i) for i in range(3)]
+        monitors = [LogMonitor(self.account, log, 0) for log in logs]
+        try:
+            threads = [self._write_later("ready\n", log=log) for log in logs]
+            LogMonitor.wait_until_all(monitors, "ready", timeout_sec=5)
+            for thread in threads:
+                thread.join()
+
+            self._write("done\n", log=logs[0])
+            with pytest.raises(TimeoutError) as exc_info:
+                LogMonitor.wait_until_all(monitors, "done", timeout_sec=2, err_msg="not done.")
+            assert logs[1] in exc_info.value.message and logs[0] not in exc_info.value.message
+        finally:
+            for monitor in monitors:
+                monitor.close()
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
+
+
+class CheckSshResult(object):
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+
+    def check_ssh_result(self):
+        result = self.account.ssh_result("echo hello; echo oops >&2; exit 3", combine_stderr=False)
+        assert result == RemoteCommandResult(exit_status=3, output="hello\n", stderr="oops\n", error=None)
+
+    def check_timeout(self):
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            self.account.ssh_result("echo started; sleep 10", timeout_sec=.5)
+        assert time.time() - start < 5
+
+
+class CheckKillProcess(object):
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+        self.procs = []
+        # Unique to this run, so that no other processes on this machine are killed
+        self.marker = "kill-process-marker-%d" % os.getpid()
+
+    def _start(self, marker, ignore_sigterm=False):
+        code = "import signal, time\n"
+        if ignore_sigterm:
+            code += "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        code += "time.sleep(100)\n"
+        proc = subprocess.Popen([sys.executable, "-c", code, marker])
+        self.procs.append(proc)
+        # Reap the process as soon as it exits, so that it doesn't look alive
+        Thread(target=proc.wait).start()
+        return proc
+
+    def _wait_for_exit(self, proc, timeout_sec=5):
+        stop = time.time() + timeout_sec
+        while proc.returncode is None and time.time() < stop:
+            time.sleep(.05)
+        return proc.returncode
+
+    def check_kill_process(self):
+        procs = [self._start(self.marker) for _ in range(3)]
+        other = self._start("other-process-marker-%d" % os.getpid())
+        time.sleep(.2)
+        self.account.kill_process(self.marker)
+        assert all(self._wait_for_exit(proc) == -signal.SIGTERM for proc in procs)
+        assert other.poll() is None
+
+    def check_no_matching_process(self):
+        self.account.kill_process("no-such-process-marker", grace_period_sec=1)
+
+    def check_escalation(self):
+        proc = self._start(self.marker, ignore_sigterm=True)
+        time.sleep(.2)
+        start = time.time()
+        self.account.kill_process(self.marker, grace_period_sec=.5)
+        assert time.time() - start >= .5
+        # the process was confirmed to be gone before kill_process returned
+        assert proc.poll() == -signal.SIGKILL or self._wait_for_exit(proc, .5) == -signal.SIGKILL
+
+    def check_still_running(self):
+        """Processes which can't be made to exit within the grace period are an error."""
+        # Without a reaper thread, the killed process remains as a zombie which can still be signaled
+        zombie = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(100)", self.marker])
+        self.procs.append(zombie)
+        time.sleep(.2)
+        with pytest.raises(RemoteCommandError) as exc_info:
+            self.account.kill_process(self.marker, grace_period_sec=.2)
+        assert str(zombie.pid) in str(exc_info.value)
+        self.account.kill_process(self.marker, grace_period_sec=.2, allow_fail=True)
+
+    def teardown_method(self, _):
+        for proc in self.procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+class CheckSshStream(object):
+    def setup_method(self, _):
+        self.account = LocalShellAccount()
+        self.tempdir = tempfile.mkdtemp()
+
+    def check_ssh_stream(self):
+        chunks = list(self.account.ssh_stream("head -c 1000000 /dev/zero", chunk_bytes=4096))
+        assert sum(len(chunk) for chunk in chunks) == 1000000
+        assert max(len(chunk) for chunk in chunks) <= 4096
+
+        with pytest.raises(RemoteCommandError):
+            list(self.account.ssh_stream("echo partial; exit 2"))
+        assert list(self.account.ssh_stream("echo partial; exit 2", allow_fail=True)) == ["partial\n"]
+
+    def check_ssh_to_file(self):
+        path = os.path.join(self.tempdir, "output")
+        num_bytes = self.account.ssh_to_file("seq 100000; echo error >&2", path)
+        with open(path) as f:
+            assert f.read() == "".join("%d\n" % i for i in range(1, 100001))
+        assert num_bytes == os.path.getsize(path)
+
+    def check_max_output_bytes(self):
+        assert self.account.ssh_output("echo hello", max_output_bytes=6) == "hello\n"
+        with pytest.raises(RemoteAccountError):
+            self.account.ssh_output("head -c 1000000 /dev/zero", max_output_bytes=1000)
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
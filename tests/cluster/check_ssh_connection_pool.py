@@ -0,0 +1,138 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.cluster.cluster import ClusterSlot
+from ducktape.cluster.finite_subcluster import FiniteSubcluster
+from ducktape.cluster.remoteaccount import RemoteAccount, RemoteAccountSSHConfig
+from ducktape.cluster.ssh_connection_pool import SSHConnectionPool, SSHConnections
+from tests.ducktape_mock import MockAccount
+
+from mock import Mock, MagicMock, patch
+import pickle
+import time
+
+
+def fake_client():
+    client = MagicMock()
+    client.get_transport.return_value.is_active.return_value = True
+    client.get_transport.return_value.open_session.side_effect = lambda timeout=None: Mock(closed=False)
+    return client
+
+
+class FakeConnectAccount(MockAccount):
+    def _connect(self):
+        return fake_client()
+
+
+class CheckSSHConnectionPool(object):
+    def setup_method(self, _):
+        self.pool = SSHConnectionPool(ttl_sec=60, max_idle_per_host=2)
+        self.config = RemoteAccountSSHConfig(host="worker1", hostname="10.0.0.1")
+        self.connect = Mock(side_effect=fake_client)
+
+    def check_reuse(self):
+        client = self.pool.acquire(self.config, self.connect)
+        self.pool.release(self.config, client)
+        assert self.pool.acquire(self.config, self.connect) is client
+        assert self.connect.call_count == 1
+
+        # a connection to another node is not reused
+        other = RemoteAccountSSHConfig(host="worker2", hostname="10.0.0.2")
+        assert self.pool.acquire(other, self.connect) is not client
+
+    def check_unhealthy_connection_closed(self):
+        client = self.pool.acquire(self.config, self.connect)
+        self.pool.release(self.config, client)
+        client.get_transport.return_value.send_ignore.side_effect = EOFError()
+
+        assert self.pool.acquire(self.config, self.connect) is not client
+        assert client.close.call_count == 1
+
+    def check_expired_connection_closed(self):
+        client = self.pool.acquire(self.config, self.connect)
+        self.pool.release(self.config, client)
+        self.pool.ttl_sec = 0
+        time.sleep(.01)
+
+        assert self.pool.acquire(self.config, self.connect) is not client
+        assert client.close.call_count == 1
+
+    def check_max_idle(self):
+        clients = [self.pool.acquire(self.config, self.connect) for _ in range(3)]
+        for client in clients:
+            self.pool.release(self.config, client)
+        assert [c.close.call_count for c in clients] == [0, 0, 1]
+
+        self.pool.clear()
+        assert [c.close.call_count for c in clients] == [1, 1, 1]
+
+    def check_forked_process(self):
+        """Connections opened by another process are neither reused nor closed."""
+        client = self.pool.acquire(self.config, self.connect)
+        self.pool.release(self.config, client)
+        self.pool._pid = -1
+
+        assert self.pool.acquire(self.config, self.connect) is not client
+        assert client.close.call_count == 0
+
+
+class CheckSSHConnections(object):
+    def setup_method(self, _):
+        self.pool = SSHConnectionPool()
+        self.config = RemoteAccountSSHConfig(host="worker1", hostname="10.0.0.1")
+        self.connections = SSHConnections(self.pool, self.config, fake_client, max_channels=2)
+
+    def check_channels_spread_over_connections(self):
+        channels = [self.connections.open_session() for _ in range(3)]
+        assert len(self.connections._clients) == 2
+
+        # a closed channel frees up room on the first connection
+        channels[0].closed = True
+        self.connections.open_session()
+        assert len(self.connections._clients) == 2
+
+    def check_release(self):
+        """Released connections go back to the pool, and their channels are closed."""
+        chan = self.connections.open_session()
+        primary = self.connections.primary
+        self.connections.release()
+
+        assert chan.close.call_count == 1
+        assert primary.close.call_count == 0
+        assert self.pool.acquire(self.config, fake_client) is primary
+
+    def check_account_close_returns_connection(self):
+        account = MockAccount()
+        account.ssh_connection_pool = self.pool
+        account._connect = Mock(side_effect=fake_client)
+
+        client = account.ssh_client
+        account.close()
+        assert account.ssh_client is client
+        assert account._connect.call_count == 1
+
+    def check_next_test_reuses_connection(self):
+        """A test client releases the connections of its subcluster when the test finishes, so the next test run by
+        the same process on the same node reuses the ssh transport.
+        """
+        cluster = FiniteSubcluster([ClusterSlot(FakeConnectAccount())])
+
+        with patch.object(RemoteAccount, "ssh_connection_pool", self.pool):
+            # each test gets its own copy of the subcluster from the driver
+            first_test_cluster = pickle.loads(pickle.dumps(cluster))
+            transport = first_test_cluster.nodes[0].account.ssh_client.get_transport()
+            first_test_cluster.close()
+
+            second_test_cluster = pickle.loads(pickle.dumps(cluster))
+            assert second_test_cluster.nodes[0].account.ssh_client.get_transport() is transport
@@ -18,10 +18,15 @@ from ducktape.tests.test import TestContext
 from ducktape.cluster.linux_remoteaccount import LinuxRemoteAccount
 from ducktape.cluster.remoteaccount import RemoteAccountSSHConfig
 from ducktape.cluster.remoteaccount import RemoteAccount
+from ducktape.cluster.ssh_connection_pool import SSHConnectionPool
 from mock import MagicMock
 
 
 import os
+import select
+import shutil
+import socket
+import subprocess
 import tempfile
 
 
@@ -30,6 +35,9 @@ def mock_cluster():
 
 
 class FakeClusterSlot(object):
+    def __init__(self):
+        self.account = MockAccount()
+
     @property
     def operating_system(self):
         return RemoteAccount.LINUX
@@ -98,3 +106,138 @@ class MockAccount(LinuxRemoteAccount):
             port=22)
 
         super(MockAccount, self).__init__(ssh_config, externally_routable_ip="localhost", logger=None)
+
+
+class LocalShellFile(object):
+    """Wraps a pipe to a local process like a paramiko ChannelFile, which knows its channel."""
+
+    def __init__(self, f, channel):
+        self._f = f
+        self.channel = channel
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __iter__(self):
+        return iter(self._f)
+
+
+class LocalShellChannel(object):
+    """Stands in for a paramiko channel by running the command in a local shell."""
+
+    def __init__(self):
+        self.proc = None
+        self._closed = False
+        self.timeout = None
+
+    @property
+    def closed(self):
+        """Like paramiko channels, channels are closed once the command has exited"""
+        return self._closed or (self.proc is not None and self.proc.poll() is not None)
+
+    def exec_command(self, cmd):
+        self.proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE)
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+    def recv(self, nbytes):
+        ready, _, _ = select.select([self.proc.stdout], [], [], self.timeout)
+        if not ready:
+            raise socket.timeout()
+        return os.read(self.proc.stdout.fileno(), nbytes)
+
+    def set_combine_stderr(self, combine):
+        pass
+
+    def makefile(self, mode, bufsize=-1):
+        return LocalShellFile(self.proc.stdin if "w" in mode else self.proc.stdout, self)
+
+    def makefile_stderr(self, mode, bufsize=-1):
+        return LocalShellFile(self.proc.stderr, self)
+
+    def shutdown_write(self):
+        self.proc.stdin.close()
+
+    def exit_status_ready(self):
+        return self.proc.poll() is not None
+
+    def recv_exit_status(self):
+        return self.proc.wait()
+
+    def close(self):
+        self._closed = True
+        if self.proc is not None and self.proc.poll() is None:
+            # like an ssh server, close the command's stdin
+            self.proc.stdin.close()
+
+
+class LocalSFTPFile(object):
+    """Local file with the parts of the paramiko SFTPFile interface used by RemoteAccount."""
+
+    def __init__(self, path, mode="r"):
+        self._f = open(path, mode)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._f.close()
+
+    def set_pipelined(self, pipelined=True):
+        pass
+
+    def readv(self, chunks):
+        for offset, length in chunks:
+            self._f.seek(offset)
+            yield self._f.read(length)
+
+
+class LocalSFTPClient(object):
+    """Stands in for a paramiko SFTPClient by working on the local filesystem."""
+
+    def open(self, path, mode="r"):
+        return LocalSFTPFile(path, mode)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def close(self):
+        pass
+
+
+class LocalShellAccount(MockAccount):
+    """Remote account whose ssh commands run in a local shell, and whose sftp client works on the local filesystem.
+
+    This allows checking the remote side of RemoteAccount methods without an ssh server.
+    """
+
+    def __init__(self):
+        super(LocalShellAccount, self).__init__()
+        # Don't share the fake connections with other accounts for localhost
+        self.ssh_connection_pool = SSHConnectionPool()
+
+        self._sftp_client = MagicMock()
+        self._sftp_client.stat.side_effect = os.stat
+        self._sftp_client.lstat.side_effect = os.lstat
+        self._sftp_client.listdir.side_effect = os.listdir
+        self._sftp_client.get.side_effect = shutil.copyfile
+        self._sftp_client.put.side_effect = shutil.copyfile
+        self._sftp_client.mkdir.side_effect = os.mkdir
+        self._sftp_client.open.side_effect = LocalSFTPFile
+
+    def _connect(self):
+        client = MagicMock()
+        client.get_transport.return_value.open_session.side_effect = lambda *args, **kwargs: LocalShellChannel()
+        return client
+
+    @property
+    def sftp_client(self):
+        return self._sftp_client
+
+    def _open_sftp(self):
+        return LocalSFTPClient()
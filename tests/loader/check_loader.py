@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from ducktape.tests.loader import TestLoader, LoaderException, _requests_session
+from ducktape.tests.test import TestContext
 
 import tests.ducktape_mock
 
@@ -140,6 +141,40 @@ class CheckTestLoader(object):
         for t in tests:
             assert t.injected_args == parameters
 
+    def check_load_single(self):
+        """Loading a single test from its metadata should give back the same test as discovery."""
+        loader = TestLoader(self.SESSION_CONTEXT, logger=Mock())
+        discovered = loader.load([discover_dir()])
+        assert len(discovered) > 0
+
+        for ctx in discovered:
+            loaded = loader.load_single(ctx.test_metadata)
+            assert loaded.test_id == ctx.test_id
+            assert loaded.file == ctx.file
+            assert loaded.injected_args == ctx.injected_args
+            assert loaded.ignore == ctx.ignore
+            assert loaded.cluster_use_metadata == ctx.cluster_use_metadata
+
+    def check_load_single_without_module_name(self):
+        """If the module name is unknown, load_single should import the test module from its file."""
+        loader = TestLoader(self.SESSION_CONTEXT, logger=Mock())
+        ctx = loader.load([os.path.join(discover_dir(), "test_decorated.py::TestMatrix")])[0]
+
+        test_metadata = ctx.test_metadata
+        test_metadata["module_name"] = None
+        loaded = loader.load_single(test_metadata)
+        assert loaded.test_id == ctx.test_id
+        assert loaded.injected_args == ctx.injected_args
+
+    def check_load_single_missing_method(self):
+        loader = TestLoader(self.SESSION_CONTEXT, logger=Mock())
+        ctx = loader.load([os.path.join(discover_dir(), "test_a.py")])[0]
+
+        test_metadata = ctx.test_metadata
+        test_metadata["method_name"] = "no_such_method"
+        with pytest.raises(LoaderException):
+            loader.load_single(test_metadata)
+
     def check_test_loader_with_subsets(self):
         """Check that computation of subsets work properly. This validates both that the division of tests is correct
         (i.e. as even a distribution as we can get but uneven in the expected way when necessary) and that the division
@@ -186,10 +221,16 @@ class CheckTestLoader(object):
         loader = TestLoader(self.SESSION_CONTEXT, logger=Mock(), subset=0, subsets=2, historical_report=report_url)
         tests = loader.load([file])
         assert len(tests) == 1
+        assert all(isinstance(tc, TestContext) for tc in tests)
+        assert [tc.test_id for tc in tests] == ["tests.loader.resources.loader_test_directory.test_b.TestB.test_b"]
 
         loader = TestLoader(self.SESSION_CONTEXT, logger=Mock(), subset=1, subsets=2, historical_report=report_url)
         tests = loader.load([file])
         assert len(tests) == 2
+        assert all(isinstance(tc, TestContext) for tc in tests)
+        assert [tc.test_id for tc in tests] == [
+            "tests.loader.resources.loader_test_directory.test_b.TestBB.test_bb_one",
+            "tests.loader.resources.loader_test_directory.test_b.TestBB.bb_two_test"]
 
 
 def join_parsed_symbol_components(parsed):
@@ -13,7 +13,8 @@
 # limitations under the License.
 
 from ducktape.tests.test import TestContext
-from ducktape.tests.runner import TestRunner
+from ducktape.tests.runner import TestRunner, Worker
+from ducktape.tests.work_queue import SharedWorkQueue
 from ducktape.mark.mark_expander import MarkedFunctionExpander
 from ducktape.cluster.localhost import LocalhostCluster
 from tests.ducktape_mock import FakeCluster
@@ -21,14 +22,19 @@ from tests.ducktape_mock import FakeCluster
 import tests.ducktape_mock
 from .resources.test_thingy import TestThingy
 from .resources.test_failing_tests import FailingTest
+from .resources.test_open_files import OpenFilesTest
 
 from mock import Mock
 import os
+import shutil
+import tempfile
 
 TEST_THINGY_FILE = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "resources/test_thingy.py"))
 FAILING_TEST_FILE = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "resources/test_failing_tests.py"))
+OPEN_FILES_TEST_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "resources/test_open_files.py"))
 
 
 class CheckRunner(object):
@@ -72,6 +78,141 @@ class CheckRunner(object):
         result_with_data = filter(lambda r: r.data is not None, results)[0]
         assert result_with_data.data == {"data": 3.14159}
 
+    def check_results_journal(self, monkeypatch):
+        """Each result is appended to the journal, while summary reports are only rewritten when the interval allows."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        session_context = tests.ducktape_mock.session_context()
+
+        test_methods = [TestThingy.test_pi, TestThingy.test_ignore1, TestThingy.test_ignore2]
+        ctx_list = []
+        for f in test_methods:
+            ctx_list.extend(
+                MarkedFunctionExpander(
+                    session_context=session_context,
+                    cls=TestThingy, function=f, file=TEST_THINGY_FILE, cluster=mock_cluster).expand())
+
+        reports = []
+        monkeypatch.setattr("ducktape.tests.runner.JSONReporter.report", lambda r: reports.append(len(r.results)))
+
+        runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list, report_interval_sec=3600)
+        results = runner.run_all_tests()
+
+        journal = runner.journal.read()
+        assert sorted(r["test_id"] for r in journal) == sorted(r.test_id for r in results)
+        # only the first finished test; the final reports are written by the caller
+        assert reports == [1]
+
+    def check_lost_async_events(self, monkeypatch):
+        """The run should finish even if asynchronous events sent by a client never arrive."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        session_context = tests.ducktape_mock.session_context()
+        ctx_list = MarkedFunctionExpander(
+            session_context=session_context,
+            cls=TestThingy, function=TestThingy.test_pi, file=TEST_THINGY_FILE, cluster=mock_cluster).expand()
+
+        def drop_event(sender, event):
+            sender.num_pushed += 1
+        monkeypatch.setattr("ducktape.tests.runner_client.Sender.push", drop_event)
+
+        runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list, async_events_timeout_sec=.5)
+        results = runner.run_all_tests()
+        assert len(results) == 1
+        assert results.num_passed == 1
+        assert len(runner._async_events_expected) == 0
+
+    def check_simple_run_reuse_workers(self):
+        """Check that tests run in long-lived workers produce the same results, and that workers are recycled."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        session_context = tests.ducktape_mock.session_context(reuse_workers=True, max_tests_per_worker=2)
+
+        test_methods = [TestThingy.test_pi, TestThingy.test_ignore1, TestThingy.test_ignore2]
+        ctx_list = []
+        for f in test_methods:
+            ctx_list.extend(
+                MarkedFunctionExpander(
+                    session_context=session_context,
+                    cls=TestThingy, function=f, file=TEST_THINGY_FILE, cluster=mock_cluster).expand())
+
+        runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list)
+
+        results = runner.run_all_tests()
+        assert len(results) == 3
+        assert results.num_failed == 0
+        assert results.num_passed == 1
+        assert results.num_ignored == 2
+
+        # Three tests, and at most two tests per worker
+        workers = set(runner._client_procs.values())
+        assert len(workers) == 2
+        assert all(not w.is_alive() for w in workers)
+
+    def check_reuse_workers_closes_test_logs(self):
+        """A worker closes the log files of each test it runs, including ignored ones, so its open files don't grow."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        session_context = tests.ducktape_mock.session_context(reuse_workers=True)
+
+        ctx_list = []
+        for f in [OpenFilesTest.test_open_files, OpenFilesTest.test_ignored]:
+            ctx_list.extend(
+                MarkedFunctionExpander(
+                    session_context=session_context,
+                    cls=OpenFilesTest, function=f, file=OPEN_FILES_TEST_FILE, cluster=mock_cluster).expand())
+
+        runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list)
+        results = runner.run_all_tests()
+        assert len(results) == 6
+        assert len(set(runner._client_procs.values())) == 1
+
+        results = sorted((r for r in results if r.data is not None), key=lambda r: r.test_index)
+        # the first test may open files which stay open for the life of the worker, e.g. connections to the driver
+        open_fds = [r.data["open_fds"] for r in results[1:]]
+        assert len(open_fds) == 3
+        assert len(set(open_fds)) == 1
+
+    def check_dead_idle_worker_replaced(self):
+        """A worker which died while waiting for a test is replaced, rather than being assigned the next test."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        session_context = tests.ducktape_mock.session_context(reuse_workers=True)
+        ctx_list = MarkedFunctionExpander(
+            session_context=session_context,
+            cls=TestThingy, function=TestThingy.test_pi, file=TEST_THINGY_FILE, cluster=mock_cluster).expand()
+
+        runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list)
+        dead_worker = Worker(runner.hostname, 0, 0, False)
+        dead_worker.process.terminate()
+        dead_worker.join()
+        runner._idle_workers.append(dead_worker)
+
+        results = runner.run_all_tests()
+        assert results.num_passed == 1
+        assert dead_worker not in runner._client_procs.values()
+        assert dead_worker.connection.closed
+
+    def check_shared_work_queue(self):
+        """Tests claimed by another driver sharing the work queue should be skipped."""
+        mock_cluster = LocalhostCluster(num_nodes=1000)
+        queue_dir = tempfile.mkdtemp()
+        try:
+            session_context = tests.ducktape_mock.session_context(work_queue=queue_dir)
+
+            test_methods = [TestThingy.test_pi, TestThingy.test_ignore1, TestThingy.test_ignore2]
+            ctx_list = []
+            for f in test_methods:
+                ctx_list.extend(
+                    MarkedFunctionExpander(
+                        session_context=session_context,
+                        cls=TestThingy, function=f, file=TEST_THINGY_FILE, cluster=mock_cluster).expand())
+
+            # Another driver already claimed the first test
+            assert SharedWorkQueue(queue_dir, "other_session").claim(ctx_list[0])
+
+            runner = TestRunner(mock_cluster, session_context, Mock(), ctx_list)
+            results = runner.run_all_tests()
+            assert len(results) == 2
+            assert ctx_list[0].test_id not in [r.test_id for r in results]
+        finally:
+            shutil.rmtree(queue_dir)
+
     def check_exit_first(self):
         """Confirm that exit_first in session context has desired effect of preventing any tests from running
         after the first test failure.
@@ -0,0 +1,75 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.tests.event import ClientEventFactory, EventResponseFactory
+from ducktape.tests.runner import Receiver
+from ducktape.tests.runner_client import Sender
+from ducktape.command_line.defaults import ConsoleDefaults
+
+from mock import Mock
+import logging
+import threading
+
+
+class CheckSenderReceiver(object):
+    def setup_method(self, _):
+        self.receiver = Receiver(ConsoleDefaults.TEST_DRIVER_MIN_PORT, ConsoleDefaults.TEST_DRIVER_MAX_PORT)
+        self.receiver.start()
+        self.message = ClientEventFactory("test_id", 1, "source_id")
+        self.sender = Sender("localhost", self.receiver.port, self.receiver.event_port, self.message, Mock())
+
+    def check_push_does_not_wait_for_reply(self):
+        """Pushed events should arrive in order, without the receiver replying to any of them."""
+        num_events = 100
+        for i in range(num_events):
+            self.sender.push(self.message.log("message %d" % i, level=logging.INFO))
+        assert self.sender.num_pushed == num_events
+
+        for i in range(num_events):
+            event = self.receiver.recv()
+            assert event["event_type"] == ClientEventFactory.LOG
+            assert event["message"] == "message %d" % i
+
+    def check_pushed_events_and_requests(self):
+        """Requests still get a reply when asynchronous events are interleaved with them."""
+        for i in range(10):
+            self.sender.push(self.message.log("message %d" % i, level=logging.INFO))
+
+        replies = []
+        request_thread = threading.Thread(
+            target=lambda: replies.append(self.sender.send(self.message.finished(result=None, num_async_events=10))))
+        request_thread.start()
+
+        event_types = []
+        while len(event_types) < 11:
+            event = self.receiver.recv()
+            event_types.append(event["event_type"])
+            if event["event_type"] == ClientEventFactory.FINISHED:
+                assert event["num_async_events"] == 10
+                self.receiver.send(EventResponseFactory().finished(event))
+
+        request_thread.join(timeout=10)
+        assert len(replies) == 1 and replies[0]["ack"]
+        assert event_types.count(ClientEventFactory.LOG) == 10
+
+    def check_recv_timeout(self):
+        """recv returns None if no event arrives before the timeout."""
+        assert self.receiver.recv(timeout_ms=10) is None
+
+        self.sender.push(self.message.log("message", level=logging.INFO))
+        assert self.receiver.recv(timeout_ms=10000)["message"] == "message"
+
+    def teardown_method(self, _):
+        self.sender.close()
+        self.receiver.close()
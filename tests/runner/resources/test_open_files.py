@@ -0,0 +1,31 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from ducktape.tests.test import Test
+from ducktape.mark import ignore, matrix
+
+
+class OpenFilesTest(Test):
+    """Fake ducktape test class which reports how many files are open in the process running it"""
+
+    @matrix(x=range(4))
+    def test_open_files(self, x):
+        return {"open_fds": len(os.listdir("/proc/self/fd"))}
+
+    @ignore
+    @matrix(x=range(2))
+    def test_ignored(self, x):
+        pass
@@ -17,7 +17,7 @@ import collections
 import pytest
 
 from tests.ducktape_mock import FakeCluster
-from ducktape.tests.scheduler import TestScheduler
+from ducktape.tests.scheduler import SchedulingPolicy, TestScheduler
 from ducktape.services.service import Service
 from ducktape.cluster.remoteaccount import RemoteAccount
 
@@ -104,3 +104,44 @@ class CheckScheduler(object):
         assert self.cluster.num_available_nodes() == len(self.cluster)
         t = scheduler.next()
         assert t.test_id == 2
+
+    def check_longest_first_within_node_spec(self):
+        """Tests with the same cluster requirements should be ordered by expected run time, longest first."""
+        tc_list = [
+            FakeContext(0, expected_num_nodes=10, expected_node_spec={RemoteAccount.LINUX: 10}),
+            FakeContext(1, expected_num_nodes=10, expected_node_spec={RemoteAccount.LINUX: 10}),
+            FakeContext(2, expected_num_nodes=10, expected_node_spec={RemoteAccount.LINUX: 10}),
+        ]
+        scheduler = TestScheduler(tc_list, self.cluster, run_time_estimates={0: 10, 1: 300})
+
+        # test 2 has no estimate, so it is assumed to take the average time
+        assert scheduler.expected_run_time(tc_list[2]) == 155
+        assert [scheduler.next().test_id for _ in range(3)] == [1, 2, 0]
+
+    def check_backfill(self):
+        """Smaller tests should use nodes which are not enough for the next large test."""
+        scheduler = TestScheduler(self.tc_list, self.cluster, run_time_estimates={0: 10, 1: 100, 2: 1000})
+
+        # only 40 nodes available; the 50 and 100 node tests wait, the 10 node test backfills
+        slots = self.cluster.alloc(Service.setup_node_spec(num_nodes=60))
+        assert scheduler.next().test_id == 0
+        assert scheduler.peek() is None
+
+        self.cluster.free(slots)
+        assert scheduler.next().test_id == 2
+        assert scheduler.next().test_id == 1
+        assert len(scheduler) == 0
+
+    def check_policy(self):
+        """A custom policy should decide the order of the tests."""
+        class ShortestFirstPolicy(SchedulingPolicy):
+            def bucket_priority(self, scheduler, test_context):
+                return -test_context.expected_num_nodes
+
+            def test_priority(self, scheduler, test_context):
+                return -scheduler.expected_run_time(test_context)
+
+        tc_list = self.tc_list + [FakeContext(3, expected_num_nodes=10, expected_node_spec={RemoteAccount.LINUX: 10})]
+        scheduler = TestScheduler(tc_list, self.cluster, run_time_estimates={0: 10, 1: 100, 2: 1000, 3: 5},
+                                  policy=ShortestFirstPolicy())
+        assert [scheduler.next().test_id for _ in range(4)] == [3, 0, 1, 2]
@@ -13,8 +13,15 @@
 # limitations under the License.
 
 from ducktape.services.service import Service
-from tests.ducktape_mock import test_context, session_context
+from tests.ducktape_mock import test_context, session_context, LocalShellAccount
 from ducktape.cluster.localhost import LocalhostCluster
+from ducktape.cluster.remoteaccount import RemoteCommandError
+from ducktape.errors import ParallelError, TimeoutError
+
+from mock import Mock
+import pytest
+import threading
+import time
 
 
 class DummyService(Service):
@@ -71,3 +78,130 @@ class CheckAllocateFree(object):
         assert self.diffDummy0._order == 0
         assert self.diffDummy1._order == 1
         assert self.diffDummy2._order == 2
+
+
+class ConcurrentService(Service):
+    """Fake service which tracks how many of its nodes are started or stopped at the same time."""
+    lifecycle_concurrency = 3
+
+    def __init__(self, context, num_nodes, fail_node=None):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+        self.fail_node = fail_node
+        super(ConcurrentService, self).__init__(context, num_nodes)
+
+    def _lifecycle_step(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(.05)
+        with self.lock:
+            self.running -= 1
+
+    def start_node(self, node):
+        self._lifecycle_step()
+        if node == self.fail_node:
+            raise RuntimeError("failed to start")
+        with self.lock:
+            self.started.append(node)
+
+    def stop_node(self, node):
+        self._lifecycle_step()
+
+    def clean_node(self, node):
+        pass
+
+
+class CheckLifecycleConcurrency(object):
+
+    def setup_method(self, _):
+        self.cluster = LocalhostCluster()
+        self.context = test_context(session_context(), cluster=self.cluster)
+
+    def check_concurrent_lifecycle(self):
+        service = ConcurrentService(self.context, 6)
+        service.start()
+        assert service.max_running == 3
+        assert len(service.started) == 6
+        assert service.to_json()["lifecycle"]["start_duration_seconds"] > 0
+
+        service.stop()
+        assert service.to_json()["lifecycle"]["stop_duration_seconds"] > 0
+
+    def check_serial_lifecycle(self):
+        service = ConcurrentService(self.context, 3)
+        service.lifecycle_concurrency = 1
+        service.start()
+        assert service.max_running == 1
+
+    def check_errors_aggregated(self):
+        """A failure on one node should not prevent the other nodes from starting."""
+        service = ConcurrentService(self.context, 6)
+        service.fail_node = service.nodes[2]
+        with pytest.raises(ParallelError) as exc_info:
+            service.start()
+        assert len(service.started) == 5
+        assert [node for node, _, _ in exc_info.value.errors] == [service.nodes[2]]
+
+
+class CheckSshAll(object):
+
+    def setup_method(self, _):
+        self.context = test_context(session_context(), cluster=LocalhostCluster())
+        self.service = DummyService(self.context, 3)
+        for node in self.service.nodes:
+            node.account = LocalShellAccount()
+
+    def check_ssh_all(self):
+        start = time.time()
+        results = self.service.ssh_all(lambda node: "sleep .5; echo %d" % self.service.nodes.index(node))
+        assert time.time() - start < 1.5
+        assert results.keys() == self.service.nodes
+        assert [r.output for r in results.values()] == ["0\n", "1\n", "2\n"]
+        assert all(r.exit_status == 0 and r.error is None for r in results.values())
+
+    def check_failures(self):
+        failing = self.service.nodes[1]
+
+        def cmd(node):
+            return "exit 1" if node == failing else "true"
+
+        with pytest.raises(ParallelError) as exc_info:
+            self.service.ssh_all(cmd)
+        assert [node for node, _, _ in exc_info.value.errors] == [failing]
+
+        results = self.service.ssh_all(cmd, allow_fail=True)
+        assert results[failing].exit_status == 1
+        assert isinstance(results[failing].error, RemoteCommandError)
+        assert results[self.service.nodes[0]].error is None
+
+    def check_shared_timeout(self):
+        """The timeout applies to the whole fan-out, not to each node in turn."""
+        start = time.time()
+        results = self.service.ssh_all("sleep 10", timeout_sec=.5, max_parallel=1, allow_fail=True)
+        assert time.time() - start < 3
+        assert all(isinstance(r.error, TimeoutError) for r in results.values())
+
+
+class CheckWaitForHttpService(object):
+
+    def setup_method(self, _):
+        self.context = test_context(session_context(), cluster=LocalhostCluster())
+        self.service = DummyService(self.context, 3)
+
+    def check_wait_for_http_service(self):
+        for node in self.service.nodes:
+            node.account.wait_for_http_service = Mock()
+        self.service.wait_for_http_service(8080, timeout_sec=5)
+        for node in self.service.nodes:
+            node.account.wait_for_http_service.assert_called_once_with(8080, {}, 5, "/")
+
+    def check_timeout(self):
+        for node in self.service.nodes:
+            node.account.wait_for_http_service = Mock()
+        self.service.nodes[1].account.wait_for_http_service.side_effect = TimeoutError("not up")
+        with pytest.raises(TimeoutError) as exc_info:
+            self.service.wait_for_http_service(8080)
+        assert self.service.who_am_i(self.service.nodes[1]) in exc_info.value.message
@@ -0,0 +1,83 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.services.service_registry import ServiceRegistry
+
+from mock import Mock
+import time
+
+
+class FakeService(object):
+    """Records the order in which services are stopped, and the time each stop started and finished."""
+
+    def __init__(self, name, events, dependencies=None):
+        self.name = name
+        self.events = events
+        self.dependencies = dependencies or []
+        self.nodes = []
+        self.logger = Mock()
+
+    def stop(self):
+        self.events.append(("start", self.name))
+        time.sleep(.1)
+        self.events.append(("stop", self.name))
+
+    def clean(self):
+        self.events.append(("clean", self.name))
+
+    def free(self):
+        raise RuntimeError("free failed")
+
+    def __repr__(self):
+        return self.name
+
+
+class CheckServiceRegistry(object):
+
+    def setup_method(self, _):
+        self.events = []
+        self.zk = FakeService("zk", self.events)
+        self.kafka = FakeService("kafka", self.events, dependencies=[self.zk])
+        self.producer = FakeService("producer", self.events)
+
+    def registry(self, concurrent_teardown):
+        registry = ServiceRegistry(concurrent_teardown=concurrent_teardown)
+        for service in [self.zk, self.kafka, self.producer]:
+            registry.append(service)
+        return registry
+
+    def check_serial_teardown(self):
+        self.registry(False).stop_all()
+        assert [name for event, name in self.events if event == "start"] == ["producer", "kafka", "zk"]
+        assert self.events[0:2] == [("start", "producer"), ("stop", "producer")]
+
+    def check_concurrent_teardown(self):
+        """Independent services are stopped concurrently, but kafka is stopped before zookeeper."""
+        registry = self.registry(True)
+        assert registry._teardown_waves() == [[self.producer, self.kafka], [self.zk]]
+
+        registry.stop_all()
+        assert set(self.events[0:2]) == {("start", "producer"), ("start", "kafka")}
+        assert self.events.index(("stop", "kafka")) < self.events.index(("start", "zk"))
+
+    def check_dependency_cycle(self):
+        self.zk.dependencies = [self.kafka]
+        waves = self.registry(True)._teardown_waves()
+        assert sum(len(w) for w in waves) == 3
+
+    def check_errors_logged(self):
+        """An error freeing a service should not prevent the other services from being freed."""
+        self.registry(True).free_all()
+        for service in [self.zk, self.kafka, self.producer]:
+            assert service.logger.warn.call_count == 1
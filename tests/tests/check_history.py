@@ -0,0 +1,70 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.tests.history import RunHistory
+from ducktape.tests.status import PASS, FAIL, IGNORE
+
+from mock import Mock
+import os
+import shutil
+import tempfile
+
+
+def fake_result(test_id, run_time_seconds, test_status=PASS, nodes_allocated=3):
+    return Mock(test_id=test_id, run_time_seconds=run_time_seconds, test_status=test_status,
+                nodes_allocated=nodes_allocated, session_context=Mock(session_id="session"))
+
+
+class CheckRunHistory(object):
+    def setup_method(self, _):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, "results", "run_history.jsonl")
+
+    def check_empty(self):
+        history = RunHistory(self.path)
+        assert history.stats() == {}
+        assert history.run_times() == {}
+
+    def check_stats(self):
+        history = RunHistory(self.path)
+        history.record([fake_result("a", 10), fake_result("b", 1, IGNORE)])
+        history.record([fake_result("a", 20, FAIL), fake_result("b", -1)])
+        for run_time in [30, 40, 50, 60, 70, 80, 90, 100]:
+            history.record([fake_result("a", run_time)])
+
+        # a new instance reads what was recorded by the others
+        stats = RunHistory(self.path).stats()
+        assert stats["a"]["mean"] == 55
+        assert stats["a"]["p90"] == 90
+        assert stats["a"]["pass_rate"] == .9
+        assert stats["a"]["num_runs"] == 10
+        assert stats["b"]["num_runs"] == 1
+        assert stats["b"]["pass_rate"] is None
+        assert stats["b"]["num_nodes"] == 3
+
+    def check_only_recent_runs_used(self):
+        history = RunHistory(self.path, max_runs_per_test=2)
+        for run_time in [100, 10, 20]:
+            history.record([fake_result("a", run_time)])
+        assert history.run_times() == {"a": 15}
+
+    def check_ignores_partial_records(self):
+        history = RunHistory(self.path)
+        history.record([fake_result("a", 10)])
+        with open(self.path, "a") as f:
+            f.write('{"test_id": "a", "run_ti')
+        assert history.run_times() == {"a": 10}
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
@@ -0,0 +1,112 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.tests.reporter import HTMLSummaryReporter
+from ducktape.tests.status import PASS, FAIL
+
+from mock import Mock
+import json
+import os
+import shutil
+import tempfile
+
+
+class FakeResults(list):
+    num_passed = 1
+    num_failed = 1
+    num_ignored = 0
+    run_time_seconds = 12
+
+
+def fake_result(i, status, session_context):
+    return Mock(module_name="module", cls_name="Test", function_name="test_%d" % i, injected_args={"x": i},
+                test_status=status, description="description", run_time_seconds=1, data={"data": i},
+                results_dir=os.path.join(session_context.results_dir, "Test", "test_%d" % i),
+                session_context=session_context)
+
+
+class CheckHTMLSummaryReporter(object):
+    def setup_method(self, _):
+        self.results_dir = tempfile.mkdtemp()
+        self.session_context = Mock(session_id="session", results_dir=self.results_dir)
+        self.results = FakeResults(
+            fake_result(i, status, self.session_context) for i, status in enumerate([PASS, FAIL]))
+        self.results.session_context = self.session_context
+
+    def read_report_data(self):
+        with open(os.path.join(self.results_dir, "report_data.js")) as f:
+            data = f.read().strip()
+        assert data.startswith("var REPORT_DATA = ") and data.endswith(";")
+        return json.loads(data[len("var REPORT_DATA = "):-1])
+
+    def read_page(self, page):
+        with open(os.path.join(self.results_dir, page)) as f:
+            lines = f.read().splitlines()
+        assert lines[-1] == "]);"
+        return [json.loads(line.rstrip(",")) for line in lines[1:-1]]
+
+    def check_report(self):
+        HTMLSummaryReporter(self.results).report()
+
+        with open(os.path.join(self.results_dir, "report.html")) as f:
+            html = f.read()
+        assert '<script src="report_data.js"></script>' in html
+        assert "test_1" not in html
+
+        report_data = self.read_report_data()
+        assert report_data["num_tests"] == 2
+        assert report_data["pages"] == ["report_data/page_0_partial.js"]
+
+        with open(os.path.join(self.results_dir, report_data["pages"][0])) as f:
+            assert f.readline() == "loadReportPage(0, [\n"
+        tests = self.read_page(report_data["pages"][0])
+        assert [t["test_result"] for t in tests] == ["pass", "fail"]
+        assert tests[1]["test_log"] == os.path.join("Test", "test_1")
+        assert "Method: test_1" in tests[1]["test_name"]
+
+    def check_full_pages_written_once(self):
+        """Once a page is full its file is left alone, and only the partial last page is rewritten."""
+        page_size = HTMLSummaryReporter.REPORT_PAGE_SIZE
+        self.results.extend(fake_result(i, PASS, self.session_context) for i in range(2, page_size + 1))
+        HTMLSummaryReporter(self.results).report()
+
+        report_data = self.read_report_data()
+        assert report_data["num_tests"] == page_size + 1
+        assert report_data["pages"] == ["report_data/page_0.js", "report_data/page_1_partial.js"]
+        assert len(self.read_page("report_data/page_0.js")) == page_size
+        assert len(self.read_page("report_data/page_1_partial.js")) == 1
+
+        full_page = os.path.join(self.results_dir, "report_data", "page_0.js")
+        mtime = int(os.path.getmtime(full_page)) - 10
+        os.utime(full_page, (mtime, mtime))
+
+        self.results.append(fake_result(page_size + 1, FAIL, self.session_context))
+        HTMLSummaryReporter(self.results).report()
+
+        assert os.path.getmtime(full_page) == mtime
+        assert [t["test_result"] for t in self.read_page("report_data/page_1_partial.js")] == ["pass", "fail"]
+
+    def check_partial_page_removed_when_full(self):
+        HTMLSummaryReporter(self.results).report()
+        assert os.path.exists(os.path.join(self.results_dir, "report_data", "page_0_partial.js"))
+
+        page_size = HTMLSummaryReporter.REPORT_PAGE_SIZE
+        self.results.extend(fake_result(i, PASS, self.session_context) for i in range(2, page_size))
+        HTMLSummaryReporter(self.results).report()
+
+        assert self.read_report_data()["pages"] == ["report_data/page_0.js"]
+        assert sorted(os.listdir(os.path.join(self.results_dir, "report_data"))) == ["page_0.js"]
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.results_dir)
@@ -0,0 +1,86 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.tests.result import RunningStats, TestResults
+from ducktape.tests.serde import SerDe
+from ducktape.tests.status import PASS, FAIL, IGNORE, TestStatus
+
+from mock import Mock
+
+
+def fake_result(test_status, run_time_seconds, nodes_used, nodes_allocated=10):
+    result = Mock(test_status=test_status, run_time_seconds=run_time_seconds, nodes_allocated=nodes_allocated)
+    result.total_nodes_used.return_value = nodes_used
+    return result
+
+
+class CheckRunningStats(object):
+    def check_empty(self):
+        assert RunningStats().to_json() == {"mean": None, "min": None, "max": None, "p50": None, "p90": None,
+                                            "p99": None}
+
+    def check_stats(self):
+        stats = RunningStats()
+        for num in [5, 3, 9, 1, 7, 2, 8, 4, 10, 6]:
+            stats.add(num)
+        assert stats.count == 10
+        assert stats.to_json() == {"mean": 5.5, "min": 1, "max": 10, "p50": 5, "p90": 9, "p99": 10}
+
+    def check_add_after_read(self):
+        stats = RunningStats()
+        for num in [5, 3, 9]:
+            stats.add(num)
+        assert stats.percentile(50) == 5
+        for num in [1, 2, 0]:
+            stats.add(num)
+        assert stats.to_json() == {"mean": 20 / 6.0, "min": 0, "max": 9, "p50": 2, "p90": 9, "p99": 9}
+
+
+class CheckTestResults(object):
+    def setup_method(self, _):
+        cluster = Mock()
+        cluster.__len__ = Mock(return_value=10)
+        self.results = TestResults(Mock(), cluster)
+        self.results.start_time = 0
+        self.results.stop_time = 100
+
+    def check_counts(self):
+        # statuses received from test processes are unpickled copies
+        status_copy = SerDe().deserialize(SerDe().serialize(FAIL))
+        for status in [PASS, PASS, status_copy, IGNORE]:
+            self.results.append(fake_result(status, 10, 2))
+
+        assert len(self.results) == 4
+        assert (self.results.num_passed, self.results.num_failed, self.results.num_ignored) == (2, 1, 1)
+        assert not self.results.get_aggregate_success()
+
+    def check_counts_ignore_case(self):
+        # e.g. statuses read back from report.json, where they are upper case
+        for status in ["PASS", "Fail", TestStatus("IGNORE")]:
+            self.results.append(fake_result(status, 10, 2))
+
+        assert (self.results.num_passed, self.results.num_failed, self.results.num_ignored) == (1, 1, 1)
+
+    def check_to_json(self):
+        for run_time, nodes_used in [(10, 2), (30, 4), (20, 6)]:
+            self.results.append(fake_result(PASS, run_time, nodes_used))
+
+        summary = self.results.to_json()
+        assert summary["run_time_statistics"] == {"mean": 20, "min": 10, "max": 30, "p50": 20, "p90": 30, "p99": 30}
+        assert summary["cluster_nodes_used"]["mean"] == 4
+        assert summary["cluster_nodes_allocated"]["max"] == 10
+        assert summary["cluster_utilization"] == (10 * 2 + 30 * 4 + 20 * 6) / (10 * 100.0)
+        assert summary["parallelism"] == .6
+        assert summary["num_passed"] == 3
+        assert self.results.get_aggregate_success()
@@ -0,0 +1,112 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.cluster.cluster import ClusterSlot
+from ducktape.cluster.finite_subcluster import FiniteSubcluster
+from ducktape.tests.event import ClientEventFactory, EventResponseFactory, subcluster_from_ready
+from ducktape.tests.result import TestResult
+from ducktape.tests.serde import SerDe
+from tests import ducktape_mock
+
+from mock import Mock
+import copy
+import pickle
+import pytest
+
+
+class SelfSerializing(object):
+    def serialize(self):
+        return "custom bytes"
+
+
+class CheckSerDe(object):
+    def setup_method(self, _):
+        self.serde = SerDe()
+
+    def check_round_trip(self):
+        event = ClientEventFactory("test_id", 1, "source_id").log("hello", level=20)
+        assert self.serde.deserialize(self.serde.serialize(event)) == event
+
+    def check_custom_serialize(self):
+        """Objects which know how to serialize themselves are serialized with their own method."""
+        assert self.serde.serialize(SelfSerializing()) == "custom bytes"
+
+    def check_unknown_version(self):
+        serialized = self.serde.serialize({"a": 1})
+        with pytest.raises(ValueError):
+            self.serde.deserialize(chr(SerDe.VERSION + 1) + serialized[1:])
+
+    def check_result_does_not_carry_session_context(self):
+        """Results are sent without their session context, which only the serializer strips."""
+        session_context = ducktape_mock.session_context()
+        result = TestResult(ducktape_mock.test_context(session_context), 1, session_context)
+        event = ClientEventFactory("test_id", 1, "source_id").finished(result=result)
+
+        deserialized = self.serde.deserialize(self.serde.serialize(event))["result"]
+        assert isinstance(deserialized, TestResult)
+        assert deserialized.session_context is None
+        assert deserialized.test_id == result.test_id
+        assert result.session_context is session_context
+
+        # other copies of the result keep the session context
+        assert copy.copy(result).session_context is session_context
+        assert pickle.loads(pickle.dumps(result)).session_context.session_id == session_context.session_id
+
+    def check_session_context_sent_once(self):
+        """The READY reply should only include the session context if the client does not have it yet."""
+        session_context = ducktape_mock.session_context()
+        test_context = Mock(test_metadata={})
+        cluster = FiniteSubcluster([])
+        message = ClientEventFactory("test_id", 1, "source_id")
+        response = EventResponseFactory()
+
+        reply = response.ready(message.ready(), session_context, test_context, cluster)
+        assert reply["session_context"] is session_context
+        assert reply["session_id"] == session_context.session_id
+
+        ready = message.ready(session_id=session_context.session_id)
+        reply = response.ready(ready, session_context, test_context, cluster)
+        assert reply["session_context"] is None
+        assert reply["session_id"] == session_context.session_id
+
+    def check_nodes_sent_once(self):
+        """The READY reply identifies the nodes of the subcluster, and only includes the remote accounts the client
+        does not have yet."""
+        session_context = ducktape_mock.session_context()
+        test_context = Mock(test_metadata={})
+        accounts = [ducktape_mock.MockAccount() for _ in range(3)]
+        accounts[1].externally_routable_ip = "10.0.0.1"
+        accounts[2].externally_routable_ip = "10.0.0.2"
+        message = ClientEventFactory("test_id", 1, "source_id")
+        response = EventResponseFactory()
+        node_cache = {}
+
+        cluster = FiniteSubcluster([ClusterSlot(accounts[0], slot_id=0), ClusterSlot(accounts[1], slot_id=1)])
+        reply = self.serde.deserialize(self.serde.serialize(
+            response.ready(message.ready(known_nodes=node_cache.keys()), session_context, test_context, cluster)))
+        assert len(reply["nodes"]) == 2
+        subcluster = subcluster_from_ready(reply, node_cache)
+        assert [n.account for n in subcluster.nodes] == accounts[:2]
+        assert [n.slot_id for n in subcluster.nodes] == [0, 1]
+
+        # a later test using one of the same nodes only gets the account it doesn't have yet
+        cluster = FiniteSubcluster([ClusterSlot(accounts[1], slot_id=1), ClusterSlot(accounts[2], slot_id=2)])
+        reply = self.serde.deserialize(self.serde.serialize(
+            response.ready(message.ready(known_nodes=node_cache.keys()), session_context, test_context, cluster)))
+        assert reply["nodes"].values() == [accounts[2]]
+        second_subcluster = subcluster_from_ready(reply, node_cache)
+        assert [n.account for n in second_subcluster.nodes] == accounts[1:]
+
+        # each test gets its own copy of an account
+        assert second_subcluster.nodes[0].account is not subcluster.nodes[1].account
@@ -20,8 +20,11 @@ import sys
 import tempfile
 
 from tests import ducktape_mock
+from ducktape.tests.status import PASS, FAIL
 from ducktape.tests.test import Test, TestContext, _escape_pathname, _compress_cmd
 
+from mock import Mock
+
 
 class DummyTest(Test):
     """class description"""
@@ -77,6 +80,64 @@ class CheckDescription(object):
         assert context.description == ""
 
 
+class FakeLogService(object):
+    """Service with a default and a non-default log, whose nodes write 100 bytes per copied log."""
+    logs = {
+        "default_log": {"path": "/mnt/default.log", "collect_default": True},
+        "other_log": {"path": "/mnt/other.log", "collect_default": False}
+    }
+
+    def __init__(self, service_id, num_nodes):
+        self.service_id = service_id
+        self.nodes = []
+        for i in range(num_nodes):
+            node = Mock()
+            node.account.hostname = "%s-node%d" % (service_id, i)
+            node.account.copy_from.side_effect = self._copy_from
+            self.nodes.append(node)
+
+    @staticmethod
+    def _copy_from(src, dest):
+        if src == "/mnt/other.log":
+            raise IOError("could not copy")
+        with open(os.path.join(dest, os.path.basename(src)), "w") as f:
+            f.write("x" * 100)
+
+
+class CheckCopyServiceLogs(object):
+    def setup_method(self, _):
+        self.test_context = TestContext(session_context=ducktape_mock.session_context(), cls=DummyTestNoDescription,
+                                        function=DummyTestNoDescription.test_this)
+        self.test_context.test_index = 1
+        # Logs are copied from several threads at once, so create the logger's methods up front; a Mock creates child
+        # mocks lazily, and threads racing to create the same one would each record calls on a different child
+        self.test_context._logger = Mock(debug=Mock(), warn=Mock())
+        for i in range(2):
+            self.test_context.services.append(FakeLogService("service%d" % i, num_nodes=3))
+
+    def check_copy_default_logs(self):
+        DummyTestNoDescription(self.test_context).copy_service_logs(PASS)
+
+        stats = self.test_context.log_collection_stats
+        assert len(stats) == 6
+        assert all(s["bytes"] == 100 for s in stats)
+        assert set(s["node"] for s in stats) == set(n.account.hostname for svc in self.test_context.services
+                                                    for n in svc.nodes)
+        assert self.test_context.logger.warn.call_count == 0
+
+    def check_copy_all_logs_on_failure(self):
+        """All logs are collected on failure; an error copying one log doesn't stop the rest."""
+        DummyTestNoDescription(self.test_context).copy_service_logs(FAIL)
+
+        assert len(self.test_context.log_collection_stats) == 6
+        assert self.test_context.logger.warn.call_count == 6
+        dest = os.path.join(TestContext.results_dir(self.test_context, 1), "service1", "service1-node2")
+        assert os.listdir(dest) == ["default.log"]
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.test_context.session_context.results_dir)
+
+
 class CheckCompressCmd(object):
     """Check expected behavior of compress command used before collecting service logs"""
 
@@ -0,0 +1,53 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.tests.work_queue import SharedWorkQueue
+
+from mock import Mock
+import os
+import shutil
+import tempfile
+
+
+class CheckSharedWorkQueue(object):
+    def setup_method(self, _):
+        self.tempdir = tempfile.mkdtemp()
+        self.queue_dir = os.path.join(self.tempdir, "queue")
+
+    def check_claim_once(self):
+        """Each test can only be claimed by one of the drivers sharing the queue."""
+        driver1 = SharedWorkQueue(self.queue_dir, "session1")
+        driver2 = SharedWorkQueue(self.queue_dir, "session2")
+        test_a = Mock(test_id="module.Class.test_a")
+        test_b = Mock(test_id="module.Class.test_b.x=1")
+
+        assert driver1.claim(test_a)
+        assert not driver2.claim(test_a)
+        assert driver2.claim(test_b)
+        assert not driver1.claim(test_b)
+
+    def check_repeated_tests(self):
+        """Repeated runs of the same test are claimed separately."""
+        driver1 = SharedWorkQueue(self.queue_dir, "session1")
+        driver2 = SharedWorkQueue(self.queue_dir, "session2")
+        test = Mock(test_id="module.Class.test")
+
+        assert driver1.claim(test)
+        assert driver1.claim(test)
+        assert not driver2.claim(test)
+        assert not driver2.claim(test)
+        assert driver2.claim(test)
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.tempdir)
@@ -0,0 +1,137 @@
+# Copyright 2016 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ducktape.utils.http_utils import HttpMixin, HTTPConnectionPool
+from tests.test_utils import find_available_port
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+import httplib
+import pytest
+import socket
+import threading
+import time
+import urllib2
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status, body, headers=None):
+        self.server.connections.add(self.client_address)
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self._respond(302, "", {"Location": "/hello"})
+        elif self.path == "/slow":
+            time.sleep(1)
+            self._respond(200, "slow")
+        elif self.path == "/hello":
+            self._respond(200, "hello")
+        else:
+            self._respond(404, "not found")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader("Content-Length")))
+        self._respond(201, "%s %s" % (self.headers.getheader("Content-Type"), body))
+
+    def log_message(self, *args):
+        pass
+
+
+class KeepAliveServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class HttpClient(HttpMixin):
+    def __init__(self):
+        self.http_connection_pool = HTTPConnectionPool(max_idle_per_host=2)
+
+
+class CheckHttpMixin(object):
+
+    def setup_method(self, _):
+        self.server = KeepAliveServer(("localhost", find_available_port()), KeepAliveHandler)
+        self.server.connections = set()
+        self.url = "http://localhost:%d" % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.client = HttpClient()
+
+    def check_keep_alive(self):
+        for _ in range(5):
+            response = self.client.http_request(self.url + "/hello", "GET", timeout=5)
+            assert response.getcode() == 200 and response.read() == "hello"
+        assert len(self.server.connections) == 1
+
+    def check_post(self):
+        response = self.client.http_request(self.url + "/post", "POST", "data", timeout=5)
+        assert response.getcode() == 201
+        assert response.read() == "application/x-www-form-urlencoded data"
+
+        response = self.client.http_request(self.url + "/post", "POST", "{}", {"Content-Type": "application/json"})
+        assert response.read() == "application/json {}"
+
+    def check_errors_and_redirects(self):
+        with pytest.raises(urllib2.HTTPError) as exc_info:
+            self.client.http_request(self.url + "/missing", "GET")
+        assert exc_info.value.code == 404
+        assert exc_info.value.read() == "not found"
+
+        response = self.client.http_request(self.url + "/redirect", "GET")
+        assert response.read() == "hello" and response.geturl() == self.url + "/hello"
+
+    def check_stale_connection(self):
+        """A pooled connection which the server closed is replaced transparently."""
+        self.client.http_request(self.url + "/hello", "GET")
+        for conns in self.client.http_connection_pool._idle.values():
+            for conn in conns:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+        assert self.client.http_request(self.url + "/hello", "GET").read() == "hello"
+
+    def check_stale_connection_post(self):
+        """A POST over a pooled connection which fails is not sent again, since the server may have processed it."""
+        self.client.http_request(self.url + "/hello", "GET")
+        for conns in self.client.http_connection_pool._idle.values():
+            for conn in conns:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+        with pytest.raises((httplib.HTTPException, socket.error)):
+            self.client.http_request(self.url + "/post", "POST", "data")
+
+    def check_concurrent_requests(self):
+        """Concurrent requests use separate connections, and at most max_idle_per_host are kept."""
+        threads = [threading.Thread(target=self.client.http_request, args=(self.url + "/slow", "GET"))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(self.server.connections) == 4
+        assert sum(len(conns) for conns in self.client.http_connection_pool._idle.values()) == 2
+
+    def check_read_timeout(self):
+        with pytest.raises(socket.timeout):
+            self.client.http_request(self.url + "/slow", "GET", connect_timeout=5, read_timeout=.2)
+
+    def teardown_method(self, _):
+        self.client.http_connection_pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
@@ -13,7 +13,10 @@
 # limitations under the License.
 
 
-from ducktape.utils.util import wait_until
+from ducktape.errors import ParallelError, TimeoutError
+from ducktape.utils.util import wait_until, wait_until_all, wait_until_any, parallel_map
+import pytest
+import threading
 import time
 
 
@@ -34,3 +37,113 @@ class CheckUtils(object):
             raise Exception("This should have timed out")
         except Exception as e:
             assert e.message == "Hello world"
+
+    def check_wait_until_backoff(self):
+        """The polling interval grows up to max_backoff_sec, and the condition is checked once more at the deadline"""
+        poll_times = []
+
+        def condition():
+            poll_times.append(time.time())
+            return False
+
+        with pytest.raises(TimeoutError) as exc_info:
+            wait_until(condition, timeout_sec=1, backoff_sec=.05, backoff_multiplier=2, max_backoff_sec=.2, jitter=.1)
+        intervals = [b - a for a, b in zip(poll_times, poll_times[1:])]
+        assert intervals[0] < .1
+        assert max(intervals) < .3
+        assert poll_times[-1] - poll_times[0] >= .99
+        assert exc_info.value.stats.polls == len(poll_times) < 10
+
+    def check_wait_until_stats(self):
+        polls = [0]
+
+        def condition():
+            polls[0] += 1
+            return polls[0] == 3
+
+        stats = wait_until(condition, timeout_sec=5, backoff_sec=.05)
+        assert stats.polls == 3
+        assert .1 <= stats.elapsed_sec < 1
+
+    def check_wait_until_wakeup(self):
+        """Setting the wakeup event makes the condition get checked right away"""
+        wakeup = threading.Event()
+        ready = []
+
+        def set_ready():
+            ready.append(True)
+            wakeup.set()
+
+        threading.Timer(.2, set_ready).start()
+        stats = wait_until(lambda: ready, timeout_sec=10, backoff_sec=5, wakeup=wakeup)
+        assert stats.elapsed_sec < 1
+
+    def check_wait_until_all(self):
+        start = time.time()
+        stats = wait_until_all([lambda: time.time() > start + .2, lambda: time.time() > start + .3], timeout_sec=2,
+                               backoff_sec=.05)
+        assert [s.polls > 1 for s in stats] == [True, True]
+
+        with pytest.raises(TimeoutError) as exc_info:
+            wait_until_all([lambda: True, lambda: False], timeout_sec=.2, backoff_sec=.05, err_msg="Not ready.")
+        assert exc_info.value.message == "Not ready. 1 of 2 conditions timed out."
+
+    def check_wait_until_any(self):
+        start = time.time()
+        checked = []
+
+        def slow():
+            checked.append(time.time())
+            return False
+
+        assert wait_until_any([slow, lambda: time.time() > start + .2], timeout_sec=5, backoff_sec=.05) == 1
+        # polling of the other condition stops once one is true
+        assert time.time() - start < 1
+        num_checked = len(checked)
+        time.sleep(.2)
+        assert len(checked) == num_checked
+
+        with pytest.raises(TimeoutError):
+            wait_until_any([lambda: False, lambda: False], timeout_sec=.2, backoff_sec=.05)
+
+    def check_parallel_map(self):
+        """Check that results are returned in order, and that calls run concurrently"""
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def func(x):
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(.05)
+            with lock:
+                running[0] -= 1
+            return x * 2
+
+        assert parallel_map(func, range(4), max_workers=2) == [0, 2, 4, 6]
+        assert max_running[0] == 2
+        assert parallel_map(lambda x: x * 2, range(4), max_workers=1) == [0, 2, 4, 6]
+        assert parallel_map(lambda x: x, []) == []
+
+    def check_parallel_map_errors(self):
+        """All calls should complete, and all failures should be reported"""
+        called = []
+
+        def func(x):
+            called.append(x)
+            if x % 2 == 1:
+                raise ValueError("odd %d" % x)
+            return x
+
+        with pytest.raises(ParallelError) as exc_info:
+            parallel_map(func, range(5), max_workers=2)
+        assert sorted(called) == range(5)
+        assert [item for item, _, _ in exc_info.value.errors] == [1, 3]
+        assert "odd 3" in str(exc_info.value)
+
+        # Serial calls fail fast with the original exception
+        del called[:]
+        with pytest.raises(ValueError):
+            parallel_map(func, range(5), max_workers=1)
+        assert called == [0, 1]